@@ -5,6 +5,9 @@ from datetime import datetime
 from app.db.database import get_database
 from app.models.job import Job, JobPreference
 from app.models.user import User
+from app.services.job_enrichment import job_enrichment_service
+from app.services.location_gazetteer import location_query
+from app.services.skill_extractor import skills_query
 
 router = APIRouter()
 
@@ -14,15 +17,19 @@ async def get_jobs(
     limit: int = 10,
     title: Optional[str] = None,
     company: Optional[str] = None,
-    location: Optional[str] = None
+    location: Optional[str] = None,
+    skills: Optional[str] = None,
+    include_duplicates: bool = False
 ):
     """
     Récupère la liste des offres d'emploi avec filtrage optionnel.
+    Les reposts détectés (`duplicate_of`) sont exclus sauf `include_duplicates`.
+    `skills` ("python,docker") retient les offres exigeant toutes ces compétences.
     """
     db = await get_database()
     
     # Construction du filtre
-    filter_query = {}
+    filter_query = {} if include_duplicates else {"duplicate_of": None}
     
     if title:
         filter_query["title"] = {"$regex": title, "$options": "i"}
@@ -30,11 +37,12 @@ async def get_jobs(
     if company:
         filter_query["company.name"] = {"$regex": company, "$options": "i"}
     
+    # Lieu connu du gazetteer : égalité sur son identifiant (index location_info.*)
     if location:
-        filter_query["$or"] = [
-            {"location.city": {"$regex": location, "$options": "i"}},
-            {"location.country": {"$regex": location, "$options": "i"}}
-        ]
+        filter_query.update(location_query(location))
+    
+    if skills:
+        filter_query.update(skills_query(skills))
     
     # Récupération des offres d'emploi
     jobs = await db.jobs.find(filter_query).skip(skip).limit(limit).to_list(limit)
@@ -53,6 +61,10 @@ async def get_job(job_id: str):
     if not job:
         raise HTTPException(status_code=404, detail="Offre d'emploi non trouvée")
     
+    # Offre consultée sans détails : enrichissement en priorité
+    if not job.get("description") and job.get("linkedin_url"):
+        job_enrichment_service.prioritize(job["_id"])
+    
     return job
 
 @router.post("/preferences", response_model=JobPreference)
@@ -1,20 +1,26 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+import asyncio
+from fastapi import APIRouter, HTTPException
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId  # ✅ Pour convertir user_id
 
 from app.db.database import get_database
-from app.models.scraping import ScrapingSession
+from app.models.scraping import SavedSearch, SavedSearchCreate, ScrapingSession, ScrapingStats
 from app.models.user import User
 from app.services.linkedin_scraper import LinkedInScraper
+from app.services.browser_executor import run_in_browser_thread
+from app.services.job_ingestion import bulk_upsert_jobs
+from app.services.scrape_queue import mark_queued, queue_enabled
+from app.services.scrape_registry import scrape_registry
+from app.services.scraper_service import scraping_service
+from app.services.search_scheduler import (
+    backfill_subscription, query_key_for
+)
 
 router = APIRouter()
 
 @router.post("/start", response_model=ScrapingSession)
-async def start_scraping(
-    session: ScrapingSession,
-    background_tasks: BackgroundTasks
-):
+async def start_scraping(session: ScrapingSession):
     """
     Démarre une nouvelle session de scraping LinkedIn.
     """
@@ -32,19 +38,22 @@ async def start_scraping(
     # Mettre à jour le statut de la session
     session.status = "pending"
 
-    # Insérer la session
-    result = await db.scraping_sessions.insert_one(session.dict(by_alias=True))
+    # Insérer la session (en mode "queue", elle sera réclamée par un worker)
+    document = session.dict(by_alias=True)
+    if queue_enabled():
+        mark_queued(document)
+    result = await db.scraping_sessions.insert_one(document)
 
     # Récupérer la session créée
     created_session = await db.scraping_sessions.find_one({"_id": result.inserted_id})
+    if queue_enabled():
+        return created_session
 
-    # Lancer le scraping en arrière-plan
-    background_tasks.add_task(
-        run_scraping_task,
-        str(created_session["_id"]),
-        session.search_query,
-        session.location,
-        session.filters
+    # Lancer le scraping en arrière-plan (tâche enregistrée : annulable par DELETE /sessions/{id})
+    session_id = str(created_session["_id"])
+    scrape_registry.register(
+        session_id,
+        asyncio.create_task(run_scraping_task(session_id, session.search_query, session.location, session.filters))
     )
 
     return created_session
@@ -87,6 +96,104 @@ async def get_scraping_session(session_id: str):
 
     return session
 
+@router.delete("/sessions/{session_id}")
+async def cancel_scraping_session(session_id: str):
+    """
+    Annule une session en attente ou en cours : la tâche de scraping est
+    interrompue et son navigateur libéré immédiatement.
+    """
+    if not await scraping_service.cancel_session(session_id):
+        raise HTTPException(
+            status_code=400,
+            detail="Impossible d'annuler la session (déjà terminée ou inexistante)"
+        )
+
+    return {"message": "Session annulée avec succès", "session_id": session_id}
+
+@router.post("/saved-searches", response_model=SavedSearch)
+async def create_saved_search(search: SavedSearchCreate):
+    """
+    Enregistre une recherche récurrente. Les recherches identiques (après
+    normalisation) de tous les utilisateurs partagent une seule exécution.
+    """
+    db = await get_database()
+
+    try:
+        user = await db.users.find_one({"_id": ObjectId(search.user_id)})
+    except Exception:
+        raise HTTPException(status_code=400, detail="Format de user_id invalide")
+
+    if not user:
+        raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
+
+    # Mots-clés et lieu conservés tels que saisis ; seule la clé de regroupement est normalisée
+    saved = SavedSearch(**search.dict())
+    saved.query_key = query_key_for(search.keywords, search.location, search.filters.dict())
+
+    document = saved.dict(by_alias=True)
+    await db.saved_searches.insert_one(document)
+
+    # Offres déjà trouvées par la même requête pour d'autres utilisateurs
+    await backfill_subscription(db, document)
+
+    return document
+
+@router.get("/saved-searches", response_model=List[SavedSearch])
+async def get_saved_searches(user_id: str, skip: int = 0, limit: int = 20):
+    """
+    Récupère les recherches récurrentes d'un utilisateur.
+    """
+    db = await get_database()
+
+    return await db.saved_searches.find(
+        {"user_id": user_id, "active": True}
+    ).skip(skip).limit(limit).to_list(length=limit)
+
+@router.delete("/saved-searches/{search_id}")
+async def delete_saved_search(search_id: str):
+    """
+    Désactive une recherche récurrente.
+    """
+    db = await get_database()
+
+    result = await db.saved_searches.update_one(
+        {"_id": ObjectId(search_id), "active": True},
+        {"$set": {"active": False, "updated_at": datetime.utcnow()}}
+    )
+
+    if result.modified_count == 0:
+        raise HTTPException(status_code=404, detail="Recherche non trouvée")
+
+    return {"message": "Recherche désactivée"}
+
+@router.get("/matches")
+async def get_user_matches(user_id: str, unseen_only: bool = False, skip: int = 0, limit: int = 20):
+    """
+    Récupère les offres trouvées par les recherches récurrentes d'un utilisateur.
+    """
+    db = await get_database()
+
+    match_query = {"user_id": user_id}
+    if unseen_only:
+        match_query["seen"] = False
+
+    matches = await db.user_job_matches.aggregate([
+        {"$match": match_query},
+        {"$sort": {"matched_at": -1}},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$lookup": {"from": "jobs", "localField": "job_id", "foreignField": "_id", "as": "job"}},
+        {"$unwind": "$job"}
+    ]).to_list(length=limit)
+
+    for match in matches:
+        match["_id"] = str(match["_id"])
+        match["saved_search_id"] = str(match["saved_search_id"])
+        match["job_id"] = str(match["job_id"])
+        match["job"]["_id"] = str(match["job"]["_id"])
+
+    return matches
+
 async def run_scraping_task(session_id: str, search_query: str, location: Optional[str], filters: dict):
     """
     Fonction exécutée en arrière-plan pour le scraping LinkedIn.
@@ -95,61 +202,71 @@ async def run_scraping_task(session_id: str, search_query: str, location: Option
     scraper = LinkedInScraper()
 
     try:
-        await db.scraping_sessions.update_one(
-            {"_id": ObjectId(session_id)},
+        # Session annulée avant son démarrage : rien à faire
+        started = await db.scraping_sessions.update_one(
+            {"_id": ObjectId(session_id), "status": "pending"},
             {"$set": {"status": "running"}}
         )
+        if not started.modified_count:
+            return
 
-        scraper.login()
+        # Navigateur piloté dans l'exécuteur dédié : l'API reste réactive
+        await run_in_browser_thread(scraper.login)
 
         # Utilisation de la méthode search_jobs_custom qui utilise les fonctions de scrapping.py
-        jobs = scraper.search_jobs_custom(
+        jobs = await run_in_browser_thread(
+            scraper.search_jobs_custom,
             keywords=search_query.split() if search_query else None,
             locations=[location] if location else None,
             contract_types=[filters.get("job_type")] if filters.get("job_type") else None,
             max_pages=3
         )
 
-        jobs_saved = 0
-        for job in jobs:
-            unique_filter = {
-                "title": job["title"],
-                "company": job["company"],
-                "location": job["location"]
-            }
-            existing_job = await db.jobs.find_one(unique_filter)
-            if not existing_job:
-                await db.jobs.insert_one(job)
-                jobs_saved += 1
-
-                # ✅ Corriger : utiliser `job` pour les détails du recruteur
-                if job.get("recruiter"):
-                    recruiter = job["recruiter"]
-                    existing_recruiter = await db.recruiters.find_one({"name": recruiter["name"]})
-                    if not existing_recruiter:
-                        await db.recruiters.insert_one({
-                            "name": recruiter["name"],
-                            "title": recruiter.get("title"),
-                            "company": job["company"]["name"] if isinstance(job["company"], dict) else job["company"],
-                            "created_at": datetime.utcnow(),
-                            "updated_at": datetime.utcnow()
-                        })
+        # Ingestion en un seul bulk upsert non ordonné
+        stats = ScrapingStats(total_jobs_found=len(jobs))
+        result = await bulk_upsert_jobs(db.jobs, jobs, stats=stats)
+        jobs_saved = result.inserted
+
+        for index in result.inserted_indices:
+            job = jobs[index]
+            # ✅ Corriger : utiliser `job` pour les détails du recruteur
+            if job.get("recruiter"):
+                recruiter = job["recruiter"]
+                existing_recruiter = await db.recruiters.find_one({"name": recruiter["name"]})
+                if not existing_recruiter:
+                    await db.recruiters.insert_one({
+                        "name": recruiter["name"],
+                        "title": recruiter.get("title"),
+                        "company": job["company"]["name"] if isinstance(job["company"], dict) else job["company"],
+                        "created_at": datetime.utcnow(),
+                        "updated_at": datetime.utcnow()
+                    })
 
+        # Mise à jour finale (sauf si annulée entre-temps)
         await db.scraping_sessions.update_one(
-            {"_id": ObjectId(session_id)},
+            {"_id": ObjectId(session_id), "status": "running"},
             {
                 "$set": {
                     "status": "completed",
                     "end_time": datetime.utcnow(),
                     "jobs_found": len(jobs),
-                    "jobs_added": jobs_saved
+                    "jobs_added": jobs_saved,
+                    "stats": stats.dict()
                 }
             }
         )
 
+    except asyncio.CancelledError:
+        # Annulation demandée (statut déjà "cancelled") ou arrêt du serveur
+        await db.scraping_sessions.update_one(
+            {"_id": ObjectId(session_id), "status": "running"},
+            {"$set": {"status": "failed", "end_time": datetime.utcnow(),
+                      "error": "Scraping interrompu (arrêt du serveur)"}}
+        )
+        raise
     except Exception as e:
         await db.scraping_sessions.update_one(
-            {"_id": ObjectId(session_id)},
+            {"_id": ObjectId(session_id), "status": "running"},
             {
                 "$set": {
                     "status": "failed",
@@ -160,4 +277,4 @@ async def run_scraping_task(session_id: str, search_query: str, location: Option
         )
     finally:
         if scraper:
-            scraper.close()
+            await run_in_browser_thread(scraper.close)
@@ -5,6 +5,8 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 from app.services.scraping_service_enhanced import enhanced_scraping_service
 from app.api.deps import get_current_user
+from app.services.location_gazetteer import location_query
+from app.services.skill_extractor import skills_query
 
 router = APIRouter()
 
@@ -166,15 +168,17 @@ async def get_enhanced_jobs(
     remote_only: bool = Query(False, description="Uniquement télétravail"),
     experience_level: Optional[str] = Query(None, description="Niveau d'expérience"),
     job_type: Optional[str] = Query(None, description="Type de contrat"),
-    sort_by: str = Query("created_at", description="Tri par: created_at, posted_at, title")
+    skills: Optional[str] = Query(None, description="Compétences requises (ex: python,docker)"),
+    sort_by: str = Query("created_at", description="Tri par: created_at, posted_at, title"),
+    include_duplicates: bool = Query(False, description="Inclure les reposts (duplicate_of)")
 ):
     """Récupère les jobs avec le modèle de données enrichi"""
     try:
         from app.db.database import get_database
         db = await get_database()
         
-        # Construction du filtre
-        filter_query = {}
+        # Construction du filtre (reposts exclus par défaut)
+        filter_query = {} if include_duplicates else {"duplicate_of": None}
         
         if keywords:
             keyword_list = [kw.strip() for kw in keywords.split(',')]
@@ -182,12 +186,13 @@ async def get_enhanced_jobs(
                 {"title": {"$regex": kw, "$options": "i"}} for kw in keyword_list
             ]
         
+        # Lieu connu du gazetteer : égalité sur son identifiant (index location_info.*)
         if location:
-            filter_query["$or"] = [
-                {"location.city": {"$regex": location, "$options": "i"}},
-                {"location.country": {"$regex": location, "$options": "i"}},
-                {"location.full_address": {"$regex": location, "$options": "i"}}
-            ]
+            filter_query.setdefault("$and", []).append(location_query(location))
+        
+        # Compétences normalisées : index multiclé `skills`
+        if skills:
+            filter_query.update(skills_query(skills))
         
         if remote_only:
             filter_query["remote"] = True
@@ -216,7 +221,8 @@ async def get_enhanced_jobs(
                 "location": location,
                 "remote_only": remote_only,
                 "experience_level": experience_level,
-                "job_type": job_type
+                "job_type": job_type,
+                "skills": skills
             }
         }
         
@@ -194,6 +194,9 @@ from bson import ObjectId
 
 from app.db.database import get_database
 from app.models.job import Job, JobCreate, JobUpdate
+from app.services.job_fingerprint import job_fingerprint
+from app.services.location_gazetteer import location_query, normalize_job_location
+from app.services.skill_extractor import get_skill_extractor, skills_query
 from app.api.deps import get_current_active_user
 
 router = APIRouter()
@@ -207,7 +210,8 @@ async def get_jobs(
     location: Optional[str] = Query(None, description="Filtrer par localisation"),
     remote: Optional[bool] = Query(None, description="Filtrer par télétravail"),
     job_type: Optional[str] = Query(None, description="Filtrer par type de contrat"),
-    experience_level: Optional[str] = Query(None, description="Filtrer par niveau d'expérience")
+    experience_level: Optional[str] = Query(None, description="Filtrer par niveau d'expérience"),
+    skills: Optional[str] = Query(None, description="Compétences requises (ex: python,docker)")
 ):
     """Récupère la liste des offres d'emploi avec filtrage"""
     db = await get_database()
@@ -222,7 +226,7 @@ async def get_jobs(
         filter_query["company"] = {"$regex": company, "$options": "i"}
     
     if location:
-        filter_query["location"] = {"$regex": location, "$options": "i"}
+        filter_query.update(location_query(location))
     
     if remote is not None:
         filter_query["remote"] = remote
@@ -233,6 +237,9 @@ async def get_jobs(
     if experience_level:
         filter_query["experienceLevel"] = experience_level
     
+    if skills:
+        filter_query.update(skills_query(skills))
+    
     # Récupération des jobs
     jobs = await db.jobs.find(filter_query).sort("createdAt", -1).skip(skip).limit(limit).to_list(length=limit)
     
@@ -273,8 +280,14 @@ async def create_job(
         updatedAt=datetime.utcnow()
     )
     
-    # Insertion en base
-    result = await db.jobs.insert_one(new_job.dict(by_alias=True))
+    # Insertion en base (même empreinte que l'ingestion du scraping)
+    document = new_job.dict(by_alias=True)
+    document["fingerprint"] = job_fingerprint(document)
+    normalize_job_location(document)
+    document["skills"] = get_skill_extractor().extract(document.get("title"), document.get("description"))
+    if await db.jobs.find_one({"fingerprint": document["fingerprint"]}, {"_id": 1}):
+        raise HTTPException(status_code=409, detail="Cette offre d'emploi existe déjà")
+    result = await db.jobs.insert_one(document)
     
     # Récupération du job créé
     created_job = await db.jobs.find_one({"_id": result.inserted_id})
@@ -304,6 +317,20 @@ async def update_job(
     # Préparation des données de mise à jour
     update_data = job_update.dict(exclude_unset=True)
     update_data["updatedAt"] = datetime.utcnow()
+    # Offre sans id LinkedIn : l'empreinte suit le titre, l'entreprise et la ville
+    if {"title", "company", "location"} & update_data.keys():
+        fingerprint = job_fingerprint({**existing_job, **update_data})
+        if fingerprint != existing_job.get("fingerprint"):
+            if await db.jobs.find_one({"fingerprint": fingerprint, "_id": {"$ne": job_object_id}}, {"_id": 1}):
+                raise HTTPException(status_code=409, detail="Cette offre d'emploi existe déjà")
+            update_data["fingerprint"] = fingerprint
+    if update_data.get("location") is not None:
+        normalize_job_location(update_data)
+    if "title" in update_data or "description" in update_data:
+        update_data["skills"] = get_skill_extractor().extract(
+            update_data.get("title", existing_job.get("title")),
+            update_data.get("description", existing_job.get("description"))
+        )
     
     # Mise à jour
     await db.jobs.update_one(
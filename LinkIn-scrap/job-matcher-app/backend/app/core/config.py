@@ -1,6 +1,6 @@
 # app/core/config.py
 import os
-from typing import List, Union
+from typing import List, Optional, Union
 from pydantic import BaseSettings, validator
 from dotenv import load_dotenv
 
@@ -47,6 +47,43 @@ class Settings(BaseSettings):
     SELENIUM_TIMEOUT: int = int(os.getenv("SELENIUM_TIMEOUT", "15"))
     SCRAPING_DELAY_MIN: float = float(os.getenv("SCRAPING_DELAY_MIN", "2.0"))
     SCRAPING_DELAY_MAX: float = float(os.getenv("SCRAPING_DELAY_MAX", "5.0"))
+    # Cadence adaptative (AIMD par hôte) : part de SCRAPING_DELAY_MAX, descend jusqu'à
+    # SCRAPING_DELAY_MIN si l'hôte répond bien, remonte jusqu'au plafond sinon
+    SCRAPING_PACE_CEILING: float = float(os.getenv("SCRAPING_PACE_CEILING", "60.0"))
+    SCRAPING_PACE_STEP: float = float(os.getenv("SCRAPING_PACE_STEP", "0.25"))
+    SCRAPING_PACE_BACKOFF: float = float(os.getenv("SCRAPING_PACE_BACKOFF", "2.0"))
+    # Profil navigateur allégé (ni images, ni polices, ni médias, cache sur tmpfs)
+    SCRAPING_LEAN_PROFILE: bool = os.getenv("SCRAPING_LEAN_PROFILE", "true").lower() == "true"
+    SCRAPING_CACHE_DIR: str = os.getenv("SCRAPING_CACHE_DIR", "")
+    # Budget de threads pour les appels navigateur bloquants (hors boucle asyncio)
+    SCRAPING_THREADS: int = int(os.getenv("SCRAPING_THREADS", "4"))
+    # Extraction des cartes : "browser" (script dans la page, JSON compact) ou "html" (page_source + BeautifulSoup)
+    SCRAPING_EXTRACTION_MODE: str = os.getenv("SCRAPING_EXTRACTION_MODE", "browser")
+    # Pages d'avance entre étages du pipeline de scraping (chargement, parsing, enrichissement)
+    SCRAPING_PIPELINE_BUFFER: int = int(os.getenv("SCRAPING_PIPELINE_BUFFER", "1"))
+    # Types de contrat : filtrés par la recherche (f_JT) et les cartes ; vérification sur les pages de détail en option
+    CONTRACT_DETAIL_VERIFICATION: bool = os.getenv("CONTRACT_DETAIL_VERIFICATION", "false").lower() == "true"
+    # Archive des pages brutes (zstd, index SQLite) pour ré-extraction hors ligne
+    PAGE_ARCHIVE_ENABLED: bool = os.getenv("PAGE_ARCHIVE_ENABLED", "false").lower() == "true"
+    PAGE_ARCHIVE_DIR: str = os.getenv("PAGE_ARCHIVE_DIR", "data/page_archive")
+    
+    # Recherches récurrentes (planificateur, requêtes mutualisées entre utilisateurs)
+    SCHEDULER_ENABLED: bool = os.getenv("SCHEDULER_ENABLED", "false").lower() == "true"
+    SCHEDULER_TICK_SECONDS: int = int(os.getenv("SCHEDULER_TICK_SECONDS", "60"))
+    SCHEDULER_MAX_CONCURRENT: int = int(os.getenv("SCHEDULER_MAX_CONCURRENT", "2"))
+    SCHEDULER_MIN_INTERVAL_MINUTES: int = int(os.getenv("SCHEDULER_MIN_INTERVAL_MINUTES", "30"))
+    
+    # Exécution des sessions : "inline" (dans le processus API) ou "queue" (workers scrape_worker.py)
+    SCRAPING_EXECUTION_MODE: str = os.getenv("SCRAPING_EXECUTION_MODE", "inline")
+    SCRAPE_LEASE_SECONDS: int = int(os.getenv("SCRAPE_LEASE_SECONDS", "120"))
+    SCRAPE_MAX_ATTEMPTS: int = int(os.getenv("SCRAPE_MAX_ATTEMPTS", "3"))
+    
+    # Enrichissement des offres (pages de détail)
+    ENRICHMENT_WORKERS: int = int(os.getenv("ENRICHMENT_WORKERS", "2"))
+    ENRICHMENT_BATCH_SIZE: int = int(os.getenv("ENRICHMENT_BATCH_SIZE", "20"))
+    ENRICHMENT_FLUSH_INTERVAL: float = float(os.getenv("ENRICHMENT_FLUSH_INTERVAL", "5.0"))
+    # Fiche entreprise (taille, secteur, site) : relevée au plus une fois par entreprise sur cette durée
+    COMPANY_INFO_TTL_HOURS: int = int(os.getenv("COMPANY_INFO_TTL_HOURS", "168"))
     
     # Email Configuration (optional)
     SMTP_TLS: bool = True
@@ -6,6 +6,15 @@ import asyncio
 import logging
 from dotenv import load_dotenv
 
+from app.services.job_fingerprint import (
+    FINGERPRINT_INDEX_OPTIONS, LEGACY_IDENTITY_INDEX, ensure_fingerprint_indexes, migrate_fingerprints
+)
+from app.services.location_gazetteer import (
+    LOCATION_FIELD, LOCATION_INDEXES, backfill_locations, ensure_location_indexes
+)
+from app.services.company_registry import backfill_company_ids, ensure_company_indexes
+from app.services.skill_extractor import backfill_skills, ensure_skill_indexes
+
 # Chargement des variables d'environnement
 load_dotenv()
 
@@ -43,7 +52,12 @@ async def init_mongodb():
             "jobs",
             "applications",
             "scraping_sessions",
-            "recruiters"
+            "scraping_watermarks",
+            "saved_searches",
+            "scheduled_queries",
+            "user_job_matches",
+            "recruiters",
+            "companies"
         ]
         
         # Création des collections si elles n'existent pas
@@ -53,6 +67,9 @@ async def init_mongodb():
                 logger.info(f"📁 Création collection: {collection}")
                 await db.create_collection(collection)
         
+        # Migrations des offres existantes (avant les index uniques)
+        await migrate_jobs(db)
+        
         # Création des index
         await create_indexes(db)
         
@@ -63,6 +80,26 @@ async def init_mongodb():
         logger.error(f"❌ Erreur initialisation MongoDB: {e}")
         raise
     
+async def migrate_jobs(db):
+    """
+    Migrations ponctuelles de la collection jobs (offres antérieures aux
+    nouveaux champs). Parcours complets de la collection, exécutés ici
+    uniquement et jamais à chaque session de scraping.
+    """
+    logger.info("🔄 Migration des offres existantes...")
+    
+    try:
+        await migrate_fingerprints(db.jobs)
+        await backfill_locations(db.jobs)
+        # Clé unique avant rattachement : une seule entreprise créée par nom
+        await db.companies.create_index("key", unique=True, background=True)
+        await backfill_company_ids(db)
+        await backfill_skills(db.jobs)
+        logger.info("✅ Migration des offres terminée")
+    except Exception as e:
+        logger.error(f"❌ Erreur migration des offres: {e}")
+        raise
+    
 async def create_indexes(db):
     """Crée tous les index nécessaires"""
     logger.info("📊 Création des index...")
@@ -144,12 +181,17 @@ async def create_indexes(db):
         await db.jobs.create_index("experienceLevel", background=True)
         await db.jobs.create_index("createdAt", background=True)
         
-        # Index composé pour éviter les doublons
-        await db.jobs.create_index([
-            ("title", 1),
-            ("company", 1), 
-            ("location", 1)
-        ], unique=True, background=True)
+        # Identité par empreinte (id LinkedIn ou clé normalisée) et bandes SimHash
+        await ensure_fingerprint_indexes(db.jobs)
+        
+        # Lieux normalisés (gazetteer) : filtres exacts par ville, région, pays
+        await ensure_location_indexes(db.jobs)
+        
+        # Entreprises canoniques (clé normalisée unique) et référence des offres
+        await ensure_company_indexes(db)
+        
+        # Compétences normalisées (index multiclé)
+        await ensure_skill_indexes(db.jobs)
         logger.info("✅ Index jobs créés")
         
         # Index pour la collection applications
@@ -169,8 +211,22 @@ async def create_indexes(db):
         await db.scraping_sessions.create_index("user_id", background=True)
         await db.scraping_sessions.create_index("status", background=True)
         await db.scraping_sessions.create_index("start_time", background=True)
+        # File des workers (réclamation par statut/ancienneté, reprise des baux expirés)
+        await db.scraping_sessions.create_index(
+            [("queued", 1), ("status", 1), ("start_time", 1)], background=True
+        )
+        await db.scraping_sessions.create_index(
+            [("queued", 1), ("status", 1), ("lease_expires_at", 1)], background=True
+        )
         logger.info("✅ Index scraping_sessions créés")
         
+        # Index pour les recherches récurrentes
+        await db.saved_searches.create_index([("user_id", 1), ("active", 1)], background=True)
+        await db.saved_searches.create_index("query_key", background=True)
+        await db.user_job_matches.create_index([("user_id", 1), ("job_id", 1)], unique=True, background=True)
+        await db.user_job_matches.create_index([("user_id", 1), ("matched_at", -1)], background=True)
+        logger.info("✅ Index recherches récurrentes créés")
+        
         # Index pour la collection recruiters
         await db.recruiters.create_index("email", sparse=True, background=True)
         await db.recruiters.create_index("linkedin_id", sparse=True, background=True)
@@ -199,7 +255,7 @@ def init_mongodb_sync():
             "users", "connections", "messages", "messageTemplates", 
             "opportunities", "automations", "profileOptimizations", 
             "analytics", "campaigns", "notifications", "jobs", 
-            "applications", "scraping_sessions", "recruiters"
+            "applications", "scraping_sessions", "recruiters", "companies"
         ]
         
         # Création des collections
@@ -211,7 +267,15 @@ def init_mongodb_sync():
         
         # Index essentiels (version simplifiée)
         db.users.create_index("email", unique=True, background=True)
-        db.jobs.create_index([("title", 1), ("company", 1), ("location", 1)], unique=True, background=True)
+        if LEGACY_IDENTITY_INDEX in db.jobs.index_information():
+            db.jobs.drop_index(LEGACY_IDENTITY_INDEX)
+        db.jobs.create_index("fingerprint", background=True, **FINGERPRINT_INDEX_OPTIONS)
+        db.jobs.create_index("simhash_bands", background=True)
+        for field in LOCATION_INDEXES:
+            db.jobs.create_index(f"{LOCATION_FIELD}.{field}", background=True)
+        db.jobs.create_index("company_id", background=True)
+        db.jobs.create_index("skills", background=True)
+        db.companies.create_index("key", unique=True, background=True)
         db.applications.create_index([("userId", 1), ("jobId", 1)], unique=True, background=True)
         
         logger.info("🎉 Initialisation MongoDB (sync) terminée!")
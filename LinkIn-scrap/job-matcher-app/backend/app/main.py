@@ -9,6 +9,10 @@ from contextlib import asynccontextmanager
 from app.core.config import settings
 from app.db.database import connect_to_mongo, close_mongo_connection
 from app.api.router import api_router
+from app.services.browser_executor import shutdown_browser_executor
+from app.services.job_enrichment import job_enrichment_service
+from app.services.scrape_registry import scrape_registry
+from app.services.search_scheduler import search_scheduler
 
 # Configuration du logging
 logging.basicConfig(
@@ -31,45 +35,10 @@ async def lifespan(app: FastAPI):
     try:
         # Connexion à MongoDB
         await connect_to_mongo()
-        logger.info("✅ Services initialisés")
-        yield
-    except Exception as e:
-        logger.error(f"❌ Erreur lors du démarrage: {e}")
-        raise
-    finally:
-# app/main.py
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import logging
-import sys
-from contextlib import asynccontextmanager
-
-from app.core.config import settings
-from app.db.database import connect_to_mongo, close_mongo_connection
-from app.api.router import api_router
-
-# Configuration du logging
-logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL.upper()),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('app.log')
-    ]
-)
-
-logger = logging.getLogger(__name__)
-
-# Gestionnaire de cycle de vie de l'application
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Gestionnaire du cycle de vie de l'application"""
-    # Démarrage
-    logger.info("🚀 Démarrage de l'application")
-    try:
-        # Connexion à MongoDB
-        await connect_to_mongo()
+        
+        # Recherches récurrentes mutualisées
+        if settings.SCHEDULER_ENABLED:
+            search_scheduler.start()
         logger.info("✅ Services initialisés")
         yield
     except Exception as e:
@@ -78,6 +47,10 @@ async def lifespan(app: FastAPI):
     finally:
         # Arrêt
         logger.info("🔄 Arrêt de l'application")
+        await search_scheduler.stop()
+        await scrape_registry.shutdown()
+        await job_enrichment_service.stop()
+        shutdown_browser_executor(wait=False)
         await close_mongo_connection()
         logger.info("✅ Services fermés")
 
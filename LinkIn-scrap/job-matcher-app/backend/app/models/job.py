@@ -1,6 +1,6 @@
 # app/models/job.py
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 from bson import ObjectId
 from app.models.user import PyObjectId
@@ -66,6 +66,8 @@ class Job(BaseModel):
     companyWebsite: Optional[str] = None
     companyDescription: Optional[str] = None
     location: str
+    # Lieu normalisé (champs JobLocation), renseigné à l'ingestion
+    location_info: Optional[Dict[str, Any]] = None
     type: Optional[str] = None
     salary: Optional[str] = None
     description: str
@@ -76,6 +78,8 @@ class Job(BaseModel):
     experienceLevel: Optional[str] = None
     education: Optional[str] = None
     languages: List[str] = []
+    # Compétences normalisées (identifiants du dictionnaire, index multiclé)
+    skills: List[str] = []
     remote: bool = False
     urgent: bool = False
     postedAt: datetime = Field(default_factory=datetime.utcnow)
@@ -93,4 +97,85 @@ class Job(BaseModel):
         json_encoders = {
             ObjectId: str,
             datetime: lambda dt: dt.isoformat()
-        }
\ No newline at end of file
+        }
+
+class JobCompanyInfo(BaseModel):
+    """Informations sur l'entreprise"""
+    name: str
+    size: Optional[str] = None
+    industry: Optional[str] = None
+    website: Optional[str] = None
+    logo_url: Optional[str] = None
+    description: Optional[str] = None
+
+class JobLocation(BaseModel):
+    """Informations de localisation"""
+    city: Optional[str] = None
+    country: Optional[str] = None
+    region: Optional[str] = None
+    postal_code: Optional[str] = None
+    full_address: Optional[str] = None
+    remote: bool = False
+    # Identifiants canoniques du gazetteer (filtres exacts indexés)
+    city_id: Optional[str] = None
+    region_id: Optional[str] = None
+    country_id: Optional[str] = None
+
+class JobScrapingInfo(BaseModel):
+    """Informations de scraping"""
+    source: str = "linkedin"
+    scraped_at: datetime = Field(default_factory=datetime.utcnow)
+    linkedin_job_id: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    last_updated: datetime = Field(default_factory=datetime.utcnow)
+
+class JobEnhanced(BaseModel):
+    """Modèle de job amélioré avec données de scraping"""
+    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    
+    # Informations de base
+    title: str
+    company: JobCompanyInfo
+    location: JobLocation
+    
+    # Détails du poste
+    description: str = ""
+    responsibilities: List[str] = []
+    requirements: List[str] = []
+    nice_to_have: List[str] = []
+    benefits: List[str] = []
+    
+    # Conditions
+    salary: Optional[str] = None
+    experience_level: Optional[str] = None
+    job_type: Optional[str] = None  # full_time, part_time, contract, etc.
+    contract_duration: Optional[str] = None
+    
+    # Statut et dates
+    status: str = "active"  # active, closed, draft, expired
+    posted_at: Optional[datetime] = None
+    application_deadline: Optional[datetime] = None
+    start_date: Optional[datetime] = None
+    
+    # Métriques
+    views: int = 0
+    applications: int = 0
+    
+    # Flags
+    remote: bool = False
+    urgent: bool = False
+    featured: bool = False
+    
+    # Métadonnées
+    scraping_info: Optional[JobScrapingInfo] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    # Configuration
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {
+            ObjectId: str,
+            datetime: lambda dt: dt.isoformat()
+        }
@@ -24,4 +24,91 @@ class ScrapingSession(BaseModel):
         json_encoders = {
             ObjectId: str,
             datetime: lambda dt: dt.isoformat()
-        }
\ No newline at end of file
+        }
+
+class ScrapingFilters(BaseModel):
+    """Filtres de scraping"""
+    experience_level: Optional[str] = None  # entry, mid_senior, director, etc.
+    job_type: Optional[str] = None         # full_time, part_time, contract, etc.
+    date_posted: Optional[str] = None      # past_24h, past_week, past_month
+    salary_range: Optional[str] = None     # Plage salariale
+    company_size: Optional[str] = None     # startup, small, medium, large
+    remote_only: bool = False
+    urgent_only: bool = False
+
+class ScrapingStats(BaseModel):
+    """Statistiques de scraping"""
+    total_pages_scraped: int = 0
+    total_jobs_found: int = 0
+    total_jobs_saved: int = 0
+    duplicates_found: int = 0
+    errors_count: int = 0
+    average_time_per_page: float = 0.0
+    # Durées par étape (navigation, readiness, scroll, extraction, parse, db_write) :
+    # nombre/total/moyenne pendant la session, percentiles à la fin
+    stage_timings: Dict[str, Dict[str, float]] = {}
+
+class ScrapingError(BaseModel):
+    """Erreur de scraping"""
+    timestamp: datetime
+    error_type: str
+    error_message: str
+    page_number: Optional[int] = None
+
+class ScrapingSessionEnhanced(BaseModel):
+    """Session de scraping améliorée"""
+    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    user_id: str
+    
+    # Paramètres de recherche
+    keywords: Optional[str] = None
+    location: Optional[str] = None
+    max_pages: int = 3
+    filters: ScrapingFilters = Field(default_factory=ScrapingFilters)
+    
+    # Statut et timing
+    status: str = "pending"  # pending, running, completed, failed, cancelled
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    estimated_duration: Optional[int] = None  # en secondes
+    
+    # Résultats
+    stats: ScrapingStats = Field(default_factory=ScrapingStats)
+    errors: List[ScrapingError] = []
+    
+    # Métadonnées
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {
+            ObjectId: str,
+            datetime: lambda dt: dt.isoformat()
+        }
+
+class SavedSearchCreate(BaseModel):
+    """Recherche récurrente enregistrée par un utilisateur"""
+    user_id: str
+    keywords: List[str] = []
+    location: Optional[str] = None
+    filters: ScrapingFilters = Field(default_factory=ScrapingFilters)
+    interval_minutes: int = 360  # fraîcheur souhaitée
+    max_pages: int = 3
+
+class SavedSearch(SavedSearchCreate):
+    """Recherche récurrente (requête normalisée partagée entre utilisateurs via query_key)"""
+    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    query_key: Optional[str] = None
+    active: bool = True
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {
+            ObjectId: str,
+            datetime: lambda dt: dt.isoformat()
+        }
@@ -0,0 +1,50 @@
+# browser_executor.py - Exécuteur dédié aux appels Selenium bloquants
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_browser_executor() -> ThreadPoolExecutor:
+    """
+    Pool de threads réservé au navigateur (budget SCRAPING_THREADS), distinct
+    de l'exécuteur par défaut de la boucle : un scraping ne peut ni bloquer la
+    boucle asyncio ni épuiser les threads utilisés par le reste de l'API.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.SCRAPING_THREADS),
+                    thread_name_prefix="browser"
+                )
+                logger.info(f"🧵 Exécuteur navigateur: {settings.SCRAPING_THREADS} threads")
+    return _executor
+
+
+async def run_in_browser_thread(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Exécute un appel bloquant (Selenium, login, scroll...) hors de la boucle asyncio"""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_browser_executor(), call)
+
+
+def shutdown_browser_executor(wait: bool = True):
+    """Arrête l'exécuteur (à l'arrêt de l'application)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
@@ -0,0 +1,101 @@
+# browser_profile.py - Profil Chrome allégé pour le scraping (DOM texte uniquement)
+import atexit
+import logging
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Préférences Chrome : 2 = bloquer
+LEAN_CONTENT_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+    "profile.managed_default_content_settings.notifications": 2,
+    "profile.managed_default_content_settings.geolocation": 2,
+    "profile.default_content_setting_values.automatic_downloads": 2,
+}
+
+# Motifs bloqués via DevTools (Network.setBlockedURLs, jokers `*`)
+BLOCKED_RESOURCE_PATTERNS = [
+    # Images
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif",
+    # Polices
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Médias
+    "*.mp4", "*.webm", "*.m3u8", "*.ts", "*.mp3", "*.ogg",
+    # CDN médias LinkedIn (logos, photos, vidéos)
+    "*media.licdn.com*", "*dms.licdn.com*",
+]
+
+# Domaines tiers / traçage sans intérêt pour l'extraction
+BLOCKED_THIRD_PARTY_PATTERNS = [
+    "*doubleclick.net*", "*google-analytics.com*", "*googletagmanager.com*",
+    "*googlesyndication.com*", "*googleadservices.com*", "*facebook.net*",
+    "*bat.bing.com*", "*clarity.ms*", "*hotjar.com*", "*adsrvr.org*",
+    "*px.ads.linkedin.com*", "*snap.licdn.com*", "*platform.linkedin.com/litms*",
+    "*linkedin.com/li/track*", "*linkedin.com/realtime*",
+]
+
+
+def _tmpfs_dir() -> Optional[str]:
+    """Répertoire en mémoire (tmpfs) si disponible"""
+    for candidate in ("/dev/shm", "/run/shm"):
+        if os.path.isdir(candidate) and os.access(candidate, os.W_OK):
+            return candidate
+    return None
+
+
+_cache_dirs = []
+
+
+def make_cache_dir() -> str:
+    """Crée le répertoire de cache disque du navigateur, sur tmpfs si possible"""
+    base = settings.SCRAPING_CACHE_DIR or _tmpfs_dir()
+    path = tempfile.mkdtemp(prefix="linkedin-scraper-cache-", dir=base)
+    _cache_dirs.append(path)
+    return path
+
+
+@atexit.register
+def _cleanup_cache_dirs():
+    for path in _cache_dirs:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def apply_lean_profile(options, cache_dir: Optional[str] = None):
+    """
+    Configure des Options Chrome pour le scraping : pas d'images, de médias
+    ni de polices, chargement `eager` (DOMContentLoaded) et cache disque en mémoire.
+    """
+    options.page_load_strategy = "eager"
+    options.add_experimental_option("prefs", LEAN_CONTENT_PREFS)
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--autoplay-policy=user-gesture-required")
+    options.add_argument("--disable-remote-fonts")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-component-update")
+    options.add_argument("--disable-sync")
+    options.add_argument("--mute-audio")
+    options.add_argument(f"--disk-cache-dir={cache_dir or make_cache_dir()}")
+    options.add_argument("--disk-cache-size=104857600")
+    return options
+
+
+def enable_request_blocking(driver, block_third_party: bool = True) -> bool:
+    """Bloque images, polices, médias et domaines tiers via le protocole DevTools"""
+    patterns = list(BLOCKED_RESOURCE_PATTERNS)
+    if block_third_party:
+        patterns += BLOCKED_THIRD_PARTY_PATTERNS
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        return True
+    except (AttributeError, WebDriverException) as e:
+        logger.warning(f"⚠️ Blocage des requêtes indisponible: {e}")
+        return False
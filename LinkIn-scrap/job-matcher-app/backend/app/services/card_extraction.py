@@ -0,0 +1,90 @@
+# card_extraction.py - Extraction des cartes d'offres directement dans la page
+import json
+import logging
+from typing import Any, Dict, List
+
+from app.services.detail_cache import JOB_ID_PATTERNS
+
+logger = logging.getLogger(__name__)
+
+# Ordre des colonnes renvoyées par le script (une ligne par carte)
+CARD_FIELDS = ('title', 'company', 'location', 'time_posted', 'href', 'job_id')
+
+# Un seul aller-retour WebDriver : le script parcourt les cartes avec les
+# mêmes tables de sélecteurs que le parsing Python et renvoie un tableau JSON
+# compact [[titre, entreprise, lieu, date, lien, job_id], ...].
+_EXTRACT_CARDS_JS = """
+const cardSelectors = arguments[0], fields = arguments[1], idPatterns = arguments[2];
+// Même texte que get_text(strip=True) de BeautifulSoup (chemin HTML) : chaque
+// noeud texte est rogné, les vides ignorés et le reste concaténé sans séparateur,
+// pour que titres, entreprises et lieux (donc les empreintes) soient identiques
+const clean = (element) => {
+    const walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+    const parts = [];
+    for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+        const parent = node.parentNode ? node.parentNode.nodeName : '';
+        if (parent === 'SCRIPT' || parent === 'STYLE') continue;
+        const part = node.nodeValue.trim();
+        if (part) parts.push(part);
+    }
+    return parts.join('');
+};
+const pick = (card, selectors, attr) => {
+    for (const selector of selectors || []) {
+        let element = null;
+        try { element = card.querySelector(selector); } catch (e) { continue; }
+        if (element) return attr ? (element.getAttribute(attr) || '').trim() : clean(element);
+    }
+    return null;
+};
+const patterns = idPatterns.map((source) => new RegExp(source));
+const jobId = (card, href) => {
+    for (const pattern of patterns) {
+        const match = href && href.match(pattern);
+        if (match) return match[1];
+    }
+    const urn = card.getAttribute('data-entity-urn')
+        || (card.querySelector('[data-entity-urn]') || {getAttribute: () => null}).getAttribute('data-entity-urn');
+    const fromUrn = urn && urn.match(/(\\d+)$/);
+    return fromUrn ? fromUrn[1] : card.getAttribute('data-occludable-job-id');
+};
+
+let cards = [];
+for (const selector of cardSelectors) {
+    cards = document.querySelectorAll(selector);
+    if (cards.length) break;
+}
+
+const rows = [];
+for (const card of cards) {
+    const title = pick(card, fields.title);
+    if (!title) continue;
+    const link = card.querySelector('a');
+    const href = link ? link.getAttribute('href') : null;
+    rows.push([
+        title,
+        pick(card, fields.company),
+        pick(card, fields.location),
+        pick(card, fields.time_posted, 'datetime'),
+        href,
+        jobId(card, href)
+    ]);
+}
+return JSON.stringify(rows);
+"""
+
+
+def extract_cards(driver, selectors: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+    """
+    Extrait les champs bruts de toutes les cartes d'offres de la page courante
+    (appel bloquant). Renvoie une liste de dicts indexés par CARD_FIELDS.
+    """
+    fields = {key: selectors.get(key, []) for key in ('title', 'company', 'location', 'time_posted')}
+    payload = driver.execute_script(
+        _EXTRACT_CARDS_JS,
+        selectors['job_cards'],
+        fields,
+        [pattern.pattern for pattern in JOB_ID_PATTERNS]
+    )
+    rows = json.loads(payload or '[]')
+    return [dict(zip(CARD_FIELDS, row)) for row in rows]
@@ -0,0 +1,300 @@
+# company_registry.py - Entreprises canoniques (collection `companies`) et cache des fiches entreprise
+import json
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from copy import deepcopy
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import ReturnDocument, UpdateOne
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ALIASES_PATH = Path(__file__).resolve().parent.parent / 'data' / 'company_aliases.json'
+
+# Durée pendant laquelle une entreprise lue en base est servie depuis la mémoire
+COMPANY_CACHE_SECONDS = 600
+COMPANY_CACHE_MAX_ENTRIES = 10000
+# Réservation d'un relevé de fiche (un seul navigateur par entreprise)
+INFO_CLAIM_SECONDS = 300
+
+# Champs JobCompanyInfo relevés sur les pages d'offres
+INFO_FIELDS = ('size', 'industry', 'website', 'logo_url', 'description')
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+# Formes juridiques sans valeur d'identification ("Capgemini SE", "Acme S.A.S.")
+_LEGAL_FORMS = frozenset((
+    'sa', 'sas', 'sasu', 'sarl', 'eurl', 'sca', 'se', 'scop', 'inc', 'ltd', 'llc', 'llp', 'plc',
+    'corp', 'corporation', 'incorporated', 'limited', 'gmbh', 'ag', 'bv', 'nv', 'spa', 'srl', 'co'
+))
+
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def company_name_of(value: Any) -> str:
+    """Nom affiché d'une entreprise (chaîne du scraper ou sous-document {"name": ...})"""
+    if isinstance(value, dict):
+        value = value.get('name')
+    return str(value or '').strip()
+
+
+def normalize_company_name(name: Optional[str]) -> str:
+    """Minuscules, sans accents, ponctuation ni forme juridique finale ("CAPGEMINI S.A." -> "capgemini")"""
+    tokens = _TOKEN_RE.findall(_fold(name or '').replace('.', ''))
+    while len(tokens) > 1 and tokens[-1] in _LEGAL_FORMS:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+class CompanyRegistry:
+    """
+    Résolution des noms d'entreprise vers un document `companies` unique
+    (normalisation puis table d'alias), avec cache mémoire en lecture
+    (nom normalisé -> entreprise) et suivi de fraîcheur des fiches.
+    """
+
+    def __init__(self, aliases_path: Path = ALIASES_PATH,
+                 info_ttl: Optional[timedelta] = None,
+                 max_entries: int = COMPANY_CACHE_MAX_ENTRIES):
+        self.info_ttl = info_ttl or timedelta(hours=settings.COMPANY_INFO_TTL_HOURS)
+        self.max_entries = max_entries
+        self.canonical: Dict[str, str] = {}
+        self.display_names: Dict[str, str] = {}
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._keys_by_id: Dict[Any, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load_aliases(aliases_path)
+
+    def _load_aliases(self, path: Path):
+        try:
+            with open(path, encoding='utf-8') as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            logger.warning(f"⚠️ Table d'alias entreprises absente: {path}")
+            return
+        for company in data.get('companies', []):
+            key = normalize_company_name(company['name'])
+            self.display_names[key] = company['name']
+            for alias in [company['name'], *company.get('aliases', [])]:
+                self.canonical[normalize_company_name(alias)] = key
+
+    def canonical_key(self, name: Any) -> str:
+        """Clé canonique : nom normalisé, ramené à l'entreprise de référence s'il s'agit d'un alias"""
+        normalized = normalize_company_name(company_name_of(name))
+        return self.canonical.get(normalized, normalized)
+
+    # Cache mémoire
+
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry['cached_at'] < COMPANY_CACHE_SECONDS:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry['company']
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def _remember(self, company: Dict[str, Any]):
+        with self._lock:
+            self._entries[company['key']] = {'company': company, 'cached_at': time.monotonic()}
+            self._entries.move_to_end(company['key'])
+            self._keys_by_id[company['_id']] = company['key']
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._keys_by_id.pop(evicted['company']['_id'], None)
+
+    def is_info_fresh(self, company: Optional[Dict[str, Any]]) -> bool:
+        fetched_at = (company or {}).get('info_fetched_at')
+        return bool(fetched_at) and datetime.utcnow() - fetched_at < self.info_ttl
+
+    # Résolution
+
+    async def resolve_many(self, collection, names: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Entreprises (créées au besoin) des noms fournis, indexées par clé
+        canonique : cache mémoire, puis une lecture `$in`, puis un bulk upsert
+        des seules entreprises inconnues.
+        """
+        observed: Dict[str, set] = {}
+        for name in names:
+            display = company_name_of(name)
+            key = self.canonical_key(display)
+            if key:
+                observed.setdefault(key, set()).add(display)
+
+        companies = {}
+        for key in observed:
+            company = self._cached(key)
+            if company is not None:
+                companies[key] = company
+
+        missing = [key for key in observed if key not in companies]
+        loaded = []
+        if missing:
+            loaded = await collection.find({'key': {'$in': missing}}).to_list(length=None)
+            for company in loaded:
+                companies[company['key']] = company
+
+        # Nouvelles entreprises et variantes de nom encore jamais vues
+        now = datetime.utcnow()
+        operations, upserted_keys = [], []
+        for key, displays in observed.items():
+            known = set(companies.get(key, {}).get('aliases', []))
+            variants = sorted(display for display in displays if display not in known)
+            if key in companies and not variants:
+                continue
+            operations.append(UpdateOne(
+                {'key': key},
+                {
+                    '$setOnInsert': {
+                        'name': self.display_names.get(key) or sorted(displays)[0],
+                        'info': {},
+                        'created_at': now
+                    },
+                    '$addToSet': {'aliases': {'$each': variants}},
+                    '$set': {'updated_at': now}
+                },
+                upsert=True
+            ))
+            upserted_keys.append(key)
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+            upserted = await collection.find({'key': {'$in': upserted_keys}}).to_list(length=None)
+            for company in upserted:
+                companies[company['key']] = company
+            loaded.extend(upserted)
+
+        for company in loaded:
+            self._remember(company)
+        return companies
+
+    async def resolve(self, collection, name: Any) -> Optional[Dict[str, Any]]:
+        """Entreprise canonique d'un nom (None si le nom est vide)"""
+        key = self.canonical_key(name)
+        if not key:
+            return None
+        return (await self.resolve_many(collection, [name])).get(key)
+
+    async def assign_company_ids(self, collection, jobs: List[Dict[str, Any]]):
+        """Ajoute `company_id` (référence `companies`) aux offres d'un lot"""
+        companies = await self.resolve_many(collection, (job.get('company') for job in jobs))
+        for job in jobs:
+            company = companies.get(self.canonical_key(job.get('company')))
+            if company is not None:
+                job['company_id'] = company['_id']
+
+    # Fiches entreprise (taille, secteur, site)
+
+    async def get_by_id(self, collection, company_id: Any) -> Optional[Dict[str, Any]]:
+        """Entreprise par _id (cache mémoire, puis base)"""
+        key = self._keys_by_id.get(company_id)
+        company = self._cached(key) if key else None
+        if company is not None:
+            return company
+        company = await collection.find_one({'_id': company_id})
+        if company is not None:
+            self._remember(company)
+        return company
+
+    async def claim_info_refresh(self, collection, company_id: Any) -> bool:
+        """
+        Vrai si la fiche de l'entreprise est à relever par l'appelant : fiche
+        absente ou périmée, et pas déjà réservée par un autre scraper.
+        """
+        company = await self.get_by_id(collection, company_id)
+        if company is None or self.is_info_fresh(company):
+            return False
+        now = datetime.utcnow()
+        claimed = await collection.find_one_and_update(
+            {
+                '_id': company_id,
+                '$and': [
+                    {'$or': [{'info_fetched_at': None}, {'info_fetched_at': {'$lt': now - self.info_ttl}}]},
+                    {'$or': [{'info_claimed_at': None},
+                             {'info_claimed_at': {'$lt': now - timedelta(seconds=INFO_CLAIM_SECONDS)}}]}
+                ]
+            },
+            {'$set': {'info_claimed_at': now}},
+            return_document=ReturnDocument.AFTER
+        )
+        if claimed is not None:
+            self._remember(claimed)
+        return claimed is not None
+
+    async def store_info(self, collection, company_id: Any, info: Dict[str, Any]):
+        """
+        Enregistre la fiche relevée (champs JobCompanyInfo) et libère la
+        réservation. Une fiche vide (module absent de la page) ne marque pas
+        l'entreprise comme fraîche : le prochain passage la relèvera.
+        """
+        now = datetime.utcnow()
+        fields = {field: info[field] for field in INFO_FIELDS if (info or {}).get(field)}
+        update: Dict[str, Any] = {'$unset': {'info_claimed_at': ''}}
+        if fields:
+            update['$set'] = {'info': fields, 'info_fetched_at': now, 'updated_at': now}
+        company = await collection.find_one_and_update(
+            {'_id': company_id}, update, return_document=ReturnDocument.AFTER
+        )
+        if company is not None:
+            self._remember(company)
+
+    def company_info(self, company: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """JobCompanyInfo d'une entreprise (nom canonique et fiche)"""
+        if not company:
+            return {}
+        return {'name': company.get('name'), **deepcopy(company.get('info') or {})}
+
+
+async def ensure_company_indexes(db):
+    """Index de la collection `companies` et de la référence des offres (rattachement : backfill_company_ids)"""
+    await db.companies.create_index('key', unique=True, background=True)
+    await db.companies.create_index('aliases', background=True)
+    await db.jobs.create_index('company_id', background=True)
+
+
+async def backfill_company_ids(db, batch_size: int = 500) -> int:
+    """Migration : `company_id` des offres qui n'en ont pas"""
+    updated = 0
+    batch: List[Dict[str, Any]] = []
+
+    async def flush(documents: List[Dict[str, Any]]) -> int:
+        await company_registry.assign_company_ids(db.companies, documents)
+        operations = [
+            UpdateOne({'_id': document['_id']}, {'$set': {'company_id': document['company_id']}})
+            for document in documents if 'company_id' in document
+        ]
+        if operations:
+            await db.jobs.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    cursor = db.jobs.find({'company_id': {'$exists': False}, 'company': {'$nin': [None, '']}}, {'company': 1})
+    async for document in cursor:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            updated += await flush(batch)
+            batch = []
+    if batch:
+        updated += await flush(batch)
+
+    if updated:
+        logger.info(f"🏢 {updated} offres existantes rattachées à leur entreprise")
+    return updated
+
+
+# Instance partagée du processus
+company_registry = CompanyRegistry()
@@ -0,0 +1,83 @@
+# contract_filter.py - Filtre par type de contrat : paramètre f_JT de la recherche, critères des cartes, vérification optionnelle
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Codes f_JT de LinkedIn : libellés acceptés en entrée (FR/EN) et marqueurs
+# reconnus dans un titre ou une description (texte replié, mots entiers)
+CONTRACT_TYPES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    'F': {'aliases': ('cdi', 'full time', 'temps plein'),
+          'markers': ('cdi', 'contrat a duree indeterminee', 'full time', 'temps plein')},
+    'P': {'aliases': ('alternance', 'part time', 'temps partiel'),
+          'markers': ('alternance', 'alternant', 'apprentissage', 'apprenti', 'part time', 'temps partiel')},
+    'C': {'aliases': ('cdd', 'contract'),
+          'markers': ('cdd', 'contrat a duree determinee', 'fixed term', 'contract')},
+    'T': {'aliases': ('freelance', 'temporary', 'interim'),
+          'markers': ('freelance', 'independant', 'interim', 'temporary')},
+    'I': {'aliases': ('stage', 'internship'),
+          'markers': ('stage', 'stagiaire', 'internship', 'intern')},
+    'V': {'aliases': ('volunteer', 'benevolat'),
+          'markers': ('volunteer', 'benevolat', 'benevole')},
+    'O': {'aliases': ('other', 'autre'),
+          'markers': ()}
+}
+
+_CODE_BY_ALIAS = {alias: code for code, entry in CONTRACT_TYPES.items() for alias in entry['aliases']}
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def _words(text: Optional[str]) -> str:
+    """Texte replié (minuscules, sans accents ni ponctuation), bordé d'espaces pour la recherche de mots entiers"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    folded = ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+    return f" {' '.join(_WORD_RE.findall(folded))} "
+
+
+class ContractFilter:
+    """
+    Types de contrat demandés, appliqués au moindre coût : codes f_JT dans
+    l'URL de recherche (LinkedIn ne renvoie que les offres concernées), puis
+    critères des cartes (titre) pour les types sans code. La lecture des
+    pages de détail n'est qu'une vérification optionnelle.
+    """
+
+    def __init__(self, contract_types: Optional[Iterable[str]] = None):
+        self.codes: List[str] = []
+        # Types sans code f_JT ("portage") : cherchés tels quels dans le texte
+        self.unmapped: List[str] = []
+        for contract_type in contract_types or []:
+            term = _words(contract_type).strip()
+            if not term:
+                continue
+            code = _CODE_BY_ALIAS.get(term)
+            if code and code not in self.codes:
+                self.codes.append(code)
+            elif not code and term not in self.unmapped:
+                self.unmapped.append(term)
+        self.markers = [f' {marker} ' for code in self.codes for marker in CONTRACT_TYPES[code]['markers']]
+        self.markers += [f' {term} ' for term in self.unmapped]
+
+    @property
+    def active(self) -> bool:
+        return bool(self.codes or self.unmapped)
+
+    def query_param(self) -> Optional[str]:
+        """Paramètre f_JT de l'URL de recherche (None si aucun type n'a de code)"""
+        if not self.codes:
+            return None
+        return 'f_JT=' + '%2C'.join(self.codes)
+
+    def text_matches(self, *texts: Optional[str]) -> bool:
+        """Vrai si l'un des textes cite un des types demandés"""
+        return any(marker in _words(text) for text in texts for marker in self.markers)
+
+    def accepts_card(self, title: Optional[str]) -> bool:
+        """
+        Critère des cartes de résultats : toujours vrai si la recherche porte
+        un f_JT (résultats déjà filtrés), sinon le titre doit citer le type.
+        """
+        return not self.active or bool(self.codes) or self.text_matches(title)
+
+    def needs_verification(self, title: Optional[str]) -> bool:
+        """Vrai si le type n'est pas confirmé par le titre (à vérifier sur la page de détail si demandé)"""
+        return self.active and not self.text_matches(title)
@@ -0,0 +1,95 @@
+# detail_cache.py - Cache des pages de détail d'offres (clé : job id LinkedIn)
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+# Fraîcheur par défaut des détails d'une offre
+DETAIL_CACHE_TTL = timedelta(hours=24)
+DETAIL_CACHE_MAX_ENTRIES = 5000
+
+JOB_ID_PATTERNS = [
+    re.compile(r'/jobs/view/(?:[^/?]*-)?(\d+)'),
+    re.compile(r'currentJobId=(\d+)'),
+    re.compile(r'jobId=(\d+)'),
+    re.compile(r'-(\d+)(?:\?|$)')
+]
+
+
+def extract_job_id(url: str) -> Optional[str]:
+    """Extrait l'ID LinkedIn d'une URL d'offre"""
+    if not url:
+        return None
+    for pattern in JOB_ID_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+    return None
+
+
+def content_hash(description: Optional[str]) -> Optional[str]:
+    """Empreinte de la description extraite"""
+    if not description:
+        return None
+    return hashlib.sha1(description.encode('utf-8')).hexdigest()
+
+
+class DetailCache:
+    """
+    Cache LRU en mémoire des détails d'offres, avec TTL de fraîcheur.
+    Partagé entre le scraper amélioré et le scraper historique.
+    """
+
+    def __init__(self, ttl: timedelta = DETAIL_CACHE_TTL, max_entries: int = DETAIL_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """Clé de cache : job id LinkedIn, sinon l'URL sans paramètres"""
+        return extract_job_id(url) or url.split('?')[0]
+
+    def is_fresh(self, fetched_at: Optional[datetime]) -> bool:
+        return bool(fetched_at) and datetime.utcnow() - fetched_at < self.ttl
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Renvoie une copie des détails si l'entrée est fraîche"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and self.is_fresh(entry['fetched_at']):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return deepcopy(entry['details'])
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, details: Dict[str, Any], fetched_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """Enregistre les détails (avec l'empreinte de la description)"""
+        entry = {
+            'details': deepcopy(details),
+            'fetched_at': fetched_at or datetime.utcnow(),
+            'description_hash': content_hash(details.get('description'))
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+# Cache partagé par défaut entre les instances de scrapers du processus
+shared_detail_cache = DetailCache()
@@ -0,0 +1,184 @@
+# job_enrichment.py - Enrichissement asynchrone des offres (pages de détail)
+import asyncio
+import itertools
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.db.database import get_database
+from app.services.browser_executor import run_in_browser_thread
+from app.services.detail_cache import content_hash
+from app.services.job_fingerprint import job_fingerprint, near_duplicate_fields
+
+logger = logging.getLogger(__name__)
+
+# Priorités (plus petit = plus urgent)
+PRIORITY_USER = 0          # offre consultée par un utilisateur
+PRIORITY_BACKGROUND = 10   # offre nouvellement insérée
+
+# Fermeture du navigateur d'un worker inactif (secondes)
+WORKER_IDLE_TIMEOUT = 60.0
+
+
+class JobEnrichmentService:
+    """
+    Étape d'enrichissement : une file à priorité d'identifiants d'offres,
+    consommée par des workers bornés (un navigateur chacun) qui récupèrent
+    les détails et écrivent des mises à jour partielles par lots.
+    """
+
+    def __init__(self,
+                 workers: int = settings.ENRICHMENT_WORKERS,
+                 batch_size: int = settings.ENRICHMENT_BATCH_SIZE,
+                 flush_interval: float = settings.ENRICHMENT_FLUSH_INTERVAL):
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._sequence = itertools.count()
+        self._queued: Dict[Any, int] = {}     # job _id -> meilleure priorité en file
+        self._in_progress = set()
+        self._pending: List[UpdateOne] = []
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def _ensure_started(self):
+        """Démarre les workers à la première sollicitation (boucle en cours)"""
+        if self.running:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._flush_lock = asyncio.Lock()
+        self._tasks = [asyncio.create_task(self._worker(index)) for index in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._periodic_flush()))
+        logger.info(f"🧩 Enrichissement démarré ({self.workers} workers)")
+
+    def enqueue(self, job_ids: Iterable[Any], priority: int = PRIORITY_BACKGROUND):
+        """Ajoute des offres à enrichir ; une offre déjà en file n'est reprise que si plus prioritaire"""
+        self._ensure_started()
+        for job_id in job_ids:
+            if job_id in self._in_progress:
+                continue
+            current = self._queued.get(job_id)
+            if current is not None and current <= priority:
+                continue
+            self._queued[job_id] = priority
+            self._queue.put_nowait((priority, next(self._sequence), job_id))
+
+    def prioritize(self, job_id: Any):
+        """Passe une offre consultée par un utilisateur en tête de file"""
+        self.enqueue([job_id], priority=PRIORITY_USER)
+
+    async def _next_job_id(self, scraper) -> Optional[Any]:
+        """Prochaine offre à traiter ; ferme le navigateur si le worker reste inactif"""
+        while True:
+            try:
+                priority, _, job_id = await asyncio.wait_for(self._queue.get(), WORKER_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                if scraper.driver:
+                    await run_in_browser_thread(scraper.driver.quit)
+                    scraper.driver = None
+                continue
+
+            # Entrée obsolète (l'offre a été re-poussée avec une meilleure priorité)
+            if self._queued.get(job_id) != priority:
+                continue
+            del self._queued[job_id]
+            return job_id
+
+    async def _worker(self, index: int):
+        from app.services.linkedin_scraper_enhanced import LinkedInJobScraper
+
+        db = await get_database()
+        # Même base que les offres : fiches entreprise (companies) lues et mises à jour
+        scraper = LinkedInJobScraper(db=db)
+
+        try:
+            while True:
+                job_id = await self._next_job_id(scraper)
+                self._in_progress.add(job_id)
+                try:
+                    update = await self._enrich_job(db, scraper, job_id)
+                    if update:
+                        self._pending.append(update)
+                        if len(self._pending) >= self.batch_size:
+                            await self.flush()
+                except Exception as e:
+                    logger.error(f"❌ Worker {index}: erreur enrichissement {job_id}: {e}")
+                finally:
+                    self._in_progress.discard(job_id)
+        finally:
+            if scraper.driver:
+                await run_in_browser_thread(scraper.driver.quit)
+
+    async def _enrich_job(self, db, scraper, job_id: Any) -> Optional[UpdateOne]:
+        """Récupère les détails d'une offre et prépare sa mise à jour partielle"""
+        job = await db.jobs.find_one(
+            {'_id': job_id},
+            {'linkedin_url': 1, 'job_id': 1, 'fingerprint': 1, 'description': 1, 'details_fetched_at': 1,
+             'company_id': 1}
+        )
+        if not job or not job.get('linkedin_url'):
+            return None
+        if job.get('description') and scraper.detail_cache.is_fresh(job.get('details_fetched_at')):
+            return None
+
+        # Fiche entreprise relevée au plus une fois par entreprise (companies)
+        details = await scraper.get_job_details(job['linkedin_url'], persist=False,
+                                                company_id=job.get('company_id'))
+        if details is None:
+            return None
+
+        # Repost d'une offre existante : lien `duplicate_of` via les bandes SimHash
+        fingerprint = job.get('fingerprint') or job_fingerprint(job)
+        duplicate = await near_duplicate_fields(db.jobs, fingerprint, details.get('description'))
+
+        now = datetime.utcnow()
+        return UpdateOne(
+            {'_id': job_id},
+            {'$set': {
+                **details,
+                **duplicate,
+                'details_fetched_at': now,
+                'description_hash': content_hash(details.get('description')),
+                'updatedAt': now
+            }}
+        )
+
+    async def flush(self):
+        """Écrit les mises à jour en attente en un seul bulk_write"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            try:
+                db = await get_database()
+                result = await db.jobs.bulk_write(batch, ordered=False)
+                logger.info(f"🧩 {result.modified_count}/{len(batch)} offres enrichies")
+            except Exception as e:
+                logger.error(f"❌ Erreur écriture enrichissement: {e}")
+
+    async def _periodic_flush(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def stop(self):
+        """Arrête les workers et écrit les mises à jour restantes"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._flush_lock:
+            await self.flush()
+
+
+# Instance partagée du processus
+job_enrichment_service = JobEnrichmentService()
@@ -0,0 +1,237 @@
+# job_fingerprint.py - Empreinte stable des offres et détection des quasi-doublons (SimHash)
+import hashlib
+import logging
+import re
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+from app.services.detail_cache import extract_job_id
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+# Distance de Hamming maximale entre deux quasi-doublons : avec 4 bandes de
+# 16 bits, deux empreintes à distance <= 3 partagent forcément une bande
+NEAR_DUPLICATE_DISTANCE = 3
+
+# Ancien index d'unicité (titre, entreprise, lieu), remplacé par l'empreinte
+LEGACY_IDENTITY_INDEX = 'title_1_company_1_location_1'
+FINGERPRINT_INDEX_OPTIONS = {'unique': True, 'partialFilterExpression': {'fingerprint': {'$exists': True}}}
+
+_WORD_RE = re.compile(r'\w+')
+# Mentions sans valeur d'identification ("(H/F)", "F/H", "m/w/d")
+_NOISE_RE = re.compile(r'\(?\b(?:h/f|f/h|m/f|f/m|m/w/d|h/f/x)\b\)?')
+
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def _flat(value: Any) -> str:
+    """Champ texte ou imbriqué (scraper historique : {"name": ...}, {"city": ..., "country": ...})"""
+    if isinstance(value, dict):
+        if value.get('name'):
+            return str(value['name'])
+        return ' '.join(str(part) for key, part in value.items()
+                        if isinstance(part, str) and part and key in ('city', 'region', 'country'))
+    return str(value or '')
+
+
+def normalize_text(value: Any) -> str:
+    """Minuscules, sans accents, mentions de genre ni ponctuation"""
+    text = _NOISE_RE.sub(' ', _fold(_flat(value)))
+    return ' '.join(_WORD_RE.findall(text))
+
+
+def linkedin_id_of(job: Dict[str, Any]) -> Optional[str]:
+    if job.get('job_id'):
+        return str(job['job_id'])
+    if job.get('linkedin_job_id'):
+        return str(job['linkedin_job_id'])
+    for key in ('linkedin_url', 'url'):
+        job_id = extract_job_id(job.get(key) or '')
+        if job_id:
+            return job_id
+    return None
+
+
+def job_fingerprint(job: Dict[str, Any]) -> str:
+    """Identité stable : "li:<id LinkedIn>", sinon empreinte de (titre, entreprise, ville)"""
+    job_id = linkedin_id_of(job)
+    if job_id:
+        return f"li:{job_id}"
+    location = job.get('location')
+    city = normalize_text(location.get('city') if isinstance(location, dict) else str(location or '').split(',')[0])
+    key = '|'.join((normalize_text(job.get('title')), normalize_text(job.get('company')), city))
+    return f"key:{hashlib.sha1(key.encode('utf-8')).hexdigest()[:24]}"
+
+
+def _features(text: str) -> Counter:
+    words = _WORD_RE.findall(_fold(text))
+    if len(words) < 3:
+        return Counter(words)
+    return Counter(' '.join(words[i:i + 3]) for i in range(len(words) - 2))
+
+
+def simhash(text: Optional[str]) -> Optional[int]:
+    """SimHash 64 bits sur les 3-grammes de mots (pondérés par fréquence)"""
+    features = _features(text or '')
+    if not features:
+        return None
+    weights = [0] * SIMHASH_BITS
+    for feature, count in features.items():
+        value = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += count if value >> bit & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def simhash_bands(value: int) -> List[str]:
+    """Bandes indexées ("<rang>:<16 bits hex>") : une égalité de bande = candidat"""
+    mask = (1 << BAND_BITS) - 1
+    return [f"{band}:{value >> (band * BAND_BITS) & mask:04x}" for band in range(SIMHASH_BANDS)]
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def description_fields(description: Optional[str]) -> Dict[str, Any]:
+    """Champs SimHash d'une description (entier 64 bits stocké en hexadécimal)"""
+    value = simhash(description) if description and description != 'N/A' else None
+    if value is None:
+        return {}
+    return {'simhash': f"{value:016x}", 'simhash_bands': simhash_bands(value)}
+
+
+def _closest(value: int, candidates: Iterable[Dict[str, Any]], fingerprint: str) -> Optional[str]:
+    """Empreinte canonique du candidat le plus proche, si quasi-doublon"""
+    best, best_distance = None, NEAR_DUPLICATE_DISTANCE + 1
+    for candidate in candidates:
+        if candidate.get('fingerprint') == fingerprint or not candidate.get('simhash'):
+            continue
+        distance = hamming(value, int(candidate['simhash'], 16))
+        if distance < best_distance:
+            best, best_distance = candidate, distance
+    if best is None:
+        return None
+    return best.get('duplicate_of') or best.get('fingerprint')
+
+
+async def find_near_duplicate(collection, fingerprint: str, fields: Dict[str, Any]) -> Optional[str]:
+    """Recherche par bandes (index multiclé) de l'offre dont `fields` serait un repost"""
+    if not fields.get('simhash'):
+        return None
+    candidates = await collection.find(
+        {'simhash_bands': {'$in': fields['simhash_bands']}},
+        {'fingerprint': 1, 'simhash': 1, 'duplicate_of': 1}
+    ).to_list(length=None)
+    return _closest(int(fields['simhash'], 16), candidates, fingerprint)
+
+
+async def near_duplicate_fields(collection, fingerprint: str, description: Optional[str]) -> Dict[str, Any]:
+    """Champs à écrire avec une nouvelle description : SimHash, bandes et lien `duplicate_of`"""
+    fields = description_fields(description)
+    if fields:
+        fields['duplicate_of'] = await find_near_duplicate(collection, fingerprint, fields)
+    return fields
+
+
+async def annotate_batch(collection, jobs: List[Dict[str, Any]]):
+    """
+    Ajoute empreinte, SimHash et lien `duplicate_of` à un lot d'offres : une
+    seule requête sur les bandes du lot, puis résolution en mémoire (y compris
+    entre offres du même lot).
+    """
+    described = []
+    for job in jobs:
+        job['fingerprint'] = job_fingerprint(job)
+        fields = description_fields(job.get('description'))
+        if fields:
+            job.update(fields)
+            described.append(job)
+    if not described:
+        return
+
+    bands = sorted({band for job in described for band in job['simhash_bands']})
+    candidates = await collection.find(
+        {'simhash_bands': {'$in': bands}},
+        {'fingerprint': 1, 'simhash': 1, 'duplicate_of': 1, 'simhash_bands': 1}
+    ).to_list(length=None)
+
+    by_band: Dict[str, List[Dict[str, Any]]] = {}
+    for candidate in candidates:
+        for band in candidate.get('simhash_bands', []):
+            by_band.setdefault(band, []).append(candidate)
+
+    for job in described:
+        pool = [candidate for band in job['simhash_bands'] for candidate in by_band.get(band, [])]
+        job['duplicate_of'] = _closest(int(job['simhash'], 16), pool, job['fingerprint'])
+        # Les offres suivantes du lot peuvent être des reposts de celle-ci
+        entry = {key: job.get(key) for key in ('fingerprint', 'simhash', 'duplicate_of')}
+        for band in job['simhash_bands']:
+            by_band.setdefault(band, []).append(entry)
+
+
+async def backfill_fingerprints(collection, batch_size: int = 1000) -> int:
+    """
+    Migration : empreinte des offres qui n'en ont pas. Une offre dont
+    l'empreinte existe déjà est liée à l'existante via `duplicate_of`.
+    """
+    updated = 0
+    cursor = collection.find(
+        {'fingerprint': {'$exists': False}, 'duplicate_of': {'$exists': False}},
+        {'job_id': 1, 'linkedin_job_id': 1, 'linkedin_url': 1, 'url': 1, 'title': 1, 'company': 1, 'location': 1}
+    )
+    batch: List[Dict[str, Any]] = []
+
+    async def flush(documents: List[Dict[str, Any]]) -> int:
+        fingerprints = {document['_id']: job_fingerprint(document) for document in documents}
+        taken = {
+            existing['fingerprint'] for existing in await collection.find(
+                {'fingerprint': {'$in': list(set(fingerprints.values()))}}, {'fingerprint': 1}
+            ).to_list(length=None)
+        }
+        operations = []
+        for document_id, fingerprint in fingerprints.items():
+            if fingerprint in taken:
+                operations.append(UpdateOne({'_id': document_id}, {'$set': {'duplicate_of': fingerprint}}))
+            else:
+                taken.add(fingerprint)
+                operations.append(UpdateOne({'_id': document_id}, {'$set': {'fingerprint': fingerprint}}))
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    async for document in cursor:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            updated += await flush(batch)
+            batch = []
+    if batch:
+        updated += await flush(batch)
+
+    if updated:
+        logger.info(f"🔖 {updated} offres existantes empreintées")
+    return updated
+
+
+async def migrate_fingerprints(collection) -> int:
+    """Migration (init_db) : supprime l'unicité (titre, entreprise, lieu) et calcule les empreintes manquantes"""
+    if LEGACY_IDENTITY_INDEX in await collection.index_information():
+        await collection.drop_index(LEGACY_IDENTITY_INDEX)
+        logger.info("🔖 Ancien index d'unicité titre/entreprise/lieu supprimé")
+    return await backfill_fingerprints(collection)
+
+
+async def ensure_fingerprint_indexes(collection):
+    """Unicité par empreinte et index des bandes SimHash (sans migration)"""
+    await collection.create_index('fingerprint', background=True, **FINGERPRINT_INDEX_OPTIONS)
+    await collection.create_index('simhash_bands', background=True)
+    await collection.create_index('duplicate_of', background=True)
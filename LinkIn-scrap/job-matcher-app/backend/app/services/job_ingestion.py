@@ -0,0 +1,179 @@
+# job_ingestion.py - Étape unique d'ingestion des offres scrapées (bulk upserts)
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.services.company_registry import company_registry
+from app.services.job_fingerprint import annotate_batch, job_fingerprint
+from app.services.location_gazetteer import normalize_job_location
+
+logger = logging.getLogger(__name__)
+
+# Taille des lots envoyés à bulk_write
+INGESTION_BATCH_SIZE = 500
+
+# Champs écrits uniquement à la création du document (ou s'ils manquent encore).
+# `posted_at` est recalculé à chaque scraping depuis une date relative
+# ("il y a 2 jours") : le réécrire ferait passer toute offre pour modifiée.
+INSERT_ONLY_FIELDS = ('createdAt', 'scraped_at', 'views', 'applications', 'status', 'posted_at')
+
+# Champs de la page de détail : une carte (offre sans description) n'en porte
+# que des valeurs d'attente, qui ne doivent pas écraser une offre déjà enrichie
+DETAIL_FIELDS = ('description', 'requirements', 'benefits', 'salary', 'skills', 'company_info')
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+@dataclass
+class IngestionResult:
+    """Bilan d'une ingestion : insérés, mis à jour, doublons, erreurs"""
+    inserted: int = 0
+    updated: int = 0
+    duplicates: int = 0
+    errors: int = 0
+    # Index (dans la liste fournie) et _id des offres nouvellement insérées
+    inserted_indices: List[int] = field(default_factory=list)
+    inserted_ids: List[Any] = field(default_factory=list)
+
+    @property
+    def saved(self) -> int:
+        return self.inserted + self.updated
+
+    def merge(self, other: 'IngestionResult', offset: int = 0):
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.duplicates += other.duplicates
+        self.errors += other.errors
+        self.inserted_indices.extend(index + offset for index in other.inserted_indices)
+        self.inserted_ids.extend(other.inserted_ids)
+
+    def apply_to_stats(self, stats):
+        """Reporte les compteurs dans un ScrapingStats"""
+        stats.total_jobs_saved += self.inserted
+        stats.duplicates_found += self.duplicates
+        stats.errors_count += self.errors
+
+
+def job_identity(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Filtre d'identité d'une offre : empreinte (id LinkedIn, sinon titre/entreprise/ville normalisés)"""
+    return {'fingerprint': job.get('fingerprint') or job_fingerprint(job)}
+
+
+def _build_upsert(job: Dict[str, Any], now: datetime) -> UpdateOne:
+    """
+    Upsert en pipeline : `updatedAt` n'avance que si le contenu change, ce qui
+    permet de distinguer mises à jour réelles et doublons via nModified.
+    Une offre sans description (carte de résultats) n'écrit ses champs de
+    détail qu'à la création.
+    """
+    insert_only_fields = INSERT_ONLY_FIELDS
+    if not job.get('description'):
+        insert_only_fields += DETAIL_FIELDS
+    content = {k: v for k, v in job.items() if k not in insert_only_fields and k not in ('_id', 'updatedAt')}
+    insert_only = {k: job[k] for k in insert_only_fields if k in job}
+
+    changed = {'$or': [{'$ne': [f'${key}', {'$literal': value}]} for key, value in content.items()]} if content else True
+    pipeline = [
+        {'$set': {'updatedAt': {'$cond': [changed, now, '$updatedAt']}}},
+        {'$set': {
+            **{key: {'$literal': value} for key, value in content.items()},
+            **{key: {'$ifNull': [f'${key}', {'$literal': value}]} for key, value in insert_only.items()}
+        }}
+    ]
+    return UpdateOne(job_identity(job), pipeline, upsert=True)
+
+
+async def _write_batch(collection, jobs: List[Dict[str, Any]]) -> IngestionResult:
+    result = IngestionResult()
+    now = datetime.utcnow()
+
+    # Lieux normalisés (gazetteer) : identifiants canoniques pour les filtres exacts
+    for job in jobs:
+        if 'location' in job:
+            normalize_job_location(job)
+
+    # Entreprises canoniques (collection companies) : référence `company_id`
+    try:
+        await company_registry.assign_company_ids(collection.database.companies, jobs)
+    except Exception as e:
+        logger.warning(f"⚠️ Erreur résolution des entreprises: {e}")
+
+    # Empreintes et quasi-doublons (SimHash) du lot
+    await annotate_batch(collection, jobs)
+
+    # Dédoublonnage intra-lot : une seule opération par empreinte
+    operations, positions, seen = [], [], set()
+    for index, job in enumerate(jobs):
+        key = job['fingerprint']
+        if key in seen:
+            result.duplicates += 1
+            continue
+        seen.add(key)
+        operations.append(_build_upsert(job, now))
+        positions.append(index)
+
+    if not operations:
+        return result
+
+    try:
+        bulk = await collection.bulk_write(operations, ordered=False)
+        upserted = bulk.upserted_ids or {}
+        matched, modified = bulk.matched_count, bulk.modified_count
+    except BulkWriteError as e:
+        details = e.details
+        upserted = {item['index']: item['_id'] for item in details.get('upserted', [])}
+        matched, modified = details.get('nMatched', 0), details.get('nModified', 0)
+        for error in details.get('writeErrors', []):
+            if error.get('code') == DUPLICATE_KEY_ERROR:
+                result.duplicates += 1
+            else:
+                result.errors += 1
+                logger.error(f"❌ Erreur upsert job: {error.get('errmsg')}")
+
+    result.inserted = len(upserted)
+    result.updated = modified
+    result.duplicates += matched - modified
+    for op_index, inserted_id in sorted(upserted.items()):
+        result.inserted_indices.append(positions[op_index])
+        result.inserted_ids.append(inserted_id)
+    return result
+
+
+async def bulk_upsert_jobs(collection,
+                           jobs: List[Dict[str, Any]],
+                           batch_size: int = INGESTION_BATCH_SIZE,
+                           stats: Optional[Any] = None) -> IngestionResult:
+    """
+    Ingestion des offres par lots `bulk_write(ordered=False)`.
+
+    Args:
+        collection: Collection Motor cible (db.jobs)
+        jobs: Offres à insérer ou mettre à jour
+        batch_size: Nombre d'opérations par aller-retour
+        stats: ScrapingStats optionnel alimenté avec le bilan
+
+    Returns:
+        Bilan inséré / mis à jour / doublons / erreurs
+    """
+    total = IngestionResult()
+
+    for offset in range(0, len(jobs), batch_size):
+        batch = jobs[offset:offset + batch_size]
+        try:
+            total.merge(await _write_batch(collection, batch), offset)
+        except Exception as e:
+            logger.error(f"❌ Erreur ingestion lot {offset // batch_size + 1}: {e}")
+            total.errors += len(batch)
+
+    if stats is not None:
+        total.apply_to_stats(stats)
+
+    logger.info(
+        f"💾 Ingestion: {total.inserted} insérés, {total.updated} mis à jour, "
+        f"{total.duplicates} doublons, {total.errors} erreurs"
+    )
+    return total
@@ -0,0 +1,139 @@
+# keyword_matcher.py - Classification des textes d'offres en une seule passe
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Dictionnaires de mots-clés par langue et par label.
+# Les mots-clés sont comparés en minuscules, sans frontière de mot
+# (même sémantique que l'ancien `any(keyword in text.lower())`).
+KEYWORD_DICTIONARIES: Dict[str, Dict[str, List[str]]] = {
+    'en': {
+        'remote': [
+            'remote', 'home office', 'work from home',
+            'distributed', 'anywhere', 'telecommute', 'virtual'
+        ],
+        'urgent': [
+            'urgent', 'asap', 'immediately', 'quickly', 'fast', 'emergency'
+        ],
+        'benefit': [
+            'health insurance', '401k', 'vacation', 'remote work',
+            'flexible hours', 'bonus', 'stock options', 'training', 'development'
+        ],
+        'requirement': [
+            'required', 'require', 'must have', 'qualifications', 'qualification',
+            'experience'
+        ]
+    },
+    'fr': {
+        'remote': ['télétravail'],
+        'urgent': ['immédiat', 'prioritaire'],
+        'benefit': ['assurance santé', 'formation', 'congés'],
+        'requirement': []
+    }
+}
+
+DEFAULT_LANGUAGES: Tuple[str, ...] = ('fr', 'en')
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    """Occurrence d'un mot-clé dans un texte"""
+    label: str
+    keyword: str
+    start: int
+    end: int
+
+
+class KeywordMatcher:
+    """
+    Matcher multi-motifs compilé : tous les mots-clés de tous les labels sont
+    fusionnés dans une seule alternative regex (les plus longs d'abord), ce qui
+    permet de parcourir le texte une seule fois dans le moteur C de `re`.
+    L'alternative est une assertion avant de largeur nulle : elle est testée à
+    chaque position, de sorte que les mots-clés qui se chevauchent ("remote
+    work" et "work from home") sont tous trouvés. Les mots-clés préfixes du
+    plus long trouvé ("remote" pour "remote work") sont réémis à la même
+    position : chaque occurrence est rapportée une fois, comme avec `in`.
+    """
+
+    def __init__(self, dictionary: Optional[Dict[str, Iterable[str]]] = None):
+        self._labels: Dict[str, List[str]] = {}
+        self._pattern = None
+
+        for label, keywords in (dictionary or {}).items():
+            for keyword in keywords:
+                self.add(keyword, label)
+
+    def add(self, keyword: str, label: str):
+        """Ajoute un mot-clé associé à un label"""
+        keyword = keyword.lower()
+        if not keyword:
+            return
+
+        labels = self._labels.setdefault(keyword, [])
+        if label not in labels:
+            labels.append(label)
+        self._pattern = None
+
+    def build(self):
+        """Compile l'alternative et précalcule les mots-clés préfixes"""
+        keywords = sorted(self._labels, key=len, reverse=True)
+        # Classe des premiers caractères en tête : rejet rapide des positions sans mot-clé
+        first = ''.join(sorted({re.escape(keyword[0]) for keyword in keywords}))
+        alternation = '|'.join(re.escape(keyword) for keyword in keywords)
+        self._pattern = re.compile(f'(?=[{first}])(?=({alternation}))')
+
+        # Pour chaque mot-clé : (mot-clé, labels) de tous les mots-clés qui en sont préfixes
+        self._prefixes: Dict[str, List[Tuple[str, List[str]]]] = {
+            keyword: [(other, self._labels[other]) for other in keywords if keyword.startswith(other)]
+            for keyword in keywords
+        }
+        return self
+
+    def scan(self, text: str) -> List[KeywordMatch]:
+        """Parcourt le texte une seule fois et renvoie toutes les occurrences, chevauchements compris"""
+        if not text or not self._labels:
+            return []
+        if self._pattern is None:
+            self.build()
+
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Rares caractères dont la minuscule change de longueur (ex: 'İ')
+            lowered = ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+        matches = []
+        # Plus long mot-clé commençant à chaque position, puis ses préfixes
+        for found in self._pattern.finditer(lowered):
+            start = found.start()
+            for keyword, labels in self._prefixes[found.group(1)]:
+                for label in labels:
+                    matches.append(KeywordMatch(label, keyword, start, start + len(keyword)))
+        return matches
+
+    def classify(self, text: str) -> Dict[str, List[KeywordMatch]]:
+        """Regroupe les occurrences par label"""
+        labels: Dict[str, List[KeywordMatch]] = {}
+        for match in self.scan(text):
+            labels.setdefault(match.label, []).append(match)
+        return labels
+
+
+def build_dictionary(languages: Iterable[str] = DEFAULT_LANGUAGES,
+                     extra: Optional[Dict[str, Iterable[str]]] = None) -> Dict[str, List[str]]:
+    """Fusionne les dictionnaires des langues demandées (+ mots-clés additionnels)"""
+    merged: Dict[str, List[str]] = {}
+    for language in languages:
+        if language not in KEYWORD_DICTIONARIES:
+            raise ValueError(f"Langue non supportée: {language}")
+        for label, keywords in KEYWORD_DICTIONARIES[language].items():
+            merged.setdefault(label, []).extend(keywords)
+    for label, keywords in (extra or {}).items():
+        merged.setdefault(label, []).extend(keywords)
+    return merged
+
+
+def build_matcher(languages: Iterable[str] = DEFAULT_LANGUAGES,
+                  extra: Optional[Dict[str, Iterable[str]]] = None) -> KeywordMatcher:
+    """Construit et compile un matcher pour les langues données"""
+    return KeywordMatcher(build_dictionary(languages, extra)).build()
@@ -12,6 +12,15 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
+from app.core.config import settings
+from app.services.browser_profile import apply_lean_profile, enable_request_blocking
+from app.services.contract_filter import ContractFilter
+from app.services.detail_cache import DetailCache, shared_detail_cache
+from app.services.page_readiness import scroll_until_stable, wait_for_cards
+from app.services.location_gazetteer import get_gazetteer
+from app.services.request_pacer import is_throttled_page, request_pacer
+from app.services.structured_data import find_job_posting, job_posting_details
+
 # Chargement des variables d'environnement
 load_dotenv()
 
@@ -43,8 +52,12 @@ class LinkedInScraper:
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
         chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36")
+        if settings.SCRAPING_LEAN_PROFILE:
+            apply_lean_profile(chrome_options)
         
         self.driver = webdriver.Chrome(options=chrome_options)
+        if settings.SCRAPING_LEAN_PROFILE:
+            enable_request_blocking(self.driver)
         self.driver.implicitly_wait(10)
     
     def login(self):
@@ -162,9 +175,8 @@ class LinkedInScraper:
         """
         Fait défiler la page pour charger plus d'offres d'emploi.
         """
-        for _ in range(max_scrolls):
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)  # Attendre le chargement des nouveaux éléments
+        # S'arrête dès qu'un scroll n'apporte plus de nouvelles offres
+        scroll_until_stable(self.driver, [".jobs-search__results-list li"], max_scrolls)
     
     def _extract_job_listings(self) -> List[Dict]:
         """
@@ -206,11 +218,8 @@ class LinkedInScraper:
                         "linkedin_id": None,
                         "website": None
                     },
-                    "location": {
-                        "city": location_text.split(",")[0].strip() if "," in location_text else location_text,
-                        "country": location_text.split(",")[1].strip() if "," in location_text else "",
-                        "remote": "remote" in location_text.lower()
-                    },
+                    # Champs JobLocation normalisés (ville, région, pays et identifiants)
+                    "location": get_gazetteer().resolve(location_text),
                     "url": url,
                     "scraped_at": datetime.utcnow().isoformat()
                 }
@@ -248,12 +257,16 @@ class LinkedInScraper:
             print("La page de l'offre n'a pas pu être chargée.")
             return {}
         
-        # Extraire les détails
-        soup = BeautifulSoup(self.driver.page_source, "html.parser")
+        # Extraire les détails : données structurées JobPosting (JSON-LD) d'abord,
+        # sélecteurs CSS en repli pour les champs absents
+        page_source = self.driver.page_source
+        posting = find_job_posting(page_source)
+        structured = job_posting_details(posting) if posting else {}
+        soup = BeautifulSoup(page_source, "html.parser")
         
         # Description de l'offre
-        description = ""
-        description_elem = soup.select_one(".description__text")
+        description = structured.get("description") or ""
+        description_elem = soup.select_one(".description__text") if not description else None
         if description_elem:
             description = description_elem.text.strip()
         
@@ -279,7 +292,7 @@ class LinkedInScraper:
                 skills.append(skill_text)
         
         # Type d'emploi et niveau d'expérience
-        employment_type = None
+        employment_type = structured.get("type")
         experience_level = None
         criteria_elems = soup.select(".description__job-criteria-item")
         
@@ -294,13 +307,13 @@ class LinkedInScraper:
             value_text = value.text.strip()
             
             if "type" in header_text:
-                employment_type = value_text
+                employment_type = employment_type or value_text
             elif "expérience" in header_text or "experience" in header_text:
                 experience_level = value_text
         
         # Date de publication
-        posted_date = None
-        date_elem = soup.select_one(".posted-time-ago__text")
+        posted_date = structured.get("postedAt")
+        date_elem = soup.select_one(".posted-time-ago__text") if not posted_date else None
         if date_elem:
             # Convertir le texte en date (approximative)
             date_text = date_elem.text.strip()
@@ -313,6 +326,8 @@ class LinkedInScraper:
             "employment_type": employment_type,
             "experience_level": experience_level,
             "posted_date": posted_date.isoformat() if posted_date else None,
+            "salary": structured.get("salary"),
+            "location_info": structured.get("location_info"),
             "recruiter": recruiter if recruiter else None
         }
         
@@ -368,12 +383,13 @@ class LinkedInScraper:
     Classe pour le scraping des offres d'emploi sur LinkedIn.
     """
     
-    def __init__(self):
+    def __init__(self, detail_cache: Optional[DetailCache] = None):
         """
         Initialise le scraper LinkedIn.
         """
         self.driver = None
         self.logged_in = False
+        self.detail_cache = detail_cache or shared_detail_cache
         self.username = os.getenv("LINKEDIN_USERNAME")
         self.password = os.getenv("LINKEDIN_PASSWORD")
         
@@ -391,8 +407,12 @@ class LinkedInScraper:
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
         chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36")
+        if settings.SCRAPING_LEAN_PROFILE:
+            apply_lean_profile(chrome_options)
         
         self.driver = webdriver.Chrome(options=chrome_options)
+        if settings.SCRAPING_LEAN_PROFILE:
+            enable_request_blocking(self.driver)
         self.driver.implicitly_wait(10)
     
     def login(self):
@@ -437,14 +457,23 @@ class LinkedInScraper:
         keywords: Optional[List[str]] = None,
         locations: Optional[List[str]] = None,
         contract_types: Optional[List[str]] = None,
-        max_pages: int = 3
+        max_pages: int = 3,
+        verify_contract_types: Optional[bool] = None
     ) -> list:
         """
         Scrape LinkedIn en utilisant la logique de scrapping.py, retourne une liste d'offres formatées.
+
+        Les types de contrat sont filtrés par la recherche (f_JT) et les
+        cartes ; `verify_contract_types` (défaut CONTRACT_DETAIL_VERIFICATION)
+        confirme en plus le type sur la page de détail déjà lue pour l'export.
         """
         if not self.logged_in:
             self.login()
 
+        contract_filter = ContractFilter(contract_types)
+        if verify_contract_types is None:
+            verify_contract_types = settings.CONTRACT_DETAIL_VERIFICATION
+
         all_offres_brutes = []
         for page in range(max_pages):
             start = page * 25
@@ -453,33 +482,42 @@ class LinkedInScraper:
                 locations=locations,
                 contract_types=contract_types
             ) + f"&start={start}"
+            # Cadence adaptative par hôte (remplace la pause fixe entre pages)
+            request_pacer.wait_sync(url)
+            started = time.perf_counter()
             self.driver.get(url)
-            time.sleep(2)
+            # Rend la main dès que les cartes sont présentes (ou la page calme)
+            wait_for_cards(self.driver, ["div.base-card"], timeout=10)
             html_content = self.driver.page_source
             offres_brutes = self._parse_job_offers(html_content)
+            # Page vide = fin des résultats ; seules les pages de limitation ralentissent l'hôte
+            throttled = is_throttled_page(self.driver.current_url, self.driver.title)
+            request_pacer.record(url, ok=not throttled, latency=time.perf_counter() - started)
             all_offres_brutes.extend(offres_brutes)
-            time.sleep(1)
-
-        offres_filtrees = self._filter_offers(
-            all_offres_brutes,
-            mots_cles_titre=keywords,
-            lieux_souhaites=locations
-        )
 
-        if contract_types:
-            nouvelles_offres = []
-            for offre in offres_filtrees:
-                description, _, _ = self._fetch_offer_details(offre['lien'])
-                if any(tc in offre["titre"].lower() or tc in description.lower() for tc in contract_types):
-                    nouvelles_offres.append(offre)
-            offres_filtrees = nouvelles_offres
+        offres_filtrees = [
+            offre for offre in self._filter_offers(
+                all_offres_brutes,
+                mots_cles_titre=keywords,
+                lieux_souhaites=locations
+            )
+            if contract_filter.accepts_card(offre["titre"])
+        ]
 
+        # Une page de détail par offre exportée : la vérification du type de
+        # contrat (optionnelle) réutilise cette lecture au lieu d'en ajouter une
         offres_json = []
-        for offre in offres_filtrees[:10]:
+        for offre in offres_filtrees:
+            if len(offres_json) >= 10:
+                break
             description, recruiter, email = self._fetch_offer_details(offre['lien'])
+            if (verify_contract_types and contract_filter.needs_verification(offre["titre"])
+                    and not contract_filter.text_matches(description)):
+                continue
             offre_json = {
                 "title": offre['titre'],
                 "company": offre['entreprise'],
+                "linkedin_url": offre['lien'],
                 "companyLogo": None,
                 "companyWebsite": None,
                 "companyDescription": None,
@@ -515,17 +553,9 @@ class LinkedInScraper:
             params.append(f"keywords={'%20'.join(keywords)}")
         if locations:
             params.append(f"location={'%2C%20'.join(locations)}")
-        if contract_types:
-            contract_map = {
-                "cdi": "F",
-                "cdd": "C",
-                "stage": "I",
-                "freelance": "T",
-                "alternance": "P"
-            }
-            codes = [contract_map.get(tc.lower()) for tc in contract_types if contract_map.get(tc.lower())]
-            if codes:
-                params.append("f_JT=" + "%2C".join(codes))
+        contract_param = ContractFilter(contract_types).query_param()
+        if contract_param:
+            params.append(contract_param)
         return base + "&".join(params)
 
     def _parse_job_offers(self, html_content):
@@ -567,20 +597,49 @@ class LinkedInScraper:
         return offres_filtrees
 
     def _fetch_offer_details(self, url):
+        # Une seule navigation par offre tant que les détails sont frais
+        cache_key = self.detail_cache.key_for(url)
+        cached = self.detail_cache.get(cache_key)
+        if cached is not None:
+            return cached.get('description', "N/A"), cached.get('recruiter', "N/A"), cached.get('email', "N/A")
+
         try:
+            request_pacer.wait_sync(url)
+            started = time.perf_counter()
             self.driver.get(url)
-            time.sleep(1)
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
-            desc_tag = soup.find("div", class_="show-more-less-html__markup")
-            description = desc_tag.get_text(strip=True) if desc_tag else "N/A"
-            recruiter_tag = soup.find("a", class_="topcard__org-name-link") or soup.find("span", class_="topcard__flavor")
-            recruiter = recruiter_tag.get_text(strip=True) if recruiter_tag else "N/A"
+            try:
+                WebDriverWait(self.driver, 5).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.show-more-less-html__markup"))
+                )
+            except TimeoutException:
+                pass
+            page_source = self.driver.page_source
+            # Données structurées JobPosting (JSON-LD) sans DOM, sélecteurs CSS en repli
+            posting = find_job_posting(page_source)
+            structured = job_posting_details(posting) if posting else {}
+            if structured.get("description"):
+                description = structured["description"]
+                recruiter = structured["company_info"].get("name") or "N/A"
+            else:
+                soup = BeautifulSoup(page_source, "html.parser")
+                desc_tag = soup.find("div", class_="show-more-less-html__markup")
+                description = desc_tag.get_text(strip=True) if desc_tag else "N/A"
+                recruiter_tag = soup.find("a", class_="topcard__org-name-link") or soup.find("span", class_="topcard__flavor")
+                recruiter = recruiter_tag.get_text(strip=True) if recruiter_tag else "N/A"
+            throttled = is_throttled_page(self.driver.current_url, self.driver.title)
+            request_pacer.record(url, ok=not throttled, latency=time.perf_counter() - started)
             email = "N/A"
             if description and description != "N/A":
                 import re
                 match = re.search(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", description)
                 if match:
                     email = match.group(0)
+            if description != "N/A":
+                self.detail_cache.put(cache_key, {
+                    "description": description,
+                    "recruiter": recruiter,
+                    "email": email
+                })
             return description, recruiter, email
         except Exception:
             return "N/A", "N/A", "N/A"
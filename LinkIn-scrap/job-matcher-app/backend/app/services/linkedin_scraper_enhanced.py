@@ -4,20 +4,40 @@ import re
 import json
 import asyncio
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, AsyncIterator, Callable
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from motor.motor_asyncio import AsyncIOMotorClient
 from bson import ObjectId
 import logging
 import random
+from bisect import bisect_left
 from urllib.parse import urlencode, urlparse, parse_qs
 
+from app.core.config import settings
+from app.services.browser_executor import run_in_browser_thread
+from app.services.browser_profile import apply_lean_profile, enable_request_blocking
+from app.services.card_extraction import extract_cards
+from app.services.company_registry import company_registry, ensure_company_indexes
+from app.services.detail_cache import DetailCache, extract_job_id, shared_detail_cache
+from app.services.job_fingerprint import ensure_fingerprint_indexes, job_fingerprint, near_duplicate_fields
+from app.services.job_ingestion import IngestionResult, bulk_upsert_jobs
+from app.services.keyword_matcher import DEFAULT_LANGUAGES, build_matcher
+from app.services.location_gazetteer import ensure_location_indexes
+from app.services.page_archive import PAGE_KIND_DETAIL, PAGE_KIND_SEARCH, PageArchive, get_page_archive
+from app.services.page_readiness import ReadinessTracker, scroll_until_stable
+from app.services.request_pacer import AdaptivePacer, is_throttled_page, request_pacer
+from app.services.scrape_pipeline import PageResult, RawPage, buffered
+from app.services.scrape_watermarks import build_search_key, load_watermark, save_watermark
+from app.services.skill_extractor import ensure_skill_indexes, get_skill_extractor
+from app.services.stage_timing import StageTimer
+from app.services.structured_data import find_job_posting, job_posting_details
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,13 +47,49 @@ class LinkedInJobScraper:
     Scraper avancé pour les offres d'emploi LinkedIn avec stockage en MongoDB
     """
     
-    def __init__(self, mongodb_uri: str = "mongodb://localhost:27017", db_name: str = "linkedin_scraper"):
+    def __init__(self, mongodb_uri: str = "mongodb://localhost:27017", db_name: str = "linkedin_scraper",
+                 languages: tuple = DEFAULT_LANGUAGES,
+                 detail_cache: Optional[DetailCache] = None,
+                 on_jobs_inserted: Optional[Callable[[List[Any]], None]] = None,
+                 extraction_mode: str = settings.SCRAPING_EXTRACTION_MODE,
+                 archive: Optional[PageArchive] = None,
+                 pacer: Optional[AdaptivePacer] = None,
+                 db: Optional[Any] = None):
         self.mongodb_uri = mongodb_uri
         self.db_name = db_name
         self.driver = None
-        self.db = None
+        # Base déjà connectée fournie par l'appelant (ex: workers d'enrichissement),
+        # sinon ouverte par initialize_database
+        self.db = db
         self.client = None
         
+        # Classifieur mots-clés (remote, urgent, avantages, exigences) en une passe
+        self.keyword_matcher = build_matcher(languages)
+        
+        # Compétences normalisées (dictionnaire FR/EN compilé en trie)
+        self.skill_extractor = get_skill_extractor()
+        
+        # Cache des pages de détail (job id -> détails extraits)
+        self.detail_cache = detail_cache or shared_detail_cache
+        
+        # Notifié avec les _id des offres nouvellement insérées (ex: file d'enrichissement)
+        self.on_jobs_inserted = on_jobs_inserted
+        
+        # Temps d'attente réel des pages face aux anciennes pauses fixes
+        self.readiness = ReadinessTracker()
+        
+        # Durées par étape (navigation, attente, scroll, extraction, parsing, écriture)
+        self.timings = StageTimer()
+        
+        # "browser" : cartes extraites dans la page ; "html" : page_source + BeautifulSoup
+        self.extraction_mode = extraction_mode
+        
+        # Archive optionnelle des pages brutes (ré-extraction hors ligne)
+        self.archive = archive or get_page_archive()
+        
+        # Cadence des requêtes par hôte, partagée par défaut dans le processus
+        self.pacer = pacer or request_pacer
+        
         # Configuration des sélecteurs CSS (mis à jour)
         self.selectors = {
             'job_cards': [
@@ -94,12 +150,12 @@ class LinkedInJobScraper:
     async def _create_indexes(self):
         """Crée les index nécessaires pour optimiser les performances"""
         try:
-            # Index pour éviter les doublons
-            await self.db.jobs.create_index([
-                ("title", 1),
-                ("company", 1),
-                ("location", 1)
-            ], unique=True, background=True)
+            # Identité des offres : empreinte (remplace l'unicité titre/entreprise/lieu)
+            await ensure_fingerprint_indexes(self.db.jobs)
+            await self.db.jobs.create_index("job_id", sparse=True, background=True)
+            await ensure_location_indexes(self.db.jobs)
+            await ensure_company_indexes(self.db)
+            await ensure_skill_indexes(self.db.jobs)
             
             # Index pour les recherches
             await self.db.jobs.create_index("createdAt", background=True)
@@ -110,12 +166,17 @@ class LinkedInJobScraper:
         except Exception as e:
             logger.warning(f"⚠️ Erreur création index: {e}")
     
-    def setup_driver(self, headless: bool = True) -> webdriver.Chrome:
-        """Configure et retourne une instance de Chrome WebDriver"""
+    def setup_driver(self, headless: bool = True, lean: bool = settings.SCRAPING_LEAN_PROFILE) -> webdriver.Chrome:
+        """
+        Configure et retourne une instance de Chrome WebDriver.
+        `lean` active le profil allégé (ni images, ni polices, ni médias, ni traceurs).
+        """
         options = Options()
         
         if headless:
             options.add_argument("--headless")
+        if lean:
+            apply_lean_profile(options)
         
         # Configuration anti-détection
         options.add_argument("--no-sandbox")
@@ -136,6 +197,8 @@ class LinkedInJobScraper:
         
         try:
             driver = webdriver.Chrome(options=options)
+            if lean:
+                enable_request_blocking(driver)
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             return driver
         except Exception as e:
@@ -200,62 +263,84 @@ class LinkedInJobScraper:
         
         return self.base_urls['jobs'] + urlencode(params)
     
-    def extract_job_data(self, job_element, page_source: str = None) -> Optional[Dict[str, Any]]:
+    def extract_job_data(self, job_element, page_source: str = None,
+                         fetched_at: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
         """Extrait les données d'une offre d'emploi à partir d'un élément HTML"""
         try:
-            job_data = {
-                'scraped_at': datetime.utcnow(),
-                'status': 'active',
-                'source': 'linkedin'
-            }
-            
             # Extraction du titre
             title = self._extract_with_selectors(job_element, self.selectors['title'])
             if not title:
                 return None
-            job_data['title'] = title
-            
-            # Extraction de l'entreprise
-            company = self._extract_with_selectors(job_element, self.selectors['company'])
-            if company:
-                job_data['company'] = company
-            
-            # Extraction de la localisation
-            location = self._extract_with_selectors(job_element, self.selectors['location'])
-            if location:
-                job_data['location'] = location
-            
-            # Extraction de la date de publication
-            time_posted = self._extract_with_selectors(job_element, self.selectors['time_posted'], attr='datetime')
-            if time_posted:
-                job_data['posted_at'] = self._parse_linkedin_date(time_posted)
             
             # Extraction du lien
             link_element = job_element.find('a')
-            if link_element and link_element.has_attr('href'):
-                job_data['linkedin_url'] = link_element['href']
-                job_data['job_id'] = self._extract_job_id(link_element['href'])
-            
-            # Extraction des informations supplémentaires
-            job_data.update({
-                'createdAt': datetime.utcnow(),
-                'updatedAt': datetime.utcnow(),
-                'views': 0,
-                'applications': 0,
-                'remote': self._detect_remote_work(title + ' ' + (location or '')),
-                'urgent': self._detect_urgent(title),
-                'description': '',  # Sera rempli lors du scraping détaillé
-                'requirements': [],
-                'benefits': [],
-                'salary': None
-            })
+            href = link_element['href'] if link_element and link_element.has_attr('href') else None
             
-            return job_data
+            return self._build_job_record(
+                title=title,
+                company=self._extract_with_selectors(job_element, self.selectors['company']),
+                location=self._extract_with_selectors(job_element, self.selectors['location']),
+                time_posted=self._extract_with_selectors(job_element, self.selectors['time_posted'], attr='datetime'),
+                href=href,
+                fetched_at=fetched_at
+            )
             
         except Exception as e:
             logger.error(f"❌ Erreur extraction données job: {e}")
             return None
     
+    def _build_job_record(self,
+                          title: str,
+                          company: Optional[str] = None,
+                          location: Optional[str] = None,
+                          time_posted: Optional[str] = None,
+                          href: Optional[str] = None,
+                          job_id: Optional[str] = None,
+                          fetched_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Construit le document d'une offre à partir des champs bruts d'une carte.
+        `fetched_at` sert de référence aux dates relatives (pages archivées).
+        """
+        job_data = {
+            'scraped_at': datetime.utcnow(),
+            'status': 'active',
+            'source': 'linkedin',
+            'title': title
+        }
+        
+        if company:
+            job_data['company'] = company
+        if location:
+            job_data['location'] = location
+        if time_posted:
+            job_data['posted_at'] = self._parse_linkedin_date(time_posted, reference=fetched_at)
+        if href:
+            job_data['linkedin_url'] = href
+        if href or job_id:
+            job_data['job_id'] = job_id or self._extract_job_id(href)
+        
+        # Classification : urgent sur le titre seul, remote sur le titre ou le lieu
+        # (chaîne concaténée évitée : un mot-clé ne peut chevaucher les deux champs)
+        labels = self.keyword_matcher.classify(title)
+        location_labels = self.keyword_matcher.classify(location) if location else {}
+        
+        # Extraction des informations supplémentaires
+        job_data.update({
+            'createdAt': datetime.utcnow(),
+            'updatedAt': datetime.utcnow(),
+            'views': 0,
+            'applications': 0,
+            'remote': bool(labels.get('remote') or location_labels.get('remote')),
+            'urgent': bool(labels.get('urgent')),
+            'description': '',  # Sera rempli lors du scraping détaillé
+            'skills': self.skill_extractor.extract(title),
+            'requirements': [],
+            'benefits': [],
+            'salary': None
+        })
+        
+        return job_data
+    
     def _extract_with_selectors(self, element, selectors: List[str], attr: str = None) -> Optional[str]:
         """Extrait du texte en essayant plusieurs sélecteurs CSS"""
         for selector in selectors:
@@ -272,31 +357,19 @@ class LinkedInJobScraper:
     def _extract_job_id(self, url: str) -> Optional[str]:
         """Extrait l'ID du job à partir de l'URL LinkedIn"""
         try:
-            # Patterns courants pour les IDs LinkedIn
-            patterns = [
-                r'/jobs/view/(\d+)',
-                r'currentJobId=(\d+)',
-                r'jobId=(\d+)',
-                r'-(\d+)(?:\?|$)'
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, url)
-                if match:
-                    return match.group(1)
-            return None
+            return extract_job_id(url)
         except:
             return None
     
-    def _parse_linkedin_date(self, date_str: str) -> Optional[datetime]:
-        """Parse les différents formats de date LinkedIn"""
+    def _parse_linkedin_date(self, date_str: str, reference: Optional[datetime] = None) -> Optional[datetime]:
+        """Parse les différents formats de date LinkedIn (relatifs à `reference`, maintenant par défaut)"""
         try:
             # Format ISO
             if 'T' in date_str:
                 return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
             
             # Formats relatifs
-            now = datetime.utcnow()
+            now = reference or datetime.utcnow()
             
             if 'minute' in date_str:
                 minutes = int(re.search(r'(\d+)', date_str).group(1))
@@ -320,25 +393,20 @@ class LinkedInJobScraper:
     
     def _detect_remote_work(self, text: str) -> bool:
         """Détecte si le poste permet le télétravail"""
-        remote_keywords = [
-            'remote', 'télétravail', 'home office', 'work from home',
-            'distributed', 'anywhere', 'telecommute', 'virtual'
-        ]
-        return any(keyword in text.lower() for keyword in remote_keywords)
+        return bool(self.keyword_matcher.classify(text).get('remote'))
     
     def _detect_urgent(self, text: str) -> bool:
         """Détecte si le poste est urgent"""
-        urgent_keywords = [
-            'urgent', 'asap', 'immediately', 'immédiat',
-            'quickly', 'fast', 'emergency', 'prioritaire'
-        ]
-        return any(keyword in text.lower() for keyword in urgent_keywords)
+        return bool(self.keyword_matcher.classify(text).get('urgent'))
     
     async def scrape_jobs(self,
                          keywords: Optional[List[str]] = None,
                          location: Optional[str] = None,
                          max_pages: int = 5,
-                         delay_range: tuple = (2, 5),
+                         delay_range: Optional[tuple] = None,
+                         incremental: bool = True,
+                         stats: Optional[Any] = None,
+                         on_page: Optional[Callable[[PageResult], Any]] = None,
                          **filters) -> List[Dict[str, Any]]:
         """
         Scrape les offres d'emploi LinkedIn avec les paramètres spécifiés
@@ -347,98 +415,298 @@ class LinkedInJobScraper:
             keywords: Liste de mots-clés pour la recherche
             location: Localisation
             max_pages: Nombre maximum de pages à scraper
-            delay_range: Délai aléatoire entre les requêtes (min, max)
+            delay_range: Bornes (min, max) imposées au délai adaptatif entre les pages
+            incremental: Avec un tri par date (sortBy=DD), arrête la pagination dès
+                qu'une page ne contient que des offres déjà vues (filigrane par recherche)
+            stats: ScrapingStats optionnel alimenté par l'ingestion (insérés, doublons, erreurs)
+            on_page: Rappel (éventuellement async) après la persistance de chaque page
             **filters: Filtres additionnels (experience_level, job_type, etc.)
         
         Returns:
-            Liste des offres d'emploi extraites
+            Liste des nouvelles offres extraites (déjà persistées page par page)
+        """
+        all_jobs = []
+        async for result in self.stream_jobs(keywords, location, max_pages, delay_range,
+                                             incremental, stats, on_page, **filters):
+            all_jobs.extend(result.jobs)
+        return all_jobs
+    
+    async def stream_jobs(self,
+                          keywords: Optional[List[str]] = None,
+                          location: Optional[str] = None,
+                          max_pages: int = 5,
+                          delay_range: Optional[tuple] = None,
+                          incremental: bool = True,
+                          stats: Optional[Any] = None,
+                          on_page: Optional[Callable[[PageResult], Any]] = None,
+                          search_key: Optional[str] = None,
+                          **filters) -> AsyncIterator[PageResult]:
         """
-        if not self.db:
+        Pipeline de scraping chargement -> parsing -> enrichissement -> persistance.
+        
+        Chaque étage tourne dans sa tâche, relié au suivant par une file bornée
+        (SCRAPING_PIPELINE_BUFFER) : la page N+1 se charge pendant que la page N
+        est parsée et écrite, et le chargement ralentit si la base ne suit pas.
+        Chaque page est persistée (et `stats` mis à jour) dès son arrivée.
+        `search_key` impose l'identifiant du filigrane (requêtes planifiées :
+        clé normalisée partagée par les abonnés).
+        """
+        if self.db is None:
             await self.initialize_database()
         
-        all_jobs = []
+        # Filigrane de la recherche : seul un tri par date garantit que les
+        # offres déjà vues arrivent après les nouvelles
+        watermark = None
+        if incremental and filters.get('sort_by', 'DD') == 'DD':
+            search_key = search_key or build_search_key(keywords, location, filters)
+            watermark = await load_watermark(self.db, search_key)
+        
+        stop = asyncio.Event()
+        self.timings = StageTimer()
+        buffer = settings.SCRAPING_PIPELINE_BUFFER
+        seen_for_watermark: List[Dict[str, Any]] = []
+        stages = []
+        # Filigrane sauvegardé seulement si les pages vues ont été persistées :
+        # fin normale, annulation ou arrêt anticipé par l'appelant, jamais sur erreur
+        save_progress = False
         
         try:
-            self.driver = self.setup_driver(headless=True)
+            self.driver = await run_in_browser_thread(self.setup_driver, headless=True)
             logger.info(f"🚀 Début du scraping - Max {max_pages} pages")
             
-            for page in range(max_pages):
-                start = page * 25
-                url = self.build_search_url(
-                    keywords=keywords,
-                    location=location,
-                    start=start,
-                    **filters
-                )
-                
-                logger.info(f"📄 Scraping page {page + 1}: {start} résultats")
-                
+            urls = [self.build_search_url(keywords=keywords, location=location, start=page * 25, **filters)
+                    for page in range(max_pages)]
+            pages = buffered(self._fetch_stage(urls, delay_range, stop, stats), buffer)
+            parsed = buffered(self._parse_stage(pages, stop), buffer)
+            enriched = buffered(self._enrich_stage(parsed, watermark, stop), buffer)
+            stages = [enriched, parsed, pages]
+            
+            async for page, page_jobs in enriched:
+                # Une annulation laisse finir l'écriture de la page en cours
+                persist = asyncio.ensure_future(self._persist_page(page, page_jobs, stats))
                 try:
-                    # Navigation vers la page
-                    self.driver.get(url)
-                    
-                    # Attente du chargement
-                    WebDriverWait(self.driver, 15).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "main"))
+                    result = await asyncio.shield(persist)
+                except asyncio.CancelledError:
+                    await persist
+                    raise
+                finally:
+                    seen_for_watermark.extend(
+                        {'job_id': job.get('job_id'), 'posted_at': job.get('posted_at')} for job in page_jobs
                     )
-                    
-                    # Scroll progressif pour charger le contenu dynamique
-                    await self._progressive_scroll(self.driver)
-                    
-                    # Extraction des données
-                    page_jobs = await self._extract_jobs_from_page(self.driver.page_source)
-                    
-                    if not page_jobs:
-                        logger.warning(f"⚠️ Aucun job trouvé page {page + 1}")
-                        break
-                    
-                    all_jobs.extend(page_jobs)
-                    logger.info(f"✅ Page {page + 1}: {len(page_jobs)} jobs extraits")
-                    
-                    # Délai aléatoire anti-détection
-                    delay = random.uniform(*delay_range)
-                    logger.info(f"⏱️ Pause de {delay:.1f}s...")
-                    await asyncio.sleep(delay)
-                    
-                except TimeoutException:
-                    logger.error(f"❌ Timeout page {page + 1}")
-                    continue
-                except Exception as e:
-                    logger.error(f"❌ Erreur page {page + 1}: {e}")
-                    continue
-            
-            # Sauvegarde en base de données
-            if all_jobs:
-                saved_count = await self._save_jobs_to_db(all_jobs)
-                logger.info(f"💾 {saved_count}/{len(all_jobs)} jobs sauvegardés en base")
-            
-            return all_jobs
+                if on_page:
+                    outcome = on_page(result)
+                    if asyncio.iscoroutine(outcome):
+                        await outcome
+                yield result
+            save_progress = True
             
+        except (asyncio.CancelledError, GeneratorExit):
+            logger.info("🛑 Scraping annulé, arrêt du pipeline")
+            save_progress = True
+            raise
+        
         except Exception as e:
+            # L'appelant marque la session en échec
             logger.error(f"❌ Erreur générale scraping: {e}")
-            return []
+            raise
         
         finally:
+            # Étages arrêtés de l'aval vers l'amont avant de fermer le navigateur
+            for stage in stages:
+                try:
+                    await stage.aclose()
+                except RuntimeError:
+                    pass
             if self.driver:
-                self.driver.quit()
+                await run_in_browser_thread(self.driver.quit)
+                self.driver = None
                 logger.info("🔄 Driver fermé")
+            # Filigrane cohérent avec les pages déjà persistées
+            if save_progress and watermark and seen_for_watermark:
+                watermark.advance(seen_for_watermark)
+                await save_watermark(self.db, watermark)
+            # Résumé final (aussi après annulation ou arrêt anticipé par l'appelant)
+            if stats is not None:
+                stats.stage_timings = self.timings.summary()
+            logger.info(f"⏱️ Temps par étape: {self.timings.describe()}")
+        
+        logger.info(f"⚡ Attentes de pages: {self.readiness.summary()}")
+        logger.info(f"🚦 Cadence: {self.pacer.snapshot()}")
     
-    async def _progressive_scroll(self, driver, max_scrolls: int = 3):
-        """Effectue un scroll progressif pour charger le contenu dynamique"""
-        for i in range(max_scrolls):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            await asyncio.sleep(1)
+    async def _fetch_stage(self, urls: List[str], delay_range: Optional[tuple],
+                           stop: asyncio.Event, stats: Optional[Any] = None) -> AsyncIterator[RawPage]:
+        """Étage 1 : cadence, navigation, scroll et capture de la page (exécuteur navigateur)"""
+        for page, url in enumerate(urls):
+            if stop.is_set():
+                return
+            logger.info(f"📄 Scraping page {page + 1}: {page * 25} résultats")
             
-            # Vérification si de nouveaux éléments sont chargés
-            current_height = driver.execute_script("return document.body.scrollHeight")
-            await asyncio.sleep(1)
-            new_height = driver.execute_script("return document.body.scrollHeight")
+            try:
+                waited = await self.pacer.wait(url, delay_range)
+                if waited:
+                    logger.info(f"⏱️ Pause de {waited:.1f}s...")
+                latency, blocked = await run_in_browser_thread(self._load_search_page, url)
+                if blocked:
+                    self.pacer.record(url, ok=False)
+                    logger.warning(f"⚠️ Page {page + 1}: page d'erreur ou de connexion, arrêt de la pagination")
+                    return
+                
+                # Scroll progressif pour charger le contenu dynamique
+                await self._progressive_scroll(self.driver)
+                with self.timings.measure('extraction'):
+                    raw = await self._capture_page(page, url)
+                # Page chargée : une page sans offre marque la fin des résultats, pas une limitation
+                self.pacer.record(url, ok=True, latency=latency)
+                yield raw
+                
+            except TimeoutException:
+                self.pacer.record(url, ok=False)
+                if stats is not None:
+                    stats.errors_count += 1
+                logger.error(f"❌ Timeout page {page + 1}")
+            except Exception as e:
+                if stats is not None:
+                    stats.errors_count += 1
+                logger.error(f"❌ Erreur page {page + 1}: {e}")
+    
+    async def _parse_stage(self, pages: AsyncIterator[RawPage], stop: asyncio.Event) -> AsyncIterator[tuple]:
+        """Étage 2 : cartes ou HTML -> offres (parsing HTML hors de la boucle asyncio)"""
+        async for raw in pages:
+            with self.timings.measure('parse'):
+                if raw.cards is not None:
+                    page_jobs = self._jobs_from_cards(raw.cards)
+                else:
+                    page_jobs = await asyncio.to_thread(self.parse_jobs_from_html, raw.html)
             
-            if current_height == new_height:
-                break
+            if not page_jobs:
+                logger.warning(f"⚠️ Aucun job trouvé page {raw.page + 1}")
+                stop.set()
+                return
+            yield raw.page, page_jobs
+    
+    async def _enrich_stage(self, parsed: AsyncIterator[tuple], watermark,
+                            stop: asyncio.Event) -> AsyncIterator[tuple]:
+        """Étage 3 : offres déjà vues (filigrane, pages précédentes) écartées, empreintes"""
+        fingerprints = set()
+        async for page, page_jobs in parsed:
+            if watermark:
+                if watermark.page_is_known(page_jobs):
+                    logger.info(f"⏹️ Page {page + 1}: uniquement des offres connues, arrêt de la pagination")
+                    stop.set()
+                    return
+                page_jobs = [job for job in page_jobs if not watermark.is_known(job)]
+            
+            fresh = []
+            for job in page_jobs:
+                job['fingerprint'] = job_fingerprint(job)
+                if job['fingerprint'] not in fingerprints:
+                    fingerprints.add(job['fingerprint'])
+                    fresh.append(job)
+            
+            logger.info(f"✅ Page {page + 1}: {len(fresh)} jobs extraits")
+            yield page, fresh
+    
+    async def _persist_page(self, page: int, page_jobs: List[Dict[str, Any]],
+                            stats: Optional[Any]) -> PageResult:
+        """Étage 4 : bulk upsert de la page, statistiques et file d'enrichissement"""
+        if stats is not None:
+            stats.total_pages_scraped += 1
+            stats.total_jobs_found += len(page_jobs)
+        if not page_jobs:
+            self._record_timings(stats)
+            return PageResult(page=page)
+        
+        with self.timings.measure('db_write'):
+            result = await self._save_jobs_to_db(page_jobs, stats=stats)
+        self._record_timings(stats)
+        logger.info(f"💾 Page {page + 1}: {result.saved}/{len(page_jobs)} jobs sauvegardés en base")
+        if self.on_jobs_inserted and result.inserted_ids:
+            self.on_jobs_inserted(result.inserted_ids)
+        return PageResult(page=page, jobs=page_jobs, ingestion=result)
+    
+    def _record_timings(self, stats: Optional[Any]):
+        """Agrégats par étape et temps moyen par page, écrits avec la session à chaque page"""
+        if stats is None:
+            return
+        stats.stage_timings = self.timings.totals()
+        if stats.total_pages_scraped:
+            stats.average_time_per_page = round(self.timings.elapsed / stats.total_pages_scraped, 3)
+    
+    def _load_search_page(self, url: str) -> tuple:
+        """Charge une page de résultats (appel bloquant) : (latence, page d'erreur)"""
+        started = time.perf_counter()
+        with self.timings.measure('navigation'):
+            self.driver.get(url)
+        if self._is_blocked_page():
+            return time.perf_counter() - started, True
+        with self.timings.measure('readiness'):
+            WebDriverWait(self.driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "main"))
+            )
+        return time.perf_counter() - started, False
+    
+    def _is_blocked_page(self) -> bool:
+        """Redirection vers authwall/checkpoint/login ou page d'erreur (429, 999)"""
+        return is_throttled_page(self.driver.current_url, self.driver.title)
+    
+    async def _progressive_scroll(self, driver, max_scrolls: int = 3):
+        """
+        Scroll progressif pour charger le contenu dynamique : chaque scroll
+        rend la main dès l'apparition de nouvelles cartes ou dès que la page
+        est calme (plus de pause fixe de 2s par scroll).
+        """
+        with self.timings.measure('scroll'):
+            report = await run_in_browser_thread(
+                scroll_until_stable, driver, self.selectors['job_cards'], max_scrolls,
+                baseline_per_scroll=2.0, tracker=self.readiness
+            )
+        logger.info(f"⚡ Page prête en {report.waited:.1f}s ({report.count} cartes, "
+                    f"signal {report.signal}, gain {report.saved:.1f}s)")
+    
+    async def _capture_page(self, page: int, url: str) -> RawPage:
+        """
+        Capture la page courante. En mode "browser", un script unique renvoie
+        les champs des cartes en JSON compact (ni transfert du HTML complet ni
+        parsing Python) ; repli sur page_source en cas d'échec. L'archivage des
+        pages impose le chemin HTML.
+        """
+        if self.extraction_mode == 'browser' and not self.archive:
+            try:
+                cards = await run_in_browser_thread(extract_cards, self.driver, self.selectors)
+                return RawPage(page=page, url=url, cards=cards)
+            except (WebDriverException, ValueError) as e:
+                logger.warning(f"⚠️ Extraction dans la page impossible, repli sur le HTML: {e}")
+        
+        page_source = await run_in_browser_thread(lambda: self.driver.page_source)
+        if self.archive:
+            await self._archive_page(PAGE_KIND_SEARCH, url, page_source)
+        return RawPage(page=page, url=url, html=page_source)
+    
+    async def _archive_page(self, kind: str, url: str, page_source: str, job_id: Optional[str] = None):
+        """Archive une page brute (compression et écriture hors de la boucle)"""
+        try:
+            await asyncio.to_thread(self.archive.put, kind, url, page_source, job_id)
+        except Exception as e:
+            logger.warning(f"⚠️ Erreur archivage page {url}: {e}")
+    
+    def _jobs_from_cards(self, cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Construit les offres à partir des champs bruts renvoyés par le navigateur"""
+        jobs = []
+        for card in cards:
+            try:
+                jobs.append(self._build_job_record(**card))
+            except Exception as e:
+                logger.error(f"❌ Erreur extraction données job: {e}")
+        if not cards:
+            logger.warning("⚠️ Aucun élément job trouvé avec les sélecteurs actuels")
+        return jobs
     
     async def _extract_jobs_from_page(self, page_source: str) -> List[Dict[str, Any]]:
         """Extrait tous les jobs d'une page HTML"""
+        return self.parse_jobs_from_html(page_source)
+    
+    def parse_jobs_from_html(self, page_source: str, fetched_at: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Parsing d'une page de résultats (sans navigateur ni base : réutilisé hors ligne)"""
         soup = BeautifulSoup(page_source, 'html.parser')
         jobs = []
         
@@ -453,116 +721,279 @@ class LinkedInJobScraper:
             return []
         
         for element in job_elements:
-            job_data = self.extract_job_data(element)
+            job_data = self.extract_job_data(element, fetched_at=fetched_at)
             if job_data:
                 jobs.append(job_data)
         
         return jobs
     
-    async def _save_jobs_to_db(self, jobs: List[Dict[str, Any]]) -> int:
-        """Sauvegarde les jobs en base avec gestion des doublons"""
-        saved_count = 0
+    async def _save_jobs_to_db(self, jobs: List[Dict[str, Any]], stats: Optional[Any] = None) -> IngestionResult:
+        """Sauvegarde les jobs en base par bulk upserts non ordonnés (gestion des doublons)"""
+        return await bulk_upsert_jobs(self.db.jobs, jobs, stats=stats)
+    
+    async def get_job_details(self, job_url: str, force: bool = False, persist: bool = True,
+                              company_id: Optional[Any] = None) -> Optional[Dict[str, Any]]:
+        """
+        Récupère les détails complets d'une offre d'emploi
         
-        for job in jobs:
-            try:
-                # Tentative d'insertion avec gestion des doublons
-                result = await self.db.jobs.replace_one(
-                    {
-                        'title': job['title'],
-                        'company': job['company'],
-                        'location': job['location']
-                    },
-                    job,
-                    upsert=True
-                )
-                
-                if result.upserted_id or result.modified_count > 0:
-                    saved_count += 1
-                    
-            except Exception as e:
-                logger.error(f"❌ Erreur sauvegarde job: {e}")
-                continue
+        Les détails frais (cache mémoire puis document `jobs` déjà enrichi) sont
+        renvoyés sans navigation ; `force` impose un nouveau chargement.
+        La fiche entreprise n'est relevée que si celle de l'entreprise de
+        l'offre (`company_id`) est absente ou périmée, puis enregistrée dans
+        `companies` plutôt que dans l'offre.
+        """
+        cache_key = self.detail_cache.key_for(job_url)
+        
+        if not force:
+            cached = await self._get_cached_details(cache_key)
+            if cached is not None:
+                return cached
         
-        return saved_count
+        try:
+            # Navigation bloquante hors de la boucle asyncio, à la cadence de l'hôte
+            await self.pacer.wait(job_url)
+            try:
+                started = time.perf_counter()
+                page_source, blocked = await run_in_browser_thread(self._load_job_page, job_url)
+            except TimeoutException:
+                self.pacer.record(job_url, ok=False)
+                raise
+            self.pacer.record(job_url, ok=not blocked, latency=time.perf_counter() - started)
+            if self.archive:
+                await self._archive_page(PAGE_KIND_DETAIL, job_url, page_source, self._extract_job_id(job_url))
+            if company_id is None:
+                company_id = await self._company_id_of(cache_key)
+            companies = self.db.companies if self.db is not None else None
+            include_company = await self._should_scrape_company(companies, company_id)
+            details = self._parse_job_details(page_source, include_company=include_company)
+            if company_id is not None and companies is not None:
+                company_info = details.pop('company_info', {})
+                if include_company:
+                    await self._store_company_info(companies, company_id, company_info)
+            
+            entry = self.detail_cache.put(cache_key, details)
+            if persist:
+                await self._persist_details(cache_key, details, entry)
+            
+            return details
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur extraction détails: {e}")
+            return None
+    
+    async def _company_id_of(self, cache_key: str) -> Optional[Any]:
+        """Entreprise (companies) de l'offre déjà en base"""
+        if self.db is None:
+            return None
+        try:
+            stored = await self.db.jobs.find_one({'job_id': cache_key}, {'company_id': 1})
+        except Exception as e:
+            logger.warning(f"⚠️ Erreur lecture entreprise de l'offre: {e}")
+            return None
+        return (stored or {}).get('company_id')
+    
+    async def _should_scrape_company(self, companies, company_id: Optional[Any]) -> bool:
+        """Fiche entreprise à relever : inconnue, absente ou périmée (réservée pour ce scraper)"""
+        if company_id is None or companies is None:
+            return True
+        try:
+            return await company_registry.claim_info_refresh(companies, company_id)
+        except Exception as e:
+            logger.warning(f"⚠️ Erreur lecture fiche entreprise: {e}")
+            return True
+    
+    async def _store_company_info(self, companies, company_id: Any, company_info: Dict[str, Any]):
+        try:
+            await company_registry.store_info(companies, company_id, company_info)
+        except Exception as e:
+            logger.warning(f"⚠️ Erreur sauvegarde fiche entreprise: {e}")
     
-    async def get_job_details(self, job_url: str) -> Optional[Dict[str, Any]]:
-        """Récupère les détails complets d'une offre d'emploi"""
+    def _load_job_page(self, job_url: str) -> tuple:
+        """Charge une page d'offre (appel bloquant) : (HTML, page d'erreur)"""
         if not self.driver:
             self.driver = self.setup_driver()
         
+        self.driver.get(job_url)
+        WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located((By.TAG_NAME, "main"))
+        )
+        return self.driver.page_source, self._is_blocked_page()
+    
+    async def _get_cached_details(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Détails frais depuis le cache mémoire ou les offres déjà enrichies en base"""
+        cached = self.detail_cache.get(cache_key)
+        if cached is not None:
+            # Entrée éventuellement posée par le scraper historique (description seule)
+            if 'requirements' not in cached:
+                description = cached.get('description') or ''
+                labels = self.keyword_matcher.classify(description)
+                cached = {
+                    'description': description,
+                    'skills': self.skill_extractor.extract(description),
+                    'requirements': self._extract_requirements(description, labels),
+                    'benefits': self._extract_benefits(description, labels),
+                    'company_info': {},
+                    'salary': None
+                }
+            return cached
+        
+        if self.db is None:
+            return None
+        
         try:
-            self.driver.get(job_url)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "main"))
+            stored = await self.db.jobs.find_one(
+                {
+                    'job_id': cache_key,
+                    'details_fetched_at': {'$gte': datetime.utcnow() - self.detail_cache.ttl}
+                },
+                {'description': 1, 'skills': 1, 'requirements': 1, 'benefits': 1, 'company_info': 1,
+                 'salary': 1, 'details_fetched_at': 1}
             )
-            
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            details = {
-                'description': '',
-                'requirements': [],
-                'benefits': [],
-                'company_info': {},
-                'salary': None
-            }
-            
-            # Description détaillée
+        except Exception as e:
+            logger.warning(f"⚠️ Erreur lecture détails en base: {e}")
+            return None
+        
+        if not stored:
+            return None
+        
+        details = {
+            'description': stored.get('description', ''),
+            'skills': stored.get('skills') or self.skill_extractor.extract(stored.get('description')),
+            'requirements': stored.get('requirements', []),
+            'benefits': stored.get('benefits', []),
+            'company_info': stored.get('company_info', {}),
+            'salary': stored.get('salary')
+        }
+        self.detail_cache.put(cache_key, details, fetched_at=stored['details_fetched_at'])
+        return details
+    
+    async def _persist_details(self, cache_key: str, details: Dict[str, Any], entry: Dict[str, Any]):
+        """Mise à jour partielle de l'offre avec ses détails et leur empreinte"""
+        if self.db is None:
+            return
+        
+        try:
+            fingerprint = f"li:{cache_key}"
+            await self.db.jobs.update_one(
+                {'job_id': cache_key},
+                {'$set': {
+                    **details,
+                    **await near_duplicate_fields(self.db.jobs, fingerprint, details.get('description')),
+                    'details_fetched_at': entry['fetched_at'],
+                    'description_hash': entry['description_hash'],
+                    'updatedAt': datetime.utcnow()
+                }}
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Erreur sauvegarde détails: {e}")
+    
+    def _parse_job_details(self, page_source: str, include_company: bool = True) -> Dict[str, Any]:
+        """
+        Extrait les détails d'une page d'offre (fiche entreprise si `include_company`)
+        
+        Les données structurées JobPosting (JSON-LD) sont lues en premier, sans
+        construire le DOM ; les sélecteurs CSS ne servent qu'en repli.
+        """
+        details = {
+            'description': '',
+            'skills': [],
+            'requirements': [],
+            'benefits': [],
+            'company_info': {},
+            'salary': None
+        }
+        
+        # Données structurées : description, type de contrat, dates, salaire, lieu
+        posting = find_job_posting(page_source)
+        structured = job_posting_details(posting) if posting else {}
+        structured_company = structured.pop('company_info', {})
+        details.update(structured)
+        
+        soup = None
+        skills_text = details['description']
+        if not details['description']:
+            soup = BeautifulSoup(page_source, 'html.parser')
             desc_element = soup.select_one('div.show-more-less-html__markup')
             if desc_element:
                 details['description'] = desc_element.get_text(strip=True)
-                
-                # Extraction des exigences et avantages
-                details['requirements'] = self._extract_requirements(details['description'])
-                details['benefits'] = self._extract_benefits(details['description'])
+                # Compétences : texte séparé par des espaces (listes <li> non collées)
+                skills_text = desc_element.get_text(' ', strip=True)
+        
+        if details['description']:
+            details['skills'] = self.skill_extractor.extract(skills_text)
             
-            # Informations sur l'entreprise
+            # Extraction des exigences et avantages (un seul scan de la description)
+            labels = self.keyword_matcher.classify(details['description'])
+            details['requirements'] = self._extract_requirements(details['description'], labels)
+            details['benefits'] = self._extract_benefits(details['description'], labels)
+        
+        # Informations sur l'entreprise : module de la page (taille, secteur),
+        # complété par l'organisation du JSON-LD (nom, logo)
+        if include_company:
+            if soup is None:
+                soup = BeautifulSoup(page_source, 'html.parser',
+                                     parse_only=SoupStrainer(class_='job-details-company-modules'))
             company_element = soup.select_one('.job-details-company-modules')
-            if company_element:
-                details['company_info'] = self._extract_company_info(company_element)
-            
-            return details
-            
-        except Exception as e:
-            logger.error(f"❌ Erreur extraction détails: {e}")
-            return None
+            details['company_info'] = {
+                **structured_company,
+                **(self._extract_company_info(company_element) if company_element else {})
+            }
+        
+        return details
     
-    def _extract_requirements(self, description: str) -> List[str]:
+    def _extract_requirements(self, description: str, labels: Optional[Dict[str, list]] = None) -> List[str]:
         """Extrait les exigences à partir de la description"""
-        requirements = []
+        if labels is None:
+            labels = self.keyword_matcher.classify(description)
         
-        # Patterns pour identifier les exigences
-        requirement_patterns = [
-            r'required?:?\s*(.+?)(?:\n|$)',
-            r'must have:?\s*(.+?)(?:\n|$)',
-            r'qualifications?:?\s*(.+?)(?:\n|$)',
-            r'experience:?\s*(.+?)(?:\n|$)'
-        ]
+        requirements = []
+        last_end = 0
         
-        for pattern in requirement_patterns:
-            matches = re.finditer(pattern, description, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                req_text = match.group(1).strip()
-                if len(req_text) > 10 and len(req_text) < 200:
-                    requirements.append(req_text)
+        # En-têtes d'exigences (required, must have, qualifications, experience...) :
+        # le texte qui suit l'en-tête jusqu'à la fin de ligne est retenu.
+        # À position égale, l'en-tête le plus long l'emporte ("required" > "require").
+        headers = sorted(labels.get('requirement', []), key=lambda m: (m.start, -m.end))
+        for header in headers:
+            if header.start < last_end:
+                continue
+            
+            start = header.end
+            if description.startswith(':', start):
+                start += 1
+            while start < len(description) and description[start].isspace():
+                start += 1
+            end = description.find('\n', start)
+            if end == -1:
+                end = len(description)
+            last_end = end
+            
+            req_text = description[start:end].strip()
+            if len(req_text) > 10 and len(req_text) < 200:
+                requirements.append(req_text)
         
         return requirements[:10]  # Limite à 10 exigences
     
-    def _extract_benefits(self, description: str) -> List[str]:
+    def _extract_benefits(self, description: str, labels: Optional[Dict[str, list]] = None) -> List[str]:
         """Extrait les avantages à partir de la description"""
-        benefits = []
+        if labels is None:
+            labels = self.keyword_matcher.classify(description)
         
-        benefit_keywords = [
-            'health insurance', 'assurance santé', '401k', 'vacation',
-            'remote work', 'flexible hours', 'bonus', 'stock options',
-            'formation', 'training', 'development', 'congés'
-        ]
+        benefits = []
         
-        sentences = re.split(r'[.!?]', description)
-        for sentence in sentences:
-            if any(keyword in sentence.lower() for keyword in benefit_keywords):
-                cleaned = sentence.strip()
-                if 20 < len(cleaned) < 150:
-                    benefits.append(cleaned)
+        # Phrase contenant chaque occurrence (délimitée par . ! ?)
+        boundaries = [m.start() for m in re.finditer(r'[.!?]', description)]
+        seen_sentences = set()
+        for match in labels.get('benefit', []):
+            index = bisect_left(boundaries, match.start)
+            sentence_start = boundaries[index - 1] + 1 if index > 0 else 0
+            sentence_end = boundaries[index] if index < len(boundaries) else len(description)
+            if sentence_start in seen_sentences:
+                continue
+            seen_sentences.add(sentence_start)
+            
+            cleaned = description[sentence_start:sentence_end].strip()
+            if 20 < len(cleaned) < 150:
+                benefits.append(cleaned)
         
         return benefits[:5]  # Limite à 5 avantages
     
@@ -594,7 +1025,8 @@ class LinkedInJobScraper:
     async def close(self):
         """Ferme les connexions"""
         if self.driver:
-            self.driver.quit()
+            await run_in_browser_thread(self.driver.quit)
+            self.driver = None
         if self.client:
             self.client.close()
         logger.info("🔄 Connexions fermées")
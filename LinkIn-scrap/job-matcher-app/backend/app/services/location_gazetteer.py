@@ -0,0 +1,246 @@
+# location_gazetteer.py - Gazetteer hors ligne : lieux en texte libre -> JobLocation à identifiants canoniques
+import json
+import logging
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+GAZETTEER_PATH = Path(__file__).resolve().parent.parent / 'data' / 'locations.json'
+
+# Préfixe des champs normalisés dans les documents jobs (le texte d'origine reste dans `location`)
+LOCATION_FIELD = 'location_info'
+LOCATION_INDEXES = ('city_id', 'region_id', 'country_id', 'remote')
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+# Mots sans valeur de lieu ("Greater Lyon Area", "Paris et périphérie", "Région de Bruxelles")
+_NOISE = frozenset((
+    'greater', 'area', 'metropolitan', 'metro', 'region', 'et', 'peripherie', 'aire', 'urbaine',
+    'agglomeration', 'metropolitaine', 'de', 'du', 'des', 'd', 'la', 'le', 'les', 'l', 'of', 'the', 'and'
+))
+# Mentions de télétravail ("Remote", "Télétravail", "100% à distance")
+_REMOTE = frozenset(('remote', 'teletravail', 'distance', 'telework'))
+
+_END = ''
+_KIND_RANK = {'city': 0, 'region': 1, 'country': 2}
+
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Jetons de lieu : minuscules, sans accents, ponctuation ni mots vides"""
+    return [token for token in _TOKEN_RE.findall(_fold(text or '')) if token not in _NOISE]
+
+
+def location_text(value: Any) -> str:
+    """Texte d'un lieu brut (chaîne du scraper ou ancien sous-document {"city", "country", ...})"""
+    if isinstance(value, dict):
+        if value.get('full_address'):
+            return str(value['full_address'])
+        return ', '.join(str(value[key]) for key in ('city', 'region', 'country') if value.get(key))
+    return str(value or '')
+
+
+class Gazetteer:
+    """
+    Villes, régions et pays chargés en mémoire : index des alias (libellé
+    complet normalisé) et trie de jetons pour reconnaître les lieux dans un
+    texte libre ("Paris, Île-de-France, France", "Greater Lyon Area").
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.aliases: Dict[str, List[Dict[str, Any]]] = {}
+        self.trie: Dict[str, Any] = {}
+        self.version = data.get('version')
+
+        for kind, section in (('country', 'countries'), ('region', 'regions'), ('city', 'cities')):
+            for entry in data.get(section, []):
+                entry = {**entry, 'kind': kind}
+                self.entries[entry['id']] = entry
+                for alias in [entry['name'], *entry.get('aliases', [])]:
+                    self._add_alias(alias, entry)
+
+    @classmethod
+    def load(cls, path: Path = GAZETTEER_PATH) -> 'Gazetteer':
+        with open(path, encoding='utf-8') as handle:
+            return cls(json.load(handle))
+
+    def _add_alias(self, alias: str, entry: Dict[str, Any]):
+        tokens = tokenize(alias)
+        if not tokens:
+            return
+        key = ' '.join(tokens)
+        bucket = self.aliases.setdefault(key, [])
+        if entry not in bucket:
+            bucket.append(entry)
+
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        terminal = node.setdefault(_END, [])
+        if entry not in terminal:
+            terminal.append(entry)
+
+    def _scan(self, tokens: List[str]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Correspondances les plus longues du trie, de gauche à droite : (position, entrée)"""
+        matches = []
+        position = 0
+        while position < len(tokens):
+            node, longest, end = self.trie, None, position
+            for index in range(position, len(tokens)):
+                node = node.get(tokens[index])
+                if node is None:
+                    break
+                if _END in node:
+                    longest, end = node[_END], index + 1
+            if longest:
+                matches.extend((position, entry) for entry in longest)
+                position = end
+            else:
+                position += 1
+        return matches
+
+    def _pick(self, matches: List[Tuple[int, Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """
+        Lieu le plus précis : ville d'abord, de préférence cohérente avec la
+        région ou le pays également cités ("Montréal, Québec" -> Montréal).
+        """
+        if not matches:
+            return None
+        context = {entry['id'] for _, entry in matches if entry['kind'] != 'city'}
+
+        def rank(item: Tuple[int, Dict[str, Any]]):
+            position, entry = item
+            parents = {entry.get('region'), entry.get('country')} - {None}
+            coherent = not context or bool(parents & context) or entry['id'] in context
+            return (_KIND_RANK[entry['kind']], not coherent, position)
+
+        return min(matches, key=rank)[1]
+
+    def match(self, text: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Entrée du gazetteer la plus précise reconnue dans `text`"""
+        tokens = tokenize(text)
+        if not tokens:
+            return None
+        exact = self.aliases.get(' '.join(tokens))
+        if exact:
+            return min(exact, key=lambda entry: _KIND_RANK[entry['kind']])
+        return self._pick(self._scan(tokens))
+
+    def resolve(self, value: Any) -> Dict[str, Any]:
+        """
+        Champs JobLocation normalisés : noms canoniques, identifiants
+        (ville, région, pays), télétravail et texte d'origine.
+        """
+        text = location_text(value)
+        tokens = set(tokenize(text))
+        entry = self.match(text)
+
+        city = region = country = None
+        if entry is not None:
+            if entry['kind'] == 'city':
+                city = entry
+            elif entry['kind'] == 'region':
+                region = entry
+            else:
+                country = entry
+        if city and city.get('region'):
+            region = self.entries.get(city['region'])
+        if (city or region) and country is None:
+            country = self.entries.get((city or region).get('country'))
+
+        return {
+            'city': city['name'] if city else None,
+            'region': region['name'] if region else None,
+            'country': country['name'] if country else None,
+            'postal_code': city.get('postal_code') if city else None,
+            'full_address': text or None,
+            'remote': bool(tokens & _REMOTE),
+            'city_id': city['id'] if city else None,
+            'region_id': region['id'] if region else None,
+            'country_id': country['id'] if country else None
+        }
+
+    def location_filter(self, text: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Filtre Mongo d'égalité sur l'identifiant le plus précis reconnu
+        (index `location_info.*_id`) ; None si le lieu est inconnu.
+        """
+        entry = self.match(text)
+        if entry is not None:
+            return {f"{LOCATION_FIELD}.{entry['kind']}_id": entry['id']}
+        if set(tokenize(text)) & _REMOTE:
+            return {f"{LOCATION_FIELD}.remote": True}
+        return None
+
+
+_shared_gazetteer: Optional[Gazetteer] = None
+_shared_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """Gazetteer partagé du processus (chargé au premier appel)"""
+    global _shared_gazetteer
+    with _shared_lock:
+        if _shared_gazetteer is None:
+            _shared_gazetteer = Gazetteer.load()
+            logger.info(f"🗺️ Gazetteer chargé: {len(_shared_gazetteer.entries)} lieux, "
+                        f"{len(_shared_gazetteer.aliases)} alias")
+    return _shared_gazetteer
+
+
+def normalize_job_location(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Ajoute `location_info` (JobLocation normalisé) à une offre et le renvoie"""
+    info = get_gazetteer().resolve(job.get('location'))
+    job[LOCATION_FIELD] = info
+    return info
+
+
+def location_query(text: Optional[str]) -> Dict[str, Any]:
+    """
+    Filtre de localisation des endpoints : égalité indexée si le lieu est
+    connu du gazetteer, sinon repli sur une recherche textuelle.
+    """
+    exact = get_gazetteer().location_filter(text)
+    if exact is not None:
+        return exact
+    pattern = {'$regex': re.escape(text or ''), '$options': 'i'}
+    return {'$or': [{f"{LOCATION_FIELD}.full_address": pattern}, {'location': pattern}]}
+
+
+async def backfill_locations(collection, batch_size: int = 1000) -> int:
+    """Migration : `location_info` des offres qui n'en ont pas"""
+    gazetteer = get_gazetteer()
+    updated = 0
+    operations = []
+    cursor = collection.find({LOCATION_FIELD: {'$exists': False}}, {'location': 1})
+    async for document in cursor:
+        operations.append(UpdateOne(
+            {'_id': document['_id']}, {'$set': {LOCATION_FIELD: gazetteer.resolve(document.get('location'))}}
+        ))
+        if len(operations) >= batch_size:
+            await collection.bulk_write(operations, ordered=False)
+            updated += len(operations)
+            operations = []
+    if operations:
+        await collection.bulk_write(operations, ordered=False)
+        updated += len(operations)
+
+    if updated:
+        logger.info(f"🗺️ {updated} offres existantes localisées")
+    return updated
+
+
+async def ensure_location_indexes(collection):
+    """Index des identifiants de lieu (la localisation des offres existantes est une migration : backfill_locations)"""
+    for field in LOCATION_INDEXES:
+        await collection.create_index(f"{LOCATION_FIELD}.{field}", background=True)
@@ -0,0 +1,188 @@
+# page_archive.py - Archive compressée des pages brutes (recherche et détail)
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # dépendance optionnelle : repli sur gzip
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+PAGE_KIND_SEARCH = "search"
+PAGE_KIND_DETAIL = "detail"
+
+ZSTD_LEVEL = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    job_id TEXT,
+    fetched_at TEXT NOT NULL,
+    path TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_url ON pages(url);
+CREATE INDEX IF NOT EXISTS idx_pages_job_id ON pages(job_id);
+CREATE INDEX IF NOT EXISTS idx_pages_kind_fetched ON pages(kind, fetched_at);
+"""
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Le module 'zstandard' est requis pour relire cette archive (pip install zstandard)")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def read_page(root: str, path: str, codec: str) -> str:
+    """Relit une page archivée (utilisable depuis un processus worker)"""
+    with open(os.path.join(root, path), "rb") as handle:
+        return decompress(handle.read(), codec).decode("utf-8")
+
+
+class PageArchive:
+    """
+    Archive disque des pages récupérées : un fichier compressé par contenu
+    (adressé par empreinte, donc dédoublonné) et un index SQLite par URL,
+    job id et date de récupération.
+    """
+
+    def __init__(self, root: str, codec: Optional[str] = None):
+        self.root = str(root)
+        self.codec = codec or default_codec()
+        Path(self.root, "pages").mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(self.root, "index.sqlite"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def put(self,
+            kind: str,
+            url: str,
+            html: str,
+            job_id: Optional[str] = None,
+            fetched_at: Optional[datetime] = None) -> str:
+        """Archive une page et renvoie son chemin relatif"""
+        raw = html.encode("utf-8")
+        digest = hashlib.sha1(raw).hexdigest()
+        extension = "zst" if self.codec == "zstd" else "gz"
+        path = os.path.join("pages", digest[:2], f"{digest}.html.{extension}")
+        full_path = os.path.join(self.root, path)
+
+        if os.path.exists(full_path):
+            stored_size = os.path.getsize(full_path)
+        else:
+            payload = compress(raw, self.codec)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            tmp_path = f"{full_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as handle:
+                handle.write(payload)
+            os.replace(tmp_path, full_path)
+            stored_size = len(payload)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO pages (kind, url, job_id, fetched_at, path, codec, raw_size, stored_size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, url, job_id, (fetched_at or datetime.utcnow()).isoformat(),
+                 path, self.codec, len(raw), stored_size)
+            )
+            self._conn.commit()
+        return path
+
+    def read(self, row: Dict[str, Any]) -> str:
+        return read_page(self.root, row["path"], row["codec"])
+
+    def _where(self, kind: Optional[str], since: Optional[datetime],
+               until: Optional[datetime], job_id: Optional[str]):
+        clauses, params = [], []
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if since:
+            clauses.append("fetched_at >= ?")
+            params.append(since.isoformat())
+        if until:
+            clauses.append("fetched_at < ?")
+            params.append(until.isoformat())
+        if job_id:
+            clauses.append("job_id = ?")
+            params.append(job_id)
+        return clauses, params
+
+    def count(self, kind: Optional[str] = None, since: Optional[datetime] = None,
+              until: Optional[datetime] = None, job_id: Optional[str] = None) -> int:
+        clauses, params = self._where(kind, since, until, job_id)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM pages{where}", params).fetchone()[0]
+
+    def iter_batches(self,
+                     kind: Optional[str] = None,
+                     since: Optional[datetime] = None,
+                     until: Optional[datetime] = None,
+                     job_id: Optional[str] = None,
+                     batch_size: int = 5000) -> Iterator[List[Dict[str, Any]]]:
+        """Parcourt l'index par lots (pagination sur id, mémoire bornée)"""
+        last_id = 0
+        columns = ("id", "kind", "url", "job_id", "fetched_at", "path", "codec")
+        while True:
+            clauses, params = self._where(kind, since, until, job_id)
+            clauses.append("id > ?")
+            params.append(last_id)
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT {', '.join(columns)} FROM pages WHERE {' AND '.join(clauses)} "
+                    f"ORDER BY id LIMIT ?",
+                    params + [batch_size]
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [dict(zip(columns, row)) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_shared_archive: Optional[PageArchive] = None
+_shared_lock = threading.Lock()
+
+
+def get_page_archive() -> Optional[PageArchive]:
+    """Archive partagée du processus si PAGE_ARCHIVE_ENABLED, sinon None"""
+    global _shared_archive
+    if not settings.PAGE_ARCHIVE_ENABLED:
+        return None
+    with _shared_lock:
+        if _shared_archive is None:
+            _shared_archive = PageArchive(settings.PAGE_ARCHIVE_DIR)
+            logger.info(f"🗄️ Archive des pages: {settings.PAGE_ARCHIVE_DIR} ({_shared_archive.codec})")
+    return _shared_archive
@@ -0,0 +1,154 @@
+# page_readiness.py - Attente événementielle du contenu des pages (sans pauses fixes)
+import logging
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+logger = logging.getLogger(__name__)
+
+# Installe (une fois par page) un compteur de requêtes fetch/XHR en vol
+_INFLIGHT_TRACKER_JS = """
+if (!window.__lbInflight) {
+    window.__lbInflight = {count: 0};
+    const origFetch = window.fetch;
+    if (origFetch) {
+        window.fetch = function() {
+            window.__lbInflight.count++;
+            return origFetch.apply(this, arguments).finally(() => window.__lbInflight.count--);
+        };
+    }
+    const origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        window.__lbInflight.count++;
+        this.addEventListener('loadend', () => window.__lbInflight.count--, {once: true});
+        return origSend.apply(this, arguments);
+    };
+}
+"""
+
+# Résout dès que le nombre de cartes dépasse `previous`, ou quand la page est
+# calme (aucune mutation DOM ni requête en vol pendant quietMs), ou au timeout.
+_WAIT_FOR_CARDS_JS = _INFLIGHT_TRACKER_JS + """
+const selectors = arguments[0], previous = arguments[1], quietMs = arguments[2], timeoutMs = arguments[3];
+const done = arguments[arguments.length - 1];
+const count = () => {
+    for (const selector of selectors) {
+        const n = document.querySelectorAll(selector).length;
+        if (n) return n;
+    }
+    return 0;
+};
+if (count() > previous) { done({count: count(), signal: 'cards'}); return; }
+
+let lastMutation = Date.now();
+const start = Date.now();
+let finished = false;
+const finish = (signal) => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(poll);
+    done({count: count(), signal: signal});
+};
+const observer = new MutationObserver(() => {
+    lastMutation = Date.now();
+    if (count() > previous) finish('cards');
+});
+observer.observe(document.documentElement, {childList: true, subtree: true});
+const poll = setInterval(() => {
+    const now = Date.now();
+    if (now - start >= timeoutMs) finish('timeout');
+    else if (window.__lbInflight.count <= 0 && now - lastMutation >= quietMs) finish('quiet');
+}, 50);
+"""
+
+_SCROLL_JS = "window.scrollTo(0, document.body.scrollHeight);"
+
+
+@dataclass
+class ReadinessReport:
+    """Résultat d'une attente : signal obtenu, durée réelle et pause fixe remplacée"""
+    count: int
+    signal: str
+    waited: float
+    baseline: float
+
+    @property
+    def saved(self) -> float:
+        return max(0.0, self.baseline - self.waited)
+
+
+class ReadinessTracker:
+    """Cumule le temps d'attente réel face aux pauses fixes historiques"""
+
+    def __init__(self):
+        self.waited = 0.0
+        self.baseline = 0.0
+        self.pages = 0
+
+    def record(self, report: ReadinessReport) -> ReadinessReport:
+        self.waited += report.waited
+        self.baseline += report.baseline
+        self.pages += 1
+        return report
+
+    @property
+    def saved(self) -> float:
+        return max(0.0, self.baseline - self.waited)
+
+    def summary(self) -> str:
+        return (f"{self.pages} attentes: {self.waited:.1f}s réelles contre "
+                f"{self.baseline:.1f}s de pauses fixes ({self.saved:.1f}s économisées)")
+
+
+def _run_async_script(driver, script: str, timeout: float, *args):
+    driver.set_script_timeout(timeout + 1)
+    return driver.execute_async_script(script, *args, int(timeout * 1000))
+
+
+def wait_for_cards(driver,
+                   selectors: List[str],
+                   previous: int = 0,
+                   quiet_ms: int = 400,
+                   timeout: float = 5.0) -> ReadinessReport:
+    """Attend que le nombre de cartes d'offres dépasse `previous` (ou que la page se calme)"""
+    started = time.perf_counter()
+    try:
+        result = _run_async_script(driver, _WAIT_FOR_CARDS_JS, timeout, selectors, previous, quiet_ms)
+        count, signal = int(result.get('count', 0)), result.get('signal', 'unknown')
+    except (TimeoutException, WebDriverException) as e:
+        logger.warning(f"⚠️ Attente des cartes interrompue: {e}")
+        count, signal = previous, 'error'
+    return ReadinessReport(count, signal, time.perf_counter() - started, 0.0)
+
+
+def scroll_until_stable(driver,
+                        selectors: List[str],
+                        max_scrolls: int = 3,
+                        scroll_timeout: float = 3.0,
+                        baseline_per_scroll: float = 0.0,
+                        tracker: Optional[ReadinessTracker] = None) -> ReadinessReport:
+    """
+    Scrolle tant que de nouvelles cartes apparaissent ; chaque scroll rend
+    la main dès la croissance du nombre de cartes ou dès que la page est calme.
+    """
+    started = time.perf_counter()
+    report = wait_for_cards(driver, selectors, previous=0, timeout=scroll_timeout)
+    count, signal = report.count, report.signal
+    scrolls = 0
+
+    for _ in range(max_scrolls):
+        driver.execute_script(_SCROLL_JS)
+        scrolls += 1
+        report = wait_for_cards(driver, selectors, previous=count, timeout=scroll_timeout)
+        signal = report.signal
+        if report.count <= count:
+            break
+        count = report.count
+
+    result = ReadinessReport(count, signal, time.perf_counter() - started, baseline_per_scroll * scrolls)
+    if tracker is not None:
+        tracker.record(result)
+    return result
@@ -0,0 +1,145 @@
+# request_pacer.py - Cadence adaptative des requêtes par hôte (AIMD)
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Lissage de la latence observée et dérive lente de la latence de référence
+LATENCY_SMOOTHING = 0.3
+BASELINE_DRIFT = 0.05
+
+# Signaux de limitation : redirection authwall/checkpoint/login, pages d'erreur 429 et 999
+THROTTLED_URL_MARKERS = ('/authwall', '/checkpoint', '/login', '/uas/')
+THROTTLED_TITLE_MARKERS = ('429', '999', 'too many requests')
+
+
+def is_throttled_page(current_url: Optional[str], title: Optional[str]) -> bool:
+    """Vrai si la page chargée signale une limitation (seul cas, avec le timeout, qui ralentit l'hôte)"""
+    current_url, title = (current_url or '').lower(), (title or '').lower()
+    return (any(marker in current_url for marker in THROTTLED_URL_MARKERS)
+            or any(marker in title for marker in THROTTLED_TITLE_MARKERS))
+
+
+@dataclass
+class HostPace:
+    """État de cadence d'un hôte"""
+    delay: float
+    latency: Optional[float] = None   # moyenne glissante
+    baseline: Optional[float] = None  # enveloppe basse : latence d'un hôte en bonne santé
+    next_allowed: float = 0.0         # horloge monotone
+    successes: int = 0
+    backoffs: int = 0
+
+    def healthy(self, tolerance: float) -> bool:
+        return self.latency is None or self.baseline is None or self.latency <= self.baseline * tolerance
+
+
+class AdaptivePacer:
+    """
+    Délai entre requêtes ajusté par hôte en AIMD : diminution additive
+    (`step`) tant que les pages arrivent sans erreur et que la latence reste
+    proche de sa référence, augmentation multiplicative (`backoff`) sur
+    timeout ou page de limitation (authwall, 429, 999). Une page sans
+    résultat (fin de recherche) n'est pas une limitation. Le délai reste entre `floor` et
+    `ceiling`. Les réservations sont sérialisées par hôte : scraping et
+    enrichissement concurrents partagent la même cadence.
+    """
+
+    def __init__(self,
+                 floor: float = settings.SCRAPING_DELAY_MIN,
+                 ceiling: float = settings.SCRAPING_PACE_CEILING,
+                 initial: float = settings.SCRAPING_DELAY_MAX,
+                 step: float = settings.SCRAPING_PACE_STEP,
+                 backoff: float = settings.SCRAPING_PACE_BACKOFF,
+                 latency_tolerance: float = 2.0,
+                 jitter: float = 0.2):
+        self.floor = max(0.0, floor)
+        self.ceiling = max(self.floor, ceiling)
+        self.initial = min(max(initial, self.floor), self.ceiling)
+        self.step = step
+        self.backoff = max(1.0, backoff)
+        self.latency_tolerance = latency_tolerance
+        self.jitter = jitter
+        self._hosts: Dict[str, HostPace] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc or url
+
+    def _state(self, host: str) -> HostPace:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostPace(delay=self.initial)
+        return state
+
+    def reserve(self, url: str, bounds: Optional[Tuple[float, float]] = None) -> float:
+        """Réserve le prochain créneau de l'hôte ; renvoie l'attente nécessaire (s)"""
+        with self._lock:
+            state = self._state(self.host_of(url))
+            delay = state.delay
+            if bounds:
+                delay = min(max(delay, bounds[0]), bounds[1])
+            # Léger aléa anti-détection, sans jamais passer sous le plancher
+            delay = max(self.floor, delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+            now = time.monotonic()
+            slot = max(now, state.next_allowed)
+            state.next_allowed = slot + delay
+            return slot - now
+
+    async def wait(self, url: str, bounds: Optional[Tuple[float, float]] = None) -> float:
+        waited = self.reserve(url, bounds)
+        if waited > 0:
+            await asyncio.sleep(waited)
+        return waited
+
+    def wait_sync(self, url: str, bounds: Optional[Tuple[float, float]] = None) -> float:
+        """Variante bloquante (scraper historique, threads navigateur)"""
+        waited = self.reserve(url, bounds)
+        if waited > 0:
+            time.sleep(waited)
+        return waited
+
+    def record(self, url: str, ok: bool, latency: Optional[float] = None) -> float:
+        """Ajuste la cadence après une requête ; renvoie le nouveau délai de l'hôte"""
+        with self._lock:
+            state = self._state(self.host_of(url))
+
+            if not ok:
+                state.delay = min(self.ceiling, max(state.delay, self.floor) * self.backoff)
+                state.backoffs += 1
+                logger.info(f"🐢 {self.host_of(url)}: ralentissement, délai {state.delay:.1f}s")
+                return state.delay
+
+            state.successes += 1
+            if latency is not None:
+                state.latency = latency if state.latency is None else \
+                    LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * state.latency
+                state.baseline = latency if state.baseline is None else \
+                    min(latency, state.baseline + BASELINE_DRIFT * (latency - state.baseline))
+
+            # Latence dégradée : l'hôte sature, on maintient la cadence
+            if state.healthy(self.latency_tolerance):
+                state.delay = max(self.floor, state.delay - self.step)
+            return state.delay
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                host: {'delay': state.delay, 'latency': state.latency or 0.0,
+                       'successes': state.successes, 'backoffs': state.backoffs}
+                for host, state in self._hosts.items()
+            }
+
+
+# Instance partagée du processus
+request_pacer = AdaptivePacer()
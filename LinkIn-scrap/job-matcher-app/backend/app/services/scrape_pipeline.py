@@ -0,0 +1,73 @@
+# scrape_pipeline.py - Étages asynchrones reliés par des files bornées
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, TypeVar
+
+from app.services.job_ingestion import IngestionResult
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_END = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+@dataclass
+class RawPage:
+    """Page de résultats chargée : cartes extraites dans la page ou HTML brut"""
+    page: int
+    url: str
+    cards: Optional[List[Dict[str, Any]]] = None
+    html: Optional[str] = None
+
+
+@dataclass
+class PageResult:
+    """Page persistée : nouvelles offres et bilan d'ingestion"""
+    page: int
+    jobs: List[Dict[str, Any]] = field(default_factory=list)
+    ingestion: IngestionResult = field(default_factory=IngestionResult)
+
+
+async def buffered(source: AsyncIterator[T], maxsize: int = 1) -> AsyncIterator[T]:
+    """
+    Exécute l'étage `source` dans sa propre tâche et expose ses éléments via
+    une file bornée : l'étage amont prend au plus `maxsize` éléments d'avance
+    et se bloque si l'aval (ex: base lente) ne suit pas.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, maxsize))
+
+    async def pump():
+        try:
+            async for item in source:
+                await queue.put(item)
+            await queue.put(_END)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(_Failure(e))
+        finally:
+            aclose = getattr(source, 'aclose', None)
+            if aclose:
+                await aclose()
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        # Arrêt anticipé de l'aval : l'étage amont est interrompu
+        if not task.done():
+            task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,219 @@
+# scrape_queue.py - File de sessions de scraping en base (baux + heartbeats)
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.db.database import get_database
+from app.models.scraping import ScrapingStats
+
+logger = logging.getLogger(__name__)
+
+
+def lease_duration() -> timedelta:
+    return timedelta(seconds=settings.SCRAPE_LEASE_SECONDS)
+
+
+def queue_enabled() -> bool:
+    return settings.SCRAPING_EXECUTION_MODE == "queue"
+
+
+def mark_queued(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Marque une session à insérer comme destinée aux workers"""
+    document.update({'queued': True, 'attempts': 0})
+    return document
+
+
+def new_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+async def claim_session(db, worker_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Réserve atomiquement la plus ancienne session en file : en attente, ou en
+    cours mais dont le bail a expiré (worker mort).
+    """
+    now = datetime.utcnow()
+    return await db.scraping_sessions.find_one_and_update(
+        {
+            'queued': True,
+            'attempts': {'$not': {'$gte': settings.SCRAPE_MAX_ATTEMPTS}},
+            '$or': [
+                {'status': 'pending'},
+                {'status': 'running', 'lease_expires_at': {'$lt': now}}
+            ]
+        },
+        {
+            '$set': {
+                'status': 'running',
+                'worker_id': worker_id,
+                'lease_expires_at': now + lease_duration(),
+                'heartbeat_at': now,
+                'start_time': now
+            },
+            '$inc': {'attempts': 1}
+        },
+        sort=[('start_time', 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def heartbeat(db, session_id: ObjectId, worker_id: str) -> bool:
+    """Prolonge le bail ; False si la session a été reprise ou annulée"""
+    now = datetime.utcnow()
+    result = await db.scraping_sessions.update_one(
+        {'_id': session_id, 'worker_id': worker_id, 'status': 'running'},
+        {'$set': {'lease_expires_at': now + lease_duration(), 'heartbeat_at': now}}
+    )
+    return result.matched_count == 1
+
+
+async def finish_session(db, session_id: ObjectId, worker_id: str, fields: Dict[str, Any]) -> bool:
+    """Écrit l'issue d'une session, uniquement si ce worker détient encore le bail"""
+    result = await db.scraping_sessions.update_one(
+        {'_id': session_id, 'worker_id': worker_id, 'status': 'running'},
+        {'$set': {**fields, 'end_time': datetime.utcnow()}, '$unset': {'lease_expires_at': ''}}
+    )
+    return result.matched_count == 1
+
+
+async def release_session(db, session_id: ObjectId, worker_id: str):
+    """Remet une session en file (arrêt propre du worker), sans consommer de tentative"""
+    await db.scraping_sessions.update_one(
+        {'_id': session_id, 'worker_id': worker_id, 'status': 'running'},
+        {'$set': {'status': 'pending'}, '$unset': {'worker_id': '', 'lease_expires_at': ''}, '$inc': {'attempts': -1}}
+    )
+
+
+async def fail_exhausted_sessions(db) -> int:
+    """Passe en échec les sessions abandonnées trop de fois (baux expirés)"""
+    now = datetime.utcnow()
+    result = await db.scraping_sessions.update_many(
+        {
+            'queued': True,
+            'status': 'running',
+            'lease_expires_at': {'$lt': now},
+            'attempts': {'$gte': settings.SCRAPE_MAX_ATTEMPTS}
+        },
+        {
+            '$set': {'status': 'failed', 'end_time': now,
+                     'error': f"Bail expiré après {settings.SCRAPE_MAX_ATTEMPTS} tentatives"},
+            '$unset': {'lease_expires_at': ''}
+        }
+    )
+    return result.modified_count
+
+
+def session_params(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Paramètres de scraping d'une session (service intégré ou endpoint /scraping/start)"""
+    params = dict(session.get('filters') or {})
+    if not params.get('keywords'):
+        params['keywords'] = session.get('search_query') or ''
+    if not params.get('location'):
+        params['location'] = session.get('location')
+    return params
+
+
+class ScrapeWorker:
+    """
+    Worker autonome : réclame les sessions en file, maintient son bail par
+    heartbeats pendant le scraping et écrit le résultat. Un worker mort perd
+    son bail à expiration et sa session est reprise par un autre.
+    """
+
+    def __init__(self, concurrency: int = 1, poll_interval: float = 5.0, worker_id: Optional[str] = None):
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or new_worker_id()
+        self._stopping = asyncio.Event()
+        self._tasks = set()
+
+    def stop(self):
+        logger.info(f"🛑 Arrêt demandé pour le worker {self.worker_id}")
+        self._stopping.set()
+
+    async def run(self):
+        from app.services.scraper_service import scraping_service
+
+        db = await get_database()
+        slots = asyncio.Semaphore(self.concurrency)
+        logger.info(f"👷 Worker {self.worker_id} démarré ({self.concurrency} session(s) en parallèle)")
+
+        while not self._stopping.is_set():
+            await slots.acquire()
+            try:
+                failed = await fail_exhausted_sessions(db)
+                if failed:
+                    logger.warning(f"⚠️ {failed} session(s) abandonnée(s) passée(s) en échec")
+                session = await claim_session(db, self.worker_id)
+            except Exception as e:
+                logger.error(f"❌ Erreur réclamation de session: {e}")
+                session = None
+
+            if session is None:
+                slots.release()
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._process(db, scraping_service, session))
+            self._tasks.add(task)
+            task.add_done_callback(lambda done: (self._tasks.discard(done), slots.release()))
+
+        # Arrêt : les sessions en cours sont rendues à la file
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        logger.info(f"👋 Worker {self.worker_id} arrêté")
+
+    async def _process(self, db, service, session: Dict[str, Any]):
+        session_id = session['_id']
+        lease_lost = asyncio.Event()
+        stats = ScrapingStats()
+        logger.info(f"🚀 Session {session_id} réclamée (tentative {session.get('attempts', 1)})")
+
+        scrape = asyncio.create_task(service.scrape(session_params(session), stats, session_id=session_id))
+        beats = asyncio.create_task(self._heartbeat(db, session_id, scrape, lease_lost))
+        try:
+            jobs_found = await scrape
+            await finish_session(db, session_id, self.worker_id, {
+                'status': 'completed',
+                'jobs_found': jobs_found,
+                'jobs_added': stats.total_jobs_saved,
+                'stats': stats.dict()
+            })
+            logger.info(f"✅ Session {session_id}: {stats.total_jobs_saved}/{jobs_found} jobs sauvegardés")
+        except asyncio.CancelledError:
+            if lease_lost.is_set():
+                logger.warning(f"⚠️ Session {session_id}: bail perdu (annulée ou reprise), arrêt du scraping")
+            else:
+                await release_session(db, session_id, self.worker_id)
+                logger.info(f"↩️ Session {session_id} remise en file")
+        except Exception as e:
+            logger.error(f"❌ Erreur scraping session {session_id}: {e}")
+            await finish_session(db, session_id, self.worker_id, {'status': 'failed', 'error': str(e)})
+        finally:
+            beats.cancel()
+
+    async def _heartbeat(self, db, session_id: ObjectId, scrape: asyncio.Task, lease_lost: asyncio.Event):
+        interval = max(1.0, settings.SCRAPE_LEASE_SECONDS / 3)
+        while not scrape.done():
+            await asyncio.sleep(interval)
+            try:
+                alive = await heartbeat(db, session_id, self.worker_id)
+            except Exception as e:
+                logger.warning(f"⚠️ Heartbeat session {session_id} en échec: {e}")
+                continue
+            if not alive:
+                lease_lost.set()
+                scrape.cancel()
+                return
@@ -0,0 +1,66 @@
+# scrape_registry.py - Registre des tâches de scraping en cours (annulation réelle)
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeTaskRegistry:
+    """
+    Tâches de scraping du processus, indexées par id de session.
+    L'annulation propage CancelledError dans la boucle de pages : l'écriture
+    en cours se termine, les étages s'arrêtent et le navigateur est fermé.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def register(self, session_id: Any, task: asyncio.Task) -> asyncio.Task:
+        key = str(session_id)
+        self._tasks[key] = task
+
+        def forget(done: asyncio.Task):
+            if self._tasks.get(key) is done:
+                del self._tasks[key]
+
+        task.add_done_callback(forget)
+        return task
+
+    def is_running(self, session_id: Any) -> bool:
+        task = self._tasks.get(str(session_id))
+        return task is not None and not task.done()
+
+    def running(self) -> List[str]:
+        return [key for key, task in self._tasks.items() if not task.done()]
+
+    def cancel(self, session_id: Any) -> bool:
+        """Annule la tâche locale de la session ; False si elle ne tourne pas ici"""
+        task = self._tasks.get(str(session_id))
+        if task is None or task.done():
+            return False
+        task.cancel()
+        logger.info(f"🛑 Annulation de la session {session_id} propagée au scraping")
+        return True
+
+    async def cancel_and_wait(self, session_id: Any, timeout: float = 30.0) -> bool:
+        """Annule puis attend la libération du navigateur (borné par `timeout`)"""
+        task = self._tasks.get(str(session_id))
+        if not self.cancel(session_id):
+            return False
+        await asyncio.wait({task}, timeout=timeout)
+        return True
+
+    async def shutdown(self, timeout: float = 30.0):
+        """Arrêt du processus : annule toutes les sessions en cours"""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        if not tasks:
+            return
+        logger.info(f"🛑 Annulation de {len(tasks)} session(s) de scraping en cours")
+        for task in tasks:
+            task.cancel()
+        await asyncio.wait(tasks, timeout=timeout)
+
+
+# Instance partagée du processus
+scrape_registry = ScrapeTaskRegistry()
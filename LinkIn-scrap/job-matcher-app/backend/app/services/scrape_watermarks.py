@@ -0,0 +1,121 @@
+# scrape_watermarks.py - Filigranes par recherche pour le scraping incrémental
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Nombre d'identifiants récents conservés par recherche (~4 sessions de 10 pages)
+MAX_RECENT_JOB_IDS = 1000
+
+
+def build_search_key(keywords: Optional[List[str]] = None,
+                     location: Optional[str] = None,
+                     filters: Optional[Dict[str, Any]] = None) -> str:
+    """Identifiant stable d'une recherche (mots-clés, lieu, filtres hors pagination)"""
+    normalized = {
+        'keywords': sorted(kw.strip().lower() for kw in (keywords or []) if kw and kw.strip()),
+        'location': (location or '').strip().lower(),
+        'filters': {
+            k: v for k, v in sorted((filters or {}).items())
+            if v is not None and k not in ('start', 'sort_by')
+        }
+    }
+    payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _as_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Uniformise les dates (ISO avec fuseau ou utcnow naïf) pour les comparer"""
+    if value and value.tzinfo:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class SearchWatermark:
+    """
+    Filigrane d'une recherche : identifiants des offres déjà vues
+    et date de publication la plus récente.
+    """
+
+    def __init__(self,
+                 search_key: str,
+                 recent_job_ids: Optional[Iterable[str]] = None,
+                 newest_posted_at: Optional[datetime] = None):
+        self.search_key = search_key
+        self.recent_job_ids: List[str] = list(recent_job_ids or [])
+        self.newest_posted_at = _as_utc_naive(newest_posted_at)
+        self._known = set(self.recent_job_ids)
+
+    def is_known(self, job: Dict[str, Any]) -> bool:
+        """Une offre est connue si son job_id a déjà été vu"""
+        job_id = job.get('job_id')
+        if job_id:
+            return job_id in self._known
+
+        # Sans identifiant : connue si publiée avant la plus récente déjà vue
+        posted_at = _as_utc_naive(job.get('posted_at'))
+        if posted_at and self.newest_posted_at:
+            return posted_at < self.newest_posted_at
+        return False
+
+    def page_is_known(self, jobs: List[Dict[str, Any]]) -> bool:
+        """Vrai si la page ne contient que des offres déjà vues"""
+        return bool(jobs) and all(self.is_known(job) for job in jobs)
+
+    def advance(self, jobs: List[Dict[str, Any]]):
+        """Intègre les nouvelles offres au filigrane"""
+        new_ids = []
+        for job in jobs:
+            job_id = job.get('job_id')
+            if job_id and job_id not in self._known:
+                new_ids.append(job_id)
+                self._known.add(job_id)
+
+            posted_at = _as_utc_naive(job.get('posted_at'))
+            if posted_at and (not self.newest_posted_at or posted_at > self.newest_posted_at):
+                self.newest_posted_at = posted_at
+
+        # Les plus récents en tête, liste bornée
+        self.recent_job_ids = (new_ids + self.recent_job_ids)[:MAX_RECENT_JOB_IDS]
+        self._known = set(self.recent_job_ids)
+
+    def to_document(self) -> Dict[str, Any]:
+        return {
+            '_id': self.search_key,
+            'recent_job_ids': self.recent_job_ids,
+            'newest_posted_at': self.newest_posted_at,
+            'updated_at': datetime.utcnow()
+        }
+
+
+async def load_watermark(db, search_key: str) -> SearchWatermark:
+    """Charge le filigrane d'une recherche (vide si première exécution)"""
+    try:
+        document = await db.scraping_watermarks.find_one({'_id': search_key})
+    except Exception as e:
+        logger.warning(f"⚠️ Erreur lecture filigrane {search_key}: {e}")
+        document = None
+
+    if not document:
+        return SearchWatermark(search_key)
+
+    return SearchWatermark(
+        search_key,
+        recent_job_ids=document.get('recent_job_ids', []),
+        newest_posted_at=document.get('newest_posted_at')
+    )
+
+
+async def save_watermark(db, watermark: SearchWatermark):
+    """Persiste le filigrane d'une recherche"""
+    try:
+        await db.scraping_watermarks.replace_one(
+            {'_id': watermark.search_key},
+            watermark.to_document(),
+            upsert=True
+        )
+    except Exception as e:
+        logger.error(f"❌ Erreur sauvegarde filigrane {watermark.search_key}: {e}")
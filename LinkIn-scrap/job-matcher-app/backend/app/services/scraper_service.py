@@ -2,11 +2,14 @@
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 from app.services.linkedin_scraper import LinkedInScraper
+from app.services.scrape_queue import mark_queued, queue_enabled
+from app.services.scrape_registry import scrape_registry
+from app.core.config import settings
 from app.db.database import get_database
-from app.models.job import Job
-from app.models.scraping import ScrapingSession
+from app.models.scraping import ScrapingSession, ScrapingStats
 from bson import ObjectId
 import asyncio
+import contextlib
 import logging
 
 logger = logging.getLogger(__name__)
@@ -41,11 +44,18 @@ class ScrapingService:
             status="pending"
         )
         
-        result = await db.scraping_sessions.insert_one(session.dict(by_alias=True))
+        document = session.dict(by_alias=True)
+        if queue_enabled():
+            mark_queued(document)
+        result = await db.scraping_sessions.insert_one(document)
         session_id = str(result.inserted_id)
         
-        # Démarrage du scraping en arrière-plan
-        asyncio.create_task(self._run_scraping_task(session_id, search_params))
+        # Démarrage du scraping : en mode "queue", la session reste "pending"
+        # et sera réclamée par un worker (scrape_worker.py)
+        if not queue_enabled():
+            scrape_registry.register(
+                session_id, asyncio.create_task(self._run_scraping_task(session_id, search_params))
+            )
         
         return session_id
     
@@ -53,99 +63,59 @@ class ScrapingService:
         """Exécute la tâche de scraping en arrière-plan"""
         db = await get_database()
         
+        stats = ScrapingStats()
+        
         try:
-            # Mise à jour du statut
-            await db.scraping_sessions.update_one(
-                {"_id": ObjectId(session_id)},
+            # Mise à jour du statut (session annulée avant son démarrage : rien à faire)
+            started = await db.scraping_sessions.update_one(
+                {"_id": ObjectId(session_id), "status": "pending"},
                 {"$set": {"status": "running", "start_time": datetime.utcnow()}}
             )
+            if not started.modified_count:
+                return
             
-            # Initialisation du scraper
-            from linkedin_scraper_enhanced import LinkedInJobScraper
-            scraper = LinkedInJobScraper()
+            jobs_found = await self.scrape(search_params, stats, session_id=session_id)
             
-            # Configuration des paramètres
-            scraping_config = {
-                'keywords': search_params.get('keywords', '').split(',') if search_params.get('keywords') else None,
-                'location': search_params.get('location'),
-                'max_pages': search_params.get('max_pages', 3),
-                'experience_level': search_params.get('experience_level'),
-                'job_type': search_params.get('job_type'),
-                'date_posted': search_params.get('date_posted')
-            }
-            
-            # Filtrage des paramètres None
-            scraping_config = {k: v for k, v in scraping_config.items() if v is not None}
-            
-            # Exécution du scraping
-            logger.info(f"🚀 Début scraping session {session_id}")
-            jobs_data = await scraper.scrape_jobs(**scraping_config)
-            
-            # Conversion et sauvegarde des jobs
-            jobs_saved = 0
-            for job_data in jobs_data:
-                try:
-                    # Conversion vers le modèle Job
-                    job = Job(
-                        title=job_data.get('title', ''),
-                        company=job_data.get('company', ''),
-                        location=job_data.get('location', ''),
-                        description=job_data.get('description', ''),
-                        remote=job_data.get('remote', False),
-                        urgent=job_data.get('urgent', False),
-                        postedAt=job_data.get('posted_at', datetime.utcnow()),
-                        requirements=job_data.get('requirements', []),
-                        benefits=job_data.get('benefits', []),
-                        salary=job_data.get('salary'),
-                        type=job_data.get('job_type'),
-                        experienceLevel=job_data.get('experience_level'),
-                        views=job_data.get('views', 0),
-                        applications=job_data.get('applications', 0)
-                    )
-                    
-                    # Sauvegarde avec gestion des doublons
-                    existing_job = await db.jobs.find_one({
-                        "title": job.title,
-                        "company": job.company,
-                        "location": job.location
-                    })
-                    
-                    if not existing_job:
-                        result = await db.jobs.insert_one(job.dict(by_alias=True))
-                        jobs_saved += 1
-                        logger.info(f"✅ Job sauvegardé: {job.title} chez {job.company}")
-                    else:
-                        # Mise à jour si nécessaire
-                        await db.jobs.update_one(
-                            {"_id": existing_job["_id"]},
-                            {"$set": {"updatedAt": datetime.utcnow()}}
-                        )
-                
-                except Exception as e:
-                    logger.error(f"❌ Erreur sauvegarde job: {e}")
-                    continue
-            
-            # Mise à jour finale de la session
+            # Mise à jour finale de la session (sauf si annulée entre-temps)
             await db.scraping_sessions.update_one(
-                {"_id": ObjectId(session_id)},
+                {"_id": ObjectId(session_id), "status": "running"},
                 {
                     "$set": {
                         "status": "completed",
                         "end_time": datetime.utcnow(),
-                        "jobs_found": len(jobs_data),
-                        "jobs_added": jobs_saved
+                        "jobs_found": jobs_found,
+                        "jobs_added": stats.total_jobs_saved,
+                        "stats": stats.dict()
                     }
                 }
             )
             
-            logger.info(f"✅ Scraping terminé: {jobs_saved}/{len(jobs_data)} jobs sauvegardés")
+            logger.info(f"✅ Scraping terminé: {stats.total_jobs_saved}/{jobs_found} jobs sauvegardés")
+            
+        except asyncio.CancelledError:
+            # Annulation demandée (statut déjà "cancelled") ou arrêt du serveur
+            await db.scraping_sessions.update_one(
+                {"_id": ObjectId(session_id)},
+                {"$set": {
+                    "jobs_found": stats.total_jobs_found,
+                    "jobs_added": stats.total_jobs_saved,
+                    "stats": stats.dict()
+                }}
+            )
+            await db.scraping_sessions.update_one(
+                {"_id": ObjectId(session_id), "status": "running"},
+                {"$set": {"status": "failed", "end_time": datetime.utcnow(),
+                          "error": "Scraping interrompu (arrêt du serveur)"}}
+            )
+            logger.info(f"🛑 Session {session_id} interrompue après {stats.total_jobs_saved} jobs sauvegardés")
+            raise
             
         except Exception as e:
             logger.error(f"❌ Erreur scraping session {session_id}: {e}")
             
             # Mise à jour du statut d'erreur
             await db.scraping_sessions.update_one(
-                {"_id": ObjectId(session_id)},
+                {"_id": ObjectId(session_id), "status": "running"},
                 {
                     "$set": {
                         "status": "failed",
@@ -154,10 +124,60 @@ class ScrapingService:
                     }
                 }
             )
+    
+    async def scrape(self, search_params: Dict[str, Any], stats: ScrapingStats,
+                     session_id: Optional[Any] = None) -> int:
+        """
+        Exécute le scraping d'une session (utilisé en mode inline et par les workers)
+        et renvoie le nombre de nouvelles offres. Le scraper persiste les offres
+        page par page (bulk upserts) et alimente `stats` ; les compteurs de la
+        session sont mis à jour à chaque page.
+        """
+        from app.services.linkedin_scraper_enhanced import LinkedInJobScraper
+        from app.services.job_enrichment import job_enrichment_service
+        scraper = LinkedInJobScraper(
+            mongodb_uri=settings.MONGODB_URI,
+            db_name=settings.DB_NAME,
+            on_jobs_inserted=job_enrichment_service.enqueue
+        )
+        
+        # Configuration des paramètres
+        scraping_config = {
+            'keywords': search_params.get('keywords', '').split(',') if search_params.get('keywords') else None,
+            'location': search_params.get('location'),
+            'max_pages': search_params.get('max_pages', 3),
+            'experience_level': search_params.get('experience_level'),
+            'job_type': search_params.get('job_type'),
+            'date_posted': search_params.get('date_posted')
+        }
         
+        # Filtrage des paramètres None
+        scraping_config = {k: v for k, v in scraping_config.items() if v is not None}
+        
+        db = await get_database()
+        jobs_found = 0
+        
+        try:
+            # Pipeline refermé avant le navigateur (étages arrêtés, filigrane et durées enregistrés)
+            async with contextlib.aclosing(scraper.stream_jobs(stats=stats, **scraping_config)) as pages:
+                async for result in pages:
+                    jobs_found += len(result.jobs)
+                    if session_id:
+                        progress = await db.scraping_sessions.update_one(
+                            {"_id": ObjectId(str(session_id)), "status": "running"},
+                            {"$set": {
+                                "jobs_found": jobs_found,
+                                "jobs_added": stats.total_jobs_saved,
+                                "stats": stats.dict()
+                            }}
+                        )
+                        # Session annulée depuis un autre processus (worker) : arrêt à la page suivante
+                        if not progress.matched_count:
+                            logger.info(f"🛑 Session {session_id} annulée, arrêt du scraping")
+                            break
+            return jobs_found
         finally:
-            if scraper:
-                await scraper.close()
+            await scraper.close()
     
     async def get_session_status(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Récupère le statut d'une session de scraping"""
@@ -191,7 +211,11 @@ class ScrapingService:
             return []
     
     async def cancel_session(self, session_id: str) -> bool:
-        """Annule une session de scraping en cours"""
+        """
+        Annule une session de scraping : statut "cancelled" puis annulation de
+        la tâche si elle tourne dans ce processus (navigateur libéré aussitôt).
+        Un worker distant s'arrête à sa prochaine page ou à son heartbeat.
+        """
         db = await get_database()
         
         try:
@@ -205,6 +229,8 @@ class ScrapingService:
                 }
             )
             
+            if result.modified_count > 0:
+                await scrape_registry.cancel_and_wait(session_id)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"❌ Erreur annulation session: {e}")
@@ -0,0 +1,307 @@
+# search_scheduler.py - Recherches récurrentes mutualisées entre utilisateurs
+import asyncio
+import contextlib
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.db.database import get_database
+from app.models.scraping import ScrapingStats
+from app.services.scrape_watermarks import build_search_key, load_watermark
+
+logger = logging.getLogger(__name__)
+
+# Filtres appliqués à la diffusion (par abonné), pas à la requête LinkedIn
+SUBSCRIBER_FILTERS = ('remote_only', 'urgent_only')
+
+# Durée maximale d'une exécution avant qu'une autre instance puisse la reprendre
+RUN_LEASE = timedelta(hours=1)
+
+_SPLIT_RE = re.compile(r'[\s,;/]+')
+
+
+def _fold(text: Optional[str]) -> str:
+    """Minuscules sans accents ("Développeur" -> "developpeur")"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower().strip()
+
+
+def normalize_keywords(keywords: Union[str, Iterable[str], None]) -> List[str]:
+    """
+    Mots-clés dédoublonnés et triés, pour la clé de regroupement uniquement :
+    l'ordre et la casse ne changent pas la requête. LinkedIn reçoit les
+    mots-clés saisis par l'utilisateur.
+    """
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    tokens = set()
+    for keyword in keywords or []:
+        tokens.update(token for token in _SPLIT_RE.split(_fold(keyword)) if token)
+    return sorted(tokens)
+
+
+def normalize_location(location: Optional[str]) -> str:
+    """Ville seule (clé de regroupement) : "Paris, Île-de-France, France" et "paris" donnent la même requête"""
+    return _fold((location or '').split(',')[0])
+
+
+def query_filters(filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Filtres transmis à LinkedIn (renseignés, hors filtres d'abonné)"""
+    return {
+        key: value for key, value in sorted((filters or {}).items())
+        if value not in (None, '', False) and key not in SUBSCRIBER_FILTERS
+    }
+
+
+def query_key_for(keywords: Union[str, Iterable[str], None], location: Optional[str],
+                  filters: Optional[Dict[str, Any]]) -> str:
+    """Clé de regroupement d'une recherche (mots-clés, ville et filtres normalisés)"""
+    return build_search_key(normalize_keywords(keywords), normalize_location(location), query_filters(filters))
+
+
+@dataclass
+class PlannedQuery:
+    """
+    Requête unique (clé normalisée) et ses abonnements ; mots-clés et lieu
+    tels que saisis par le premier abonné, envoyés à LinkedIn
+    """
+    key: str
+    keywords: List[str]
+    location: Optional[str]
+    filters: Dict[str, Any]
+    interval: timedelta
+    max_pages: int
+    subscriptions: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self.subscriptions)
+
+
+def plan_queries(subscriptions: Iterable[Dict[str, Any]]) -> List[PlannedQuery]:
+    """
+    Regroupe les recherches enregistrées par requête normalisée identique.
+    Une requête n'est jamais servie par une requête plus large : ses
+    mots-clés peuvent ne figurer que dans la description (vide sur les
+    cartes) et la limite de pages de l'autre requête tronquerait ses résultats.
+    """
+    minimum = timedelta(minutes=settings.SCHEDULER_MIN_INTERVAL_MINUTES)
+    queries: Dict[str, PlannedQuery] = {}
+
+    for subscription in subscriptions:
+        keywords = subscription.get('keywords') or []
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        location = subscription.get('location') or None
+        filters = query_filters(subscription.get('filters'))
+        key = subscription.get('query_key') or query_key_for(keywords, location, filters)
+        interval = max(minimum, timedelta(minutes=subscription.get('interval_minutes') or 360))
+
+        query = queries.get(key)
+        if query is None:
+            query = queries[key] = PlannedQuery(key, keywords, location, filters, interval,
+                                                subscription.get('max_pages') or 3)
+        query.interval = min(query.interval, interval)
+        query.max_pages = max(query.max_pages, subscription.get('max_pages') or 3)
+        query.subscriptions.append(subscription)
+
+    return list(queries.values())
+
+
+def matches_subscription(job: Dict[str, Any], subscription: Dict[str, Any]) -> bool:
+    """Une offre est diffusée à un abonné si elle respecte ses filtres d'abonné (remote, urgent)"""
+    filters = subscription.get('filters') or {}
+    if filters.get('remote_only') and not job.get('remote'):
+        return False
+    if filters.get('urgent_only') and not job.get('urgent'):
+        return False
+    return True
+
+
+async def fan_out(db, query: PlannedQuery, jobs: List[Dict[str, Any]]) -> int:
+    """Diffuse les offres d'une exécution à tous les abonnés de la requête"""
+    job_ids = [job['job_id'] for job in jobs if job.get('job_id')]
+    if not job_ids:
+        return 0
+
+    documents = await db.jobs.find(
+        {'job_id': {'$in': job_ids}},
+        {'remote': 1, 'urgent': 1}
+    ).to_list(length=None)
+
+    now = datetime.utcnow()
+    operations = []
+    for subscription in query.subscriptions:
+        for document in documents:
+            if not matches_subscription(document, subscription):
+                continue
+            operations.append(UpdateOne(
+                {'user_id': subscription['user_id'], 'job_id': document['_id']},
+                {'$setOnInsert': {
+                    'saved_search_id': subscription['_id'],
+                    'query_key': query.key,
+                    'matched_at': now,
+                    'seen': False
+                }},
+                upsert=True
+            ))
+
+    if not operations:
+        return 0
+    result = await db.user_job_matches.bulk_write(operations, ordered=False)
+    return result.upserted_count
+
+
+async def backfill_subscription(db, subscription: Dict[str, Any]) -> int:
+    """Diffuse à un nouvel abonné les offres déjà trouvées par la même requête"""
+    watermark = await load_watermark(db, subscription['query_key'])
+    if not watermark.recent_job_ids:
+        return 0
+    query = plan_queries([subscription])[0]
+    return await fan_out(db, query, [{'job_id': job_id} for job_id in watermark.recent_job_ids])
+
+
+class SearchScheduler:
+    """
+    Planificateur des recherches récurrentes : à chaque tick, les recherches
+    actives sont normalisées et regroupées par requête identique ; chaque
+    requête échue est exécutée une seule fois (verrou en base, multi-instances) puis
+    ses résultats sont diffusés à tous les abonnés.
+    """
+
+    def __init__(self,
+                 tick_seconds: int = settings.SCHEDULER_TICK_SECONDS,
+                 max_concurrent: int = settings.SCHEDULER_MAX_CONCURRENT):
+        self.tick_seconds = tick_seconds
+        self.max_concurrent = max(1, max_concurrent)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+            logger.info(f"🗓️ Planificateur démarré (tick {self.tick_seconds}s)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.error(f"❌ Erreur planificateur: {e}")
+            await asyncio.sleep(self.tick_seconds)
+
+    async def tick(self) -> int:
+        """Exécute les requêtes échues ; renvoie le nombre de requêtes lancées"""
+        db = await get_database()
+        subscriptions = await db.saved_searches.find({'active': True}).to_list(length=None)
+        roots = plan_queries(subscriptions)
+
+        # État des requêtes en une lecture ; seules les requêtes échues tentent le verrou
+        now = datetime.utcnow()
+        states = {
+            state['_id']: state for state in await db.scheduled_queries.find(
+                {'_id': {'$in': [root.key for root in roots]}},
+                {'last_run_at': 1, 'running_until': 1}
+            ).to_list(length=None)
+        }
+        candidates = [root for root in roots if self._is_due(states.get(root.key), root, now)]
+
+        due = [root for root in candidates if await self._claim(db, root)]
+        if due:
+            logger.info(f"🗓️ {len(due)} requête(s) à exécuter pour {len(subscriptions)} recherches "
+                        f"({len(roots)} requêtes uniques)")
+            semaphore = asyncio.Semaphore(self.max_concurrent)
+
+            async def bounded(query: PlannedQuery):
+                async with semaphore:
+                    await self._run(db, query)
+
+            await asyncio.gather(*(bounded(query) for query in due))
+        return len(due)
+
+    @staticmethod
+    def _is_due(state: Optional[Dict[str, Any]], query: PlannedQuery, now: datetime) -> bool:
+        if not state:
+            return True
+        if state.get('running_until') and state['running_until'] > now:
+            return False
+        return not state.get('last_run_at') or state['last_run_at'] <= now - query.interval
+
+    async def _claim(self, db, query: PlannedQuery) -> bool:
+        """Réserve l'exécution d'une requête échue (atomique entre instances)"""
+        now = datetime.utcnow()
+        try:
+            claimed = await db.scheduled_queries.find_one_and_update(
+                {
+                    '_id': query.key,
+                    'running_until': {'$not': {'$gt': now}},
+                    '$or': [{'last_run_at': None}, {'last_run_at': {'$lte': now - query.interval}}]
+                },
+                {'$set': {
+                    'keywords': query.keywords,
+                    'location': query.location,
+                    'filters': query.filters,
+                    'subscribers': query.subscriber_count,
+                    'running_until': now + RUN_LEASE
+                }},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            return claimed is not None
+        except DuplicateKeyError:
+            # Requête existante non échue ou déjà en cours
+            return False
+
+    async def _run(self, db, query: PlannedQuery):
+        from app.services.job_enrichment import job_enrichment_service
+        from app.services.linkedin_scraper_enhanced import LinkedInJobScraper
+
+        scraper = LinkedInJobScraper(
+            mongodb_uri=settings.MONGODB_URI,
+            db_name=settings.DB_NAME,
+            on_jobs_inserted=job_enrichment_service.enqueue
+        )
+        stats = ScrapingStats()
+        update: Dict[str, Any] = {'last_run_at': datetime.utcnow(), 'running_until': None}
+
+        jobs_found, matches = 0, 0
+        try:
+            # Diffusion page par page : les abonnés voient les offres dès leur persistance
+            pages = scraper.stream_jobs(
+                keywords=query.keywords or None,
+                location=query.location,
+                max_pages=query.max_pages,
+                stats=stats,
+                search_key=query.key,
+                **query.filters
+            )
+            async with contextlib.aclosing(pages):
+                async for result in pages:
+                    jobs_found += len(result.jobs)
+                    matches += await fan_out(db, query, result.jobs)
+            update.update({'last_jobs_found': jobs_found, 'last_matches': matches,
+                           'last_stats': stats.dict(), 'last_error': None})
+            logger.info(f"✅ Requête {query.keywords} @ {query.location or '-'}: {jobs_found} nouvelles offres, "
+                        f"{matches} diffusions ({query.subscriber_count} abonnés)")
+        except Exception as e:
+            update['last_error'] = str(e)
+            logger.error(f"❌ Erreur requête planifiée {query.key}: {e}")
+        finally:
+            await scraper.close()
+            await db.scheduled_queries.update_one({'_id': query.key}, {'$set': update})
+
+
+# Instance partagée du processus
+search_scheduler = SearchScheduler()
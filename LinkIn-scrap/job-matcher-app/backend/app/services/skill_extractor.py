@@ -0,0 +1,150 @@
+# skill_extractor.py - Compétences normalisées des offres (dictionnaire FR/EN compilé en trie de jetons)
+import json
+import logging
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+SKILLS_PATH = Path(__file__).resolve().parent.parent / 'data' / 'skills.json'
+
+# Jetons : "c++" et "c#" restent entiers, ".net" devient "dotnet"
+_TOKEN_RE = re.compile(r'[a-z0-9]+(?:\+\+|#)?')
+_DOTNET_RE = re.compile(r'\.net\b')
+
+_END = ''
+
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Jetons comparables : minuscules, sans accents ni ponctuation (hors "++" et "#")"""
+    return _TOKEN_RE.findall(_DOTNET_RE.sub(' dotnet', _fold(text or '')))
+
+
+class SkillExtractor:
+    """
+    Dictionnaire de compétences (nom et synonymes FR/EN) compilé en trie de
+    jetons : une description est parcourue une seule fois, en retenant à
+    chaque position la plus longue expression connue ("spring boot" plutôt
+    que "spring").
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.skills: Dict[str, Dict[str, Any]] = {}
+        self.trie: Dict[str, Any] = {}
+        self.version = data.get('version')
+
+        for skill in data.get('skills', []):
+            self.skills[skill['id']] = skill
+            phrases = list(skill.get('synonyms', []))
+            # Nom ambigu ("Tableau", "Spring") : reconnu via ses seuls synonymes
+            if not skill.get('ambiguous_name'):
+                phrases.append(skill['name'])
+            for phrase in phrases:
+                self._add(phrase, skill['id'])
+
+    @classmethod
+    def load(cls, path: Path = SKILLS_PATH) -> 'SkillExtractor':
+        with open(path, encoding='utf-8') as handle:
+            return cls(json.load(handle))
+
+    def _add(self, phrase: str, skill_id: str):
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_END] = skill_id
+
+    def extract(self, *texts: Optional[str]) -> List[str]:
+        """Identifiants des compétences citées, dans l'ordre de première apparition"""
+        found: Dict[str, None] = {}
+        for text in texts:
+            tokens = tokenize(text)
+            position = 0
+            while position < len(tokens):
+                node, skill_id, end = self.trie, None, position
+                for index in range(position, len(tokens)):
+                    node = node.get(tokens[index])
+                    if node is None:
+                        break
+                    if _END in node:
+                        skill_id, end = node[_END], index + 1
+                if skill_id:
+                    found.setdefault(skill_id)
+                    position = end
+                else:
+                    position += 1
+        return list(found)
+
+    def query_ids(self, terms: str) -> List[str]:
+        """
+        Compétences d'un filtre "Python, Docker" : chaque terme est ramené à
+        son identifiant ; un terme inconnu est gardé tel quel (aucune offre).
+        """
+        ids = []
+        for term in terms.split(','):
+            if not term.strip():
+                continue
+            matched = self.extract(term)
+            ids.extend(matched or [' '.join(tokenize(term)) or term.strip()])
+        return list(dict.fromkeys(ids))
+
+
+_shared_extractor: Optional[SkillExtractor] = None
+_shared_lock = threading.Lock()
+
+
+def get_skill_extractor() -> SkillExtractor:
+    """Extracteur partagé du processus (dictionnaire chargé au premier appel)"""
+    global _shared_extractor
+    with _shared_lock:
+        if _shared_extractor is None:
+            _shared_extractor = SkillExtractor.load()
+            logger.info(f"🧠 Dictionnaire de compétences chargé: {len(_shared_extractor.skills)} compétences")
+    return _shared_extractor
+
+
+def skills_query(terms: str) -> Dict[str, Any]:
+    """Filtre Mongo "offres exigeant toutes ces compétences" (index multiclé `skills`)"""
+    return {'skills': {'$all': get_skill_extractor().query_ids(terms)}}
+
+
+async def backfill_skills(collection, batch_size: int = 1000) -> int:
+    """Migration : `skills` des offres déjà enrichies qui n'en ont pas"""
+    extractor = get_skill_extractor()
+    updated = 0
+    operations = []
+    cursor = collection.find(
+        {'skills': {'$exists': False}, 'description': {'$nin': [None, '']}},
+        {'title': 1, 'description': 1}
+    )
+    async for document in cursor:
+        skills = extractor.extract(document.get('title'), document.get('description'))
+        operations.append(UpdateOne({'_id': document['_id']}, {'$set': {'skills': skills}}))
+        if len(operations) >= batch_size:
+            await collection.bulk_write(operations, ordered=False)
+            updated += len(operations)
+            operations = []
+    if operations:
+        await collection.bulk_write(operations, ordered=False)
+        updated += len(operations)
+
+    if updated:
+        logger.info(f"🧠 Compétences extraites pour {updated} offres existantes")
+    return updated
+
+
+async def ensure_skill_indexes(collection):
+    """Index multiclé sur `skills` (extraction des offres existantes : backfill_skills)"""
+    await collection.create_index('skills', background=True)
@@ -0,0 +1,80 @@
+# stage_timing.py - Chronométrage par étape des pages scrapées
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+# Étapes chronométrées pour chaque page de résultats
+STAGES = ('navigation', 'readiness', 'scroll', 'extraction', 'parse', 'db_write')
+
+
+def percentile(sorted_values: List[float], rank: float) -> float:
+    """Percentile au rang le plus proche (valeurs triées)"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(rank / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class StageTimer:
+    """
+    Durées par étape (navigation, attente, scroll, extraction, parsing,
+    écriture). Alimenté depuis la boucle asyncio comme depuis les threads
+    navigateur.
+    """
+
+    def __init__(self):
+        self._samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def measure(self, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """Agrégats légers (écrits à chaque page) : nombre, total, moyenne"""
+        with self._lock:
+            return {
+                stage: {'count': len(values), 'total': round(sum(values), 3),
+                        'mean': round(sum(values) / len(values), 3)}
+                for stage, values in self._samples.items() if values
+            }
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Résumé final : agrégats et percentiles p50/p90/p99/max par étape"""
+        summary = self.totals()
+        with self._lock:
+            for stage, values in self._samples.items():
+                if not values:
+                    continue
+                ordered = sorted(values)
+                summary[stage].update({
+                    'p50': round(percentile(ordered, 50), 3),
+                    'p90': round(percentile(ordered, 90), 3),
+                    'p99': round(percentile(ordered, 99), 3),
+                    'max': round(ordered[-1], 3)
+                })
+        return summary
+
+    def describe(self) -> str:
+        """Ligne de log : part de chaque étape dans le temps mesuré"""
+        totals = self.totals()
+        measured = sum(row['total'] for row in totals.values()) or 1.0
+        return ', '.join(
+            f"{stage} {totals[stage]['total']:.1f}s ({totals[stage]['total'] / measured:.0%})"
+            for stage in STAGES if stage in totals
+        )
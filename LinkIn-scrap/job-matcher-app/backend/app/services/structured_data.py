@@ -0,0 +1,254 @@
+# structured_data.py - Données structurées JobPosting (JSON-LD) des pages d'offres
+import html
+import json
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.services.location_gazetteer import get_gazetteer
+
+logger = logging.getLogger(__name__)
+
+LD_JSON_MARKER = 'application/ld+json'
+
+# Blocs <script type="application/ld+json"> : balayage ciblé du HTML brut, sans DOM
+_LD_JSON_RE = re.compile(
+    r'<script\b[^>]*\btype\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+# Description HTML -> texte : retours à la ligne conservés pour le découpage des exigences
+_BREAK_RE = re.compile(r'<\s*(?:br|/p|/li|/h[1-6]|/div|/ul|/ol)\b[^>]*>', re.IGNORECASE)
+_ITEM_RE = re.compile(r'<\s*li\b[^>]*>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACES_RE = re.compile(r'[ \t\r\f\v\xa0]+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+
+# employmentType schema.org -> job_type (valeurs JobEnhanced)
+EMPLOYMENT_TYPES = {
+    'FULL_TIME': 'full_time',
+    'PART_TIME': 'part_time',
+    'CONTRACTOR': 'contract',
+    'TEMPORARY': 'temporary',
+    'INTERN': 'internship',
+    'VOLUNTEER': 'volunteer',
+    'PER_DIEM': 'temporary',
+    'OTHER': 'other'
+}
+
+SALARY_UNITS = {'HOUR': 'heure', 'DAY': 'jour', 'WEEK': 'semaine', 'MONTH': 'mois', 'YEAR': 'an'}
+
+
+def _is_job_posting(node: Any) -> bool:
+    if not isinstance(node, dict):
+        return False
+    kind = node.get('@type')
+    return kind == 'JobPosting' or (isinstance(kind, list) and 'JobPosting' in kind)
+
+
+def _candidates(data: Any) -> List[Any]:
+    """Noeuds d'un bloc JSON-LD : objet seul, liste ou `@graph`"""
+    if isinstance(data, list):
+        return [node for item in data for node in _candidates(item)]
+    if isinstance(data, dict) and isinstance(data.get('@graph'), list):
+        return [data, *data['@graph']]
+    return [data]
+
+
+def find_job_posting(page_source: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Objet JobPosting embarqué dans la page (None si absent ou illisible).
+    Le HTML n'est pas parsé : seuls les blocs JSON-LD sont isolés puis décodés.
+    """
+    if not page_source or LD_JSON_MARKER not in page_source:
+        return None
+    for match in _LD_JSON_RE.finditer(page_source):
+        raw = match.group(1).strip()
+        # Certains blocs sont enveloppés dans un commentaire HTML
+        if raw.startswith('<!--') and raw.endswith('-->'):
+            raw = raw[4:-3].strip()
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            logger.debug(f"Bloc JSON-LD illisible: {e}")
+            continue
+        for node in _candidates(data):
+            if _is_job_posting(node):
+                return node
+    return None
+
+
+def html_to_text(value: Optional[str]) -> str:
+    """Texte d'une description HTML (entités décodées, une ligne par paragraphe ou puce)"""
+    if not value:
+        return ''
+    # Descriptions parfois doublement échappées (&lt;p&gt;...)
+    text = html.unescape(value) if '&lt;' in value else value
+    text = _ITEM_RE.sub('\n- ', text)
+    text = _BREAK_RE.sub('\n', text)
+    text = html.unescape(_TAG_RE.sub('', text))
+    lines = (_SPACES_RE.sub(' ', line).strip() for line in text.split('\n'))
+    return _BLANK_LINES_RE.sub('\n', '\n'.join(line for line in lines if line)).strip()
+
+
+def parse_date(value: Any) -> Optional[datetime]:
+    """Date ISO 8601 schema.org ("2024-03-01", "2024-03-01T10:00:00.000Z") en datetime naïf UTC"""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    text = value.strip().replace('Z', '+00:00')
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        try:
+            parsed = datetime.strptime(text[:10], '%Y-%m-%d')
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def employment_type(value: Any) -> Optional[str]:
+    """employmentType ("FULL_TIME" ou liste) -> job_type, premier type reconnu"""
+    values = value if isinstance(value, list) else [value]
+    for item in values:
+        if isinstance(item, str):
+            key = item.strip().upper().replace('-', '_').replace(' ', '_')
+            if key in EMPLOYMENT_TYPES:
+                return EMPLOYMENT_TYPES[key]
+    return None
+
+
+def _amount(value: Any) -> Optional[str]:
+    if isinstance(value, bool) or value in (None, ''):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+    return f"{number:,.0f}".replace(',', ' ') if number >= 100 else f"{number:g}"
+
+
+def format_salary(value: Any) -> Optional[str]:
+    """baseSalary (MonetaryAmount) -> "45 000 - 55 000 EUR / an" """
+    if not isinstance(value, dict):
+        return None
+    currency = value.get('currency') or ''
+    amount = value.get('value')
+    unit = None
+    if isinstance(amount, dict):
+        unit = amount.get('unitText')
+        low, high = _amount(amount.get('minValue')), _amount(amount.get('maxValue'))
+        single = _amount(amount.get('value'))
+    else:
+        low = high = None
+        single = _amount(amount)
+
+    if low and high and low != high:
+        text = f"{low} - {high}"
+    else:
+        text = low or high or single
+    if not text:
+        return None
+    text = f"{text} {currency}".strip()
+    if isinstance(unit, str) and unit:
+        text += f" / {SALARY_UNITS.get(unit.upper(), unit.lower())}"
+    return text
+
+
+def hiring_organization(value: Any) -> Dict[str, Any]:
+    """hiringOrganization -> champs JobCompanyInfo (nom, site, logo)"""
+    if isinstance(value, str):
+        return {'name': value.strip()} if value.strip() else {}
+    if not isinstance(value, dict):
+        return {}
+    logo = value.get('logo')
+    if isinstance(logo, dict):
+        logo = logo.get('url') or logo.get('contentUrl')
+    links = value.get('sameAs')
+    links = [value.get('url'), *(links if isinstance(links, list) else [links])]
+    # La page entreprise LinkedIn n'est pas le site de l'entreprise
+    website = next((link for link in links if isinstance(link, str) and 'linkedin.com' not in link), None)
+    info = {
+        'name': value.get('name'),
+        'website': website,
+        'logo_url': logo
+    }
+    return {key: item.strip() for key, item in info.items() if isinstance(item, str) and item.strip()}
+
+
+def _address(place: Any) -> Dict[str, Any]:
+    if not isinstance(place, dict):
+        return {}
+    address = place.get('address', place)
+    if isinstance(address, str):
+        return {'addressLocality': address}
+    if not isinstance(address, dict):
+        return {}
+    country = address.get('addressCountry')
+    if isinstance(country, dict):
+        country = country.get('name')
+    address = {**address, 'addressCountry': country}
+    fields = ('addressLocality', 'addressRegion', 'addressCountry', 'postalCode')
+    return address if any(isinstance(address.get(field), str) and address[field].strip() for field in fields) else {}
+
+
+def job_location(posting: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    jobLocation (PostalAddress) et jobLocationType -> champs JobLocation
+    normalisés par le gazetteer (code pays ISO ramené à son identifiant).
+    """
+    places = posting.get('jobLocation')
+    places = places if isinstance(places, list) else [places]
+    address = next((address for address in map(_address, places) if address), {})
+    remote = str(posting.get('jobLocationType') or '').upper() == 'TELECOMMUTE'
+    if not address and not remote:
+        return None
+
+    gazetteer = get_gazetteer()
+    country = address.get('addressCountry')
+    country_entry = None
+    if isinstance(country, str) and len(country.strip()) == 2:
+        country_entry = gazetteer.entries.get(country.strip().lower())
+        if country_entry is not None:
+            country = country_entry['name']
+    parts = [address.get('addressLocality'), address.get('addressRegion'), country]
+    text = ', '.join(part.strip() for part in parts if isinstance(part, str) and part.strip())
+
+    info = gazetteer.resolve(text)
+    if country_entry is not None and not info['country_id']:
+        info.update(country=country_entry['name'], country_id=country_entry['id'])
+    if isinstance(address.get('postalCode'), str) and address['postalCode'].strip():
+        info['postal_code'] = address['postalCode'].strip()
+    info['remote'] = info['remote'] or remote
+    return info
+
+
+def job_posting_details(posting: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Champs `Job` d'un JobPosting : description (texte), type de contrat,
+    dates, salaire, entreprise et lieu normalisé. Les champs absents du
+    JSON-LD ne sont pas renseignés.
+    """
+    details: Dict[str, Any] = {'description': html_to_text(posting.get('description'))}
+
+    job_type = employment_type(posting.get('employmentType'))
+    if job_type:
+        details['type'] = job_type
+    posted_at = parse_date(posting.get('datePosted'))
+    if posted_at:
+        details['postedAt'] = posted_at
+    deadline = parse_date(posting.get('validThrough'))
+    if deadline:
+        details['applicationDeadline'] = deadline
+    salary = format_salary(posting.get('baseSalary'))
+    if salary:
+        details['salary'] = salary
+
+    details['company_info'] = hiring_organization(posting.get('hiringOrganization'))
+    location = job_location(posting)
+    if location:
+        details['location_info'] = location
+        if location['remote']:
+            details['remote'] = True
+    return details
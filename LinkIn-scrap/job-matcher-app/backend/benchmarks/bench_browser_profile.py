@@ -0,0 +1,122 @@
+# bench_browser_profile.py - Octets transférés et temps de chargement, avec/sans profil allégé
+"""
+Charge les mêmes pages LinkedIn avec le profil Chrome standard puis avec le
+profil allégé (browser_profile) et compare :
+  - les octets transférés (somme des `encodedDataLength` des logs DevTools),
+  - le nombre de requêtes abouties / bloquées,
+  - le temps de `driver.get` et le temps jusqu'aux premières cartes d'offres.
+
+Nécessite Chrome + chromedriver.
+
+Usage (depuis backend/):
+    python benchmarks/bench_browser_profile.py [--runs 3] [--url URL ...] [--no-headless]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium import webdriver  # noqa: E402
+from selenium.webdriver.chrome.options import Options  # noqa: E402
+
+from app.services.browser_profile import apply_lean_profile, enable_request_blocking  # noqa: E402
+from app.services.page_readiness import wait_for_cards  # noqa: E402
+
+DEFAULT_URLS = [
+    "https://www.linkedin.com/jobs/search/?keywords=python&location=Paris%2C%20France",
+    "https://www.linkedin.com/jobs/search/?keywords=data%20engineer&location=Lyon%2C%20France",
+]
+CARD_SELECTORS = ["div.base-card", ".job-search-card", "li[data-occludable-job-id]"]
+
+
+def build_driver(lean: bool, headless: bool) -> webdriver.Chrome:
+    options = Options()
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if lean:
+        apply_lean_profile(options)
+
+    driver = webdriver.Chrome(options=options)
+    driver.execute_cdp_cmd("Network.enable", {})
+    # Cache vidé : chaque mesure part à froid
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+    if lean:
+        enable_request_blocking(driver)
+    return driver
+
+
+def network_totals(driver):
+    """Octets transférés, requêtes abouties et requêtes en échec/bloquées depuis le dernier appel"""
+    transferred, finished, failed = 0, 0, 0
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        if message["method"] == "Network.loadingFinished":
+            transferred += message["params"].get("encodedDataLength", 0)
+            finished += 1
+        elif message["method"] == "Network.loadingFailed":
+            failed += 1
+    return transferred, finished, failed
+
+
+def measure(lean: bool, urls, runs: int, headless: bool):
+    driver = build_driver(lean, headless)
+    samples = []
+    try:
+        driver.get("about:blank")
+        network_totals(driver)
+        for _ in range(runs):
+            for url in urls:
+                started = time.perf_counter()
+                driver.get(url)
+                load = time.perf_counter() - started
+                report = wait_for_cards(driver, CARD_SELECTORS, timeout=15)
+                ready = time.perf_counter() - started
+                transferred, finished, failed = network_totals(driver)
+                samples.append({
+                    "bytes": transferred, "requests": finished, "blocked": failed,
+                    "load": load, "ready": ready, "cards": report.count
+                })
+                driver.get("about:blank")
+                network_totals(driver)
+    finally:
+        driver.quit()
+    return samples
+
+
+def summarize(label: str, samples):
+    def median(key):
+        return statistics.median(sample[key] for sample in samples)
+
+    print(f"{label:<10} {median('bytes') / 1024:>10.0f} Kio {median('requests'):>6.0f} req "
+          f"{median('blocked'):>5.0f} bloq. {median('load'):>7.2f}s get {median('ready'):>7.2f}s prêt "
+          f"{median('cards'):>5.0f} cartes")
+    return median("bytes"), median("ready")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--url", action="append", dest="urls")
+    parser.add_argument("--no-headless", action="store_true")
+    args = parser.parse_args()
+    urls = args.urls or DEFAULT_URLS
+
+    print(f"{len(urls)} URL(s) x {args.runs} passe(s), médianes par page\n")
+    standard_bytes, standard_ready = summarize("standard", measure(False, urls, args.runs, not args.no_headless))
+    lean_bytes, lean_ready = summarize("allégé", measure(True, urls, args.runs, not args.no_headless))
+
+    if standard_bytes and lean_ready:
+        print(f"\nOctets: -{100 * (1 - lean_bytes / standard_bytes):.0f}%  "
+              f"Temps prêt: x{standard_ready / lean_ready:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# bench_keyword_matcher.py - Micro-benchmark du classifieur mots-clés
+"""
+Compare l'ancienne détection (une boucle `any(keyword in text.lower())` par
+liste + 4 regex IGNORECASE pour les exigences) au KeywordMatcher en une passe.
+
+Usage (depuis backend/):
+    python benchmarks/bench_keyword_matcher.py [--iterations 2000]
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.keyword_matcher import build_matcher  # noqa: E402
+
+REMOTE = ['remote', 'télétravail', 'home office', 'work from home',
+          'distributed', 'anywhere', 'telecommute', 'virtual']
+URGENT = ['urgent', 'asap', 'immediately', 'immédiat',
+          'quickly', 'fast', 'emergency', 'prioritaire']
+BENEFITS = ['health insurance', 'assurance santé', '401k', 'vacation',
+            'remote work', 'flexible hours', 'bonus', 'stock options',
+            'formation', 'training', 'development', 'congés']
+REQUIREMENT_PATTERNS = [
+    r'required?:?\s*(.+?)(?:\n|$)',
+    r'must have:?\s*(.+?)(?:\n|$)',
+    r'qualifications?:?\s*(.+?)(?:\n|$)',
+    r'experience:?\s*(.+?)(?:\n|$)'
+]
+
+SAMPLE = (
+    "Nous recherchons un développeur Python senior pour rejoindre notre équipe. "
+    "Poste en télétravail partiel, démarrage immédiat. "
+    "Required: 5 years of Python and Django in production\n"
+    "Must have: solid knowledge of PostgreSQL, Docker and Kubernetes\n"
+    "Qualifications: Master's degree in computer science or equivalent\n"
+    "Experience: building REST APIs at scale with FastAPI or Flask\n"
+    "Avantages : assurance santé prise en charge à 100%, formation continue. "
+    "We offer flexible hours, an annual bonus and stock options for everyone! "
+    "Plus de 25 jours de congés et une mutuelle très complète pour toute la famille. "
+) * 4
+
+
+def legacy_classify(text: str):
+    """Reproduction de l'implémentation historique"""
+    lowered = text.lower()
+    remote = any(keyword in lowered for keyword in REMOTE)
+    urgent = any(keyword in lowered for keyword in URGENT)
+
+    benefits = []
+    for sentence in re.split(r'[.!?]', text):
+        if any(keyword in sentence.lower() for keyword in BENEFITS):
+            benefits.append(sentence.strip())
+
+    requirements = []
+    for pattern in REQUIREMENT_PATTERNS:
+        for match in re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE):
+            requirements.append(match.group(1).strip())
+    return remote, urgent, benefits, requirements
+
+
+def single_pass_classify(matcher, text: str):
+    """Un seul scan du matcher compilé pour tous les labels"""
+    return matcher.classify(text)
+
+
+def run(label: str, func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / iterations * 1e6
+    print(f"{label:<28} {per_call:10.1f} µs/description  ({iterations} itérations)")
+    return per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    matcher = build_matcher()
+    print(f"Description de {len(SAMPLE)} caractères")
+
+    legacy = run('legacy (any + regex)', lambda: legacy_classify(SAMPLE), args.iterations)
+    single = run('matcher compilé (1 passe)', lambda: single_pass_classify(matcher, SAMPLE), args.iterations)
+    print(f"Rapport legacy / 1 passe : {legacy / single:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+# bench_parsing.py - Benchmarks hors ligne du parsing (pages de référence versionnées)
+"""
+Mesure le parsing sur les fixtures de benchmarks/fixtures/ (aucun réseau,
+aucun navigateur) :
+  - scrapping.parse_job_offers              (script autonome)
+  - LinkedInScraper._parse_job_offers       (scraper historique)
+  - LinkedInJobScraper._extract_jobs_from_page, extract_job_data,
+    _parse_linkedin_date, _extract_requirements, _parse_job_details
+  - structured_data.find_job_posting          (JSON-LD des pages de détail)
+
+Pour chaque implémentation et fixture : cartes/s, µs/carte (une "carte" est
+l'unité traitée : carte d'offre, date ou description) et pic mémoire
+(tracemalloc, passe séparée pour ne pas fausser les temps).
+
+Usage (depuis backend/):
+    python benchmarks/bench_parsing.py [--iterations 20] [--only requirements]
+    python benchmarks/bench_parsing.py --json resultats.json
+    python benchmarks/bench_parsing.py --compare HEAD~3 HEAD
+
+`--compare` extrait chaque commit dans un worktree git temporaire et y
+exécute ce même script sur les fixtures de l'arbre courant.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+BENCH_DIR = Path(__file__).resolve().parent
+FIXTURES_DIR = BENCH_DIR / "fixtures"
+BACKEND_DIR = BENCH_DIR.parent
+
+SEARCH_FIXTURES = ["search_guest_25.html", "search_guest_100.html", "search_member_25.html"]
+DETAIL_FIXTURES = ["detail_short.html", "detail_long.html", "detail_jsonld_short.html", "detail_jsonld_long.html"]
+
+DATE_SAMPLES = [
+    "2024-05-12T08:30:00Z", "2024-05-12", "il y a 2 heures", "3 days ago",
+    "1 week ago", "il y a 5 minutes", "2 months ago", "il y a 1 mois",
+] * 16
+
+
+def _setup_paths(backend_dir: Path):
+    """Rend importables `app` et scrapping.py de l'arbre mesuré"""
+    sys.path.insert(0, str(backend_dir.parent.parent))
+    sys.path.insert(0, str(backend_dir))
+    os.environ.setdefault("LINKEDIN_USERNAME", "bench")
+    os.environ.setdefault("LINKEDIN_PASSWORD", "bench")
+
+
+def _read(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+def _count_cards(html: str) -> int:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    return max(len(soup.select(selector)) for selector in (".base-card", "li[data-occludable-job-id]"))
+
+
+def _descriptions(html: str) -> List[str]:
+    from bs4 import BeautifulSoup
+    markup = BeautifulSoup(html, "html.parser").select_one("div.show-more-less-html__markup")
+    return [markup.get_text("\n", strip=True)] if markup else []
+
+
+# Chaque cas : (implémentation, fixture) -> (fonction mesurée, unités traitées par appel)
+Case = Tuple[str, str, Callable[[], int], int]
+
+
+def build_cases(only: Optional[str]) -> List[Case]:
+    cases: List[Case] = []
+
+    def add(name: str, fixture: str, func: Callable[[], int], units: int):
+        if not only or only in name:
+            cases.append((name, fixture, func, units))
+
+    # Script autonome
+    try:
+        import scrapping
+        for fixture in SEARCH_FIXTURES:
+            html = _read(fixture)
+            add("scrapping.parse_job_offers", fixture,
+                lambda html=html: len(scrapping.parse_job_offers(html)), _count_cards(html))
+    except ImportError as e:
+        print(f"⚠️ scrapping.py non importable: {e}")
+
+    # Scraper historique
+    try:
+        from app.services.linkedin_scraper import LinkedInScraper
+        legacy = LinkedInScraper.__new__(LinkedInScraper)
+        for fixture in SEARCH_FIXTURES:
+            html = _read(fixture)
+            add("LinkedInScraper._parse_job_offers", fixture,
+                lambda html=html: len(legacy._parse_job_offers(html)), _count_cards(html))
+    except ImportError as e:
+        print(f"⚠️ scraper historique non importable: {e}")
+
+    # Scraper amélioré
+    from bs4 import BeautifulSoup
+    from app.services.linkedin_scraper_enhanced import LinkedInJobScraper
+    try:
+        from app.services.structured_data import find_job_posting
+    except ImportError:
+        # Commit antérieur au JSON-LD (--compare)
+        find_job_posting = None
+    scraper = LinkedInJobScraper()
+    loop = asyncio.new_event_loop()
+
+    for fixture in SEARCH_FIXTURES:
+        html = _read(fixture)
+        cards = _count_cards(html)
+        add("LinkedInJobScraper._extract_jobs_from_page", fixture,
+            lambda html=html: len(loop.run_until_complete(scraper._extract_jobs_from_page(html))), cards)
+
+        soup = BeautifulSoup(html, "html.parser")
+        elements = next((found for found in (soup.select(s) for s in scraper.selectors['job_cards']) if found), [])
+        add("LinkedInJobScraper.extract_job_data", fixture,
+            lambda elements=elements: sum(1 for element in elements if scraper.extract_job_data(element)),
+            len(elements))
+
+    add("LinkedInJobScraper._parse_linkedin_date", "dates",
+        lambda: sum(1 for value in DATE_SAMPLES if scraper._parse_linkedin_date(value)), len(DATE_SAMPLES))
+
+    for fixture in DETAIL_FIXTURES:
+        html = _read(fixture)
+        descriptions = _descriptions(html)
+        add("LinkedInJobScraper._extract_requirements", fixture,
+            lambda descriptions=descriptions: sum(len(scraper._extract_requirements(d)) for d in descriptions),
+            len(descriptions))
+        add("LinkedInJobScraper._parse_job_details", fixture,
+            lambda html=html: len(scraper._parse_job_details(html)['description']), 1)
+        if find_job_posting:
+            add("structured_data.find_job_posting", fixture,
+                lambda html=html: int(find_job_posting(html) is not None), 1)
+
+    return cases
+
+
+def measure(func: Callable[[], int], units: int, iterations: int) -> Dict[str, float]:
+    func()  # échauffement
+    started = time.perf_counter()
+    for _ in range(iterations):
+        extracted = func()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    processed = max(units, 1) * iterations
+    return {
+        "cards_per_s": processed / elapsed,
+        "us_per_card": elapsed / processed * 1e6,
+        "peak_kib": peak / 1024,
+        "units": units,
+        "extracted": extracted,
+    }
+
+
+def run_suite(iterations: int, only: Optional[str]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, fixture, func, units in build_cases(only):
+        try:
+            results[f"{name} [{fixture}]"] = measure(func, units, iterations)
+        except Exception as e:
+            print(f"❌ {name} [{fixture}]: {e}")
+    return results
+
+
+def print_results(results: Dict[str, Dict[str, float]]):
+    print(f"{'implémentation [fixture]':<72} {'cartes/s':>10} {'µs/carte':>10} {'pic Kio':>9} {'extraits':>9}")
+    for key, row in results.items():
+        print(f"{key:<72} {row['cards_per_s']:>10.0f} {row['us_per_card']:>10.1f} "
+              f"{row['peak_kib']:>9.0f} {row['extracted']:>4}/{row['units']:<4}")
+
+
+def _git(*args, cwd: Path) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def run_at_commit(rev: str, iterations: int, only: Optional[str]) -> Dict[str, Dict[str, float]]:
+    """Exécute la suite sur le code d'un commit (worktree temporaire), fixtures courantes"""
+    toplevel = Path(_git("rev-parse", "--show-toplevel", cwd=BACKEND_DIR))
+    prefix = _git("rev-parse", "--show-prefix", cwd=BACKEND_DIR)
+    with tempfile.TemporaryDirectory(prefix="bench-parsing-") as tmp:
+        worktree = Path(tmp) / "tree"
+        _git("worktree", "add", "--detach", str(worktree), rev, cwd=toplevel)
+        try:
+            output = Path(tmp) / "results.json"
+            command = [sys.executable, str(Path(__file__).resolve()), "--backend", str(worktree / prefix),
+                       "--iterations", str(iterations), "--json", str(output)]
+            if only:
+                command += ["--only", only]
+            subprocess.run(command, check=True)
+            return json.loads(output.read_text(encoding="utf-8"))
+        finally:
+            _git("worktree", "remove", "--force", str(worktree), cwd=toplevel)
+
+
+def print_comparison(base_rev: str, base: Dict, head_rev: str, head: Dict):
+    print(f"\n{'implémentation [fixture]':<72} {base_rev[:10]:>10} {head_rev[:10]:>10} {'µs/carte':>9} {'pic Kio':>9}")
+    for key in sorted(set(base) | set(head)):
+        before, after = base.get(key), head.get(key)
+        if not before or not after:
+            side = "absent" if not before else "supprimé"
+            print(f"{key:<72} {side:>21}")
+            continue
+        speedup = before["us_per_card"] / after["us_per_card"]
+        print(f"{key:<72} {before['us_per_card']:>10.1f} {after['us_per_card']:>10.1f} "
+              f"{speedup:>8.2f}x {after['peak_kib'] - before['peak_kib']:>+9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--only", help="Filtre sur le nom d'implémentation")
+    parser.add_argument("--json", help="Écrit les résultats dans ce fichier")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="Compare deux commits")
+    parser.add_argument("--backend", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        base_rev, head_rev = args.compare
+        base = run_at_commit(base_rev, args.iterations, args.only)
+        head = run_at_commit(head_rev, args.iterations, args.only)
+        print_comparison(base_rev, base, head_rev, head)
+        return
+
+    _setup_paths(Path(args.backend) if args.backend else BACKEND_DIR)
+    import logging
+    logging.disable(logging.WARNING)
+
+    results = run_suite(args.iterations, args.only)
+    print_results(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
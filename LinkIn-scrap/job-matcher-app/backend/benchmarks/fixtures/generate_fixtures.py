@@ -0,0 +1,197 @@
+# generate_fixtures.py - Génère les pages HTML de référence des benchmarks de parsing
+"""
+Pages synthétiques mais fidèles à la structure LinkedIn (balisage, classes,
+volume de bruit <head>/<script>), générées de façon déterministe. Les
+fichiers produits sont versionnés : ne relancer ce script que pour ajouter
+ou faire évoluer une fixture.
+
+Usage (depuis backend/):
+    python benchmarks/fixtures/generate_fixtures.py
+"""
+import json
+import random
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).resolve().parent
+
+TITLES = ["Développeur Python Senior", "Data Engineer (H/F)", "Ingénieur DevOps - Urgent",
+          "Full Stack Developer - Remote", "Product Owner", "Data Scientist NLP",
+          "Lead Backend Engineer", "Stage - Développeur Web", "Architecte Cloud AWS",
+          "Ingénieur QA Automatisation"]
+COMPANIES = ["ACME", "Datawise", "Nexa Conseil", "Blue Orbit", "Helios Santé",
+             "Qanto", "Fintrack", "Le Bon Code", "Mistral Logistics", "Octopus Lab"]
+LOCATIONS = ["Paris, Île-de-France, France", "Lyon, Auvergne-Rhône-Alpes, France",
+             "Nantes, Pays de la Loire, France", "Télétravail", "Bordeaux, Nouvelle-Aquitaine, France",
+             "Lille, Hauts-de-France, France", "Toulouse, Occitanie, France"]
+AGES = ["il y a 2 heures", "il y a 1 jour", "il y a 3 jours", "il y a 1 semaine", "il y a 2 semaines"]
+
+HEAD_NOISE = "".join(
+    f'<link rel="preload" href="https://static.licdn.com/aero-v1/sc/h/{index:04x}abc" as="script">'
+    for index in range(60)
+) + "<style>" + ".c{color:#000;margin:0 auto;padding:4px}" * 400 + "</style>"
+SCRIPT_NOISE = "<script>" + "window.__lix=(window.__lix||[]).concat([1,2,3,4,5,6,7,8]);" * 300 + "</script>"
+
+
+def _slug(text: str) -> str:
+    return "".join(ch if ch.isalnum() else "-" for ch in text.lower()).strip("-")
+
+
+def _page(body: str, head: str = "") -> str:
+    return f'<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">{HEAD_NOISE}{head}</head>' \
+           f'<body><main id="main-content">{body}</main>{SCRIPT_NOISE}</body></html>'
+
+
+def guest_card(rng: random.Random, index: int) -> str:
+    """Carte de la recherche publique (jobs-guest) : div.base-card"""
+    job_id = 3800000000 + rng.randint(0, 99999999)
+    title, company, location = rng.choice(TITLES), rng.choice(COMPANIES), rng.choice(LOCATIONS)
+    day = rng.randint(1, 28)
+    return f"""
+<li>
+  <div class="base-card relative w-full hover:no-underline focus:no-underline base-card--link base-search-card base-search-card--link job-search-card"
+       data-entity-urn="urn:li:jobPosting:{job_id}" data-impression-id="jobs-search-result-{index}" data-reference-id="ref{index}" data-tracking-id="t{index}">
+    <a class="base-card__full-link absolute top-0 right-0 bottom-0 left-0 p-0 z-[2]"
+       href="https://fr.linkedin.com/jobs/view/{_slug(title)}-chez-{_slug(company)}-{job_id}?refId=abc%3D%3D&amp;trackingId=def%3D%3D&amp;position={index + 1}&amp;pageNum=0&amp;trk=public_jobs_jserp-result_search-card">
+      <span class="sr-only">{title}</span>
+    </a>
+    <div class="search-entity-media">
+      <img class="artdeco-entity-image artdeco-entity-image--square-4" data-delayed-url="https://media.licdn.com/dms/image/logo-{index}.png" alt="{company}">
+    </div>
+    <div class="base-search-card__info">
+      <h3 class="base-search-card__title">
+        {title}
+      </h3>
+      <h4 class="base-search-card__subtitle">
+        <a class="hidden-nested-link" data-tracking-control-name="public_jobs_jserp-result_job-search-card-subtitle"
+           href="https://fr.linkedin.com/company/{_slug(company)}?trk=public_jobs_jserp-result_job-search-card-subtitle">{company}</a>
+      </h4>
+      <div class="base-search-card__metadata">
+        <span class="job-search-card__location">
+          {location}
+        </span>
+        <div class="job-posting-benefits text-sm"><span class="job-posting-benefits__text">Recrutement actif</span></div>
+        <time class="job-search-card__listdate" datetime="2024-05-{day:02d}">
+          {rng.choice(AGES)}
+        </time>
+      </div>
+    </div>
+  </div>
+</li>"""
+
+
+def member_card(rng: random.Random, index: int) -> str:
+    """Carte de la liste connectée : li[data-occludable-job-id] / .job-search-card"""
+    job_id = 3800000000 + rng.randint(0, 99999999)
+    title, company, location = rng.choice(TITLES), rng.choice(COMPANIES), rng.choice(LOCATIONS)
+    return f"""
+<li class="jobs-search-results__list-item occludable-update" data-occludable-job-id="{job_id}">
+  <div class="job-search-card job-card-container" data-job-id="{job_id}">
+    <div class="job-card-list__entity-lockup">
+      <h4 class="job-search-card__title">
+        <a class="job-card-list__title" data-control-name="job_search_job_title" href="/jobs/view/{job_id}/?eBP=CwEAAAGP&amp;refId=r{index}&amp;trackingId=t{index}">{title}</a>
+      </h4>
+      <a class="job-search-card__company-name" data-control-name="job_search_company_name" href="/company/{_slug(company)}/life/">{company}</a>
+      <ul class="job-card-container__metadata-wrapper">
+        <li><span class="job-search-card__location">{location}</span></li>
+      </ul>
+      <time class="job-search-card__listdate--new" datetime="2024-05-{rng.randint(1, 28):02d}T08:{rng.randint(0, 59):02d}:00Z">{rng.choice(AGES)}</time>
+    </div>
+    <ul class="job-card-list__footer-wrapper"><li class="job-card-container__footer-item">Candidature simplifiée</li></ul>
+  </div>
+</li>"""
+
+
+def search_page(card, count: int, seed: int) -> str:
+    rng = random.Random(seed)
+    cards = "".join(card(rng, index) for index in range(count))
+    return _page(f'<section class="two-pane-serp-page__results-list"><ul class="jobs-search__results-list">{cards}</ul></section>')
+
+
+DESCRIPTION_BLOCKS = [
+    "Nous recherchons un(e) {title} pour rejoindre notre équipe produit à {city}.",
+    "Required: 5 years of Python and Django in production environments",
+    "Must have: solid knowledge of PostgreSQL, Docker and Kubernetes",
+    "Qualifications: Master's degree in computer science or equivalent experience",
+    "Experience: building REST APIs at scale with FastAPI or Flask",
+    "Vous travaillerez en télétravail partiel (2 jours par semaine), démarrage immédiat.",
+    "Avantages : assurance santé prise en charge à 100%, formation continue et tickets restaurant.",
+    "We offer flexible hours, an annual bonus and stock options for everyone!",
+    "Plus de 25 jours de congés et une mutuelle très complète pour toute la famille.",
+    "Notre stack : Python, TypeScript, React, AWS, Terraform, GitLab CI.",
+]
+
+
+def job_posting_ld(title: str, company: str, description: str) -> str:
+    """Bloc JSON-LD JobPosting tel qu'embarqué dans le <head> des pages d'offres"""
+    posting = {
+        "@context": "http://schema.org",
+        "@type": "JobPosting",
+        "title": title,
+        "description": description,
+        "datePosted": "2024-05-12T08:30:00.000Z",
+        "validThrough": "2024-06-11T08:30:00.000Z",
+        "employmentType": "FULL_TIME",
+        "hiringOrganization": {
+            "@type": "Organization",
+            "name": company,
+            "sameAs": f"https://fr.linkedin.com/company/{_slug(company)}",
+            "logo": f"https://media.licdn.com/dms/image/logo-{_slug(company)}.png"
+        },
+        "jobLocation": {
+            "@type": "Place",
+            "address": {"@type": "PostalAddress", "addressLocality": "Paris",
+                        "addressRegion": "Île-de-France", "addressCountry": "FR"}
+        },
+        "baseSalary": {
+            "@type": "MonetaryAmount",
+            "currency": "EUR",
+            "value": {"@type": "QuantitativeValue", "minValue": 45000, "maxValue": 55000, "unitText": "YEAR"}
+        }
+    }
+    return f'<script type="application/ld+json">{json.dumps(posting, ensure_ascii=False)}</script>'
+
+
+def detail_page(paragraphs: int, seed: int, structured: bool = False) -> str:
+    rng = random.Random(seed)
+    title, company = rng.choice(TITLES), rng.choice(COMPANIES)
+    blocks = [rng.choice(DESCRIPTION_BLOCKS).format(title=title, city="Paris") for _ in range(paragraphs)]
+    description = "".join(f"<p>{block}</p>\n" for block in blocks)
+    body = f"""
+<section class="top-card-layout">
+  <h1 class="top-card-layout__title">{title}</h1>
+  <a class="topcard__org-name-link" href="https://fr.linkedin.com/company/{_slug(company)}">{company}</a>
+  <span class="topcard__flavor topcard__flavor--bullet">Paris, Île-de-France, France</span>
+</section>
+<section class="description">
+  <div class="show-more-less-html__markup relative overflow-hidden">
+    {description}
+  </div>
+</section>
+<section class="job-details-company-modules">
+  <span class="job-details-company-modules__company-size">201-500 employés</span>
+  <span class="job-details-company-modules__industry">Technologies et services de l'information</span>
+  <a href="https://www.{_slug(company)}.example">Site web</a>
+</section>"""
+    return _page(body, job_posting_ld(title, company, description) if structured else "")
+
+
+FIXTURES = {
+    "search_guest_25.html": lambda: search_page(guest_card, 25, seed=1),
+    "search_guest_100.html": lambda: search_page(guest_card, 100, seed=2),
+    "search_member_25.html": lambda: search_page(member_card, 25, seed=3),
+    "detail_short.html": lambda: detail_page(6, seed=4),
+    "detail_long.html": lambda: detail_page(60, seed=5),
+    "detail_jsonld_short.html": lambda: detail_page(6, seed=4, structured=True),
+    "detail_jsonld_long.html": lambda: detail_page(60, seed=5, structured=True),
+}
+
+
+def main():
+    for name, build in FIXTURES.items():
+        path = FIXTURES_DIR / name
+        path.write_text(build(), encoding="utf-8")
+        print(f"{name:<26} {path.stat().st_size / 1024:8.1f} Kio")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# import_jobs_jsonl.py
+"""
+Import des exports JSON Lines du scraper (scrapping.py) dans `jobs`
+
+Lit le fichier ligne à ligne (.jsonl ou .jsonl.gz, sans jamais le charger en
+entier) et l'écrit en base par lots via bulk_upsert_jobs : empreintes,
+lieux normalisés, entreprises canoniques et dédoublonnage comme pour une
+session de scraping. Un fichier interrompu (export arrêté en cours de
+route, gzip tronqué) est importé jusqu'à sa dernière ligne complète.
+
+Usage (depuis backend/):
+    python import_jobs_jsonl.py resultat_offres.jsonl[.gz] [...]
+                                [--batch-size 500] [--dry-run]
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.services.job_ingestion import INGESTION_BATCH_SIZE, IngestionResult, bulk_upsert_jobs
+from app.services.skill_extractor import get_skill_extractor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("import_jobs_jsonl")
+
+# Dates exportées en ISO 8601 par scrapping.py
+DATE_FIELDS = ("createdAt", "updatedAt", "postedAt", "startDate", "applicationDeadline")
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Offres d'un fichier JSON Lines (gzip si suffixe .gz), une par ligne"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        line_number = 0
+        try:
+            for line_number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.warning(f"⚠️ {path}:{line_number} ligne ignorée: {e}")
+        except EOFError:
+            logger.warning(f"⚠️ {path} tronqué après la ligne {line_number}, fin de l'import du fichier")
+
+
+def prepare_job(offer: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Document `jobs` d'une offre exportée : champs vides retirés (ils
+    n'écrasent pas un enrichissement existant), dates converties,
+    compétences extraites.
+    """
+    job = {key: value for key, value in offer.items() if value not in (None, "N/A")}
+    for field in DATE_FIELDS:
+        if isinstance(job.get(field), str):
+            try:
+                job[field] = datetime.fromisoformat(job[field])
+            except ValueError:
+                del job[field]
+    job.setdefault("source", "linkedin")
+    job.setdefault("scraped_at", job.get("createdAt") or datetime.utcnow())
+    if "skills" not in job:
+        job["skills"] = get_skill_extractor().extract(job.get("title"), job.get("description"))
+    return job
+
+
+async def run(args):
+    client = None if args.dry_run else AsyncIOMotorClient(settings.MONGODB_URI)
+    db = client[settings.DB_NAME] if client else None
+
+    ingestion = IngestionResult()
+    read = 0
+    started = time.perf_counter()
+
+    async def flush(batch: List[Dict[str, Any]]):
+        if db is not None:
+            ingestion.merge(await bulk_upsert_jobs(db.jobs, batch, batch_size=args.batch_size))
+        elapsed = time.perf_counter() - started
+        logger.info(f"⏳ {read} offres lues ({read / elapsed:.0f} offres/s)")
+
+    try:
+        for path in args.files:
+            logger.info(f"📥 Import de {path}")
+            batch: List[Dict[str, Any]] = []
+            for offer in iter_jsonl(path):
+                batch.append(prepare_job(offer))
+                read += 1
+                if len(batch) >= args.batch_size:
+                    await flush(batch)
+                    batch = []
+            if batch:
+                await flush(batch)
+    finally:
+        if client:
+            client.close()
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"✅ {read} offres en {elapsed:.1f}s : {ingestion.inserted} insérées, {ingestion.updated} mises à jour, "
+        f"{ingestion.duplicates} doublons, {ingestion.errors} erreurs"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="+", help="Fichiers .jsonl ou .jsonl.gz")
+    parser.add_argument("--batch-size", type=int, default=INGESTION_BATCH_SIZE, help="Offres par lot d'écriture")
+    parser.add_argument("--dry-run", action="store_true", help="Lit et prépare les offres sans écrire en base")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
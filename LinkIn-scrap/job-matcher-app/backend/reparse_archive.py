@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# reparse_archive.py
+"""
+Ré-extraction hors ligne des pages archivées (PAGE_ARCHIVE_ENABLED)
+
+Relit les pages de recherche et de détail de l'archive, les re-parse en
+parallèle (pool de processus, aucun accès réseau) avec le parsing actuel du
+scraper, puis écrit les résultats en base par lots :
+  - pages de recherche -> bulk_upsert_jobs
+  - pages de détail    -> mises à jour partielles par job_id
+
+Usage (depuis backend/):
+    python reparse_archive.py [--kind search|detail] [--since 2024-01-01]
+                              [--until 2024-02-01] [--job-id 3812345678]
+                              [--workers 8] [--dry-run]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from multiprocessing import Pool
+from typing import Any, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.services.detail_cache import content_hash
+from app.services.job_fingerprint import description_fields
+from app.services.job_ingestion import IngestionResult, bulk_upsert_jobs
+from app.services.page_archive import PAGE_KIND_DETAIL, PAGE_KIND_SEARCH, PageArchive, read_page
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("reparse_archive")
+
+# Parseur du processus worker (initialisé une fois par processus)
+_scraper = None
+_archive_root = None
+
+
+def _init_worker(archive_root: str):
+    global _scraper, _archive_root
+    from app.services.linkedin_scraper_enhanced import LinkedInJobScraper
+
+    logging.getLogger().setLevel(logging.ERROR)
+    _archive_root = archive_root
+    _scraper = LinkedInJobScraper()
+    _scraper.archive = None
+
+
+def _reparse(row: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Any], Optional[str]]:
+    """Re-parse une page archivée : (ligne d'index, résultat, erreur)"""
+    try:
+        html = read_page(_archive_root, row["path"], row["codec"])
+        fetched_at = datetime.fromisoformat(row["fetched_at"])
+        if row["kind"] == PAGE_KIND_SEARCH:
+            return row, _scraper.parse_jobs_from_html(html, fetched_at=fetched_at), None
+        return row, _scraper._parse_job_details(html), None
+    except Exception as e:
+        return row, None, str(e)
+
+
+def _detail_update(row: Dict[str, Any], details: Dict[str, Any]) -> Optional[UpdateOne]:
+    if not row.get("job_id") or not details.get("description"):
+        return None
+    fetched_at = datetime.fromisoformat(row["fetched_at"])
+    return UpdateOne(
+        {"job_id": row["job_id"]},
+        {"$set": {
+            **details,
+            **description_fields(details.get("description")),
+            "details_fetched_at": fetched_at,
+            "description_hash": content_hash(details.get("description")),
+            "updatedAt": datetime.utcnow()
+        }}
+    )
+
+
+async def run(args):
+    archive = PageArchive(args.archive)
+    since = datetime.fromisoformat(args.since) if args.since else None
+    until = datetime.fromisoformat(args.until) if args.until else None
+    total = archive.count(args.kind, since, until, args.job_id)
+    logger.info(f"🗄️ {total} pages à ré-extraire avec {args.workers} processus")
+
+    client = None if args.dry_run else AsyncIOMotorClient(settings.MONGODB_URI)
+    db = client[settings.DB_NAME] if client else None
+
+    ingestion = IngestionResult()
+    pages, jobs_found, details_updated, errors = 0, 0, 0, 0
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+
+    with Pool(args.workers, initializer=_init_worker, initargs=(archive.root,)) as pool:
+        for rows in archive.iter_batches(args.kind, since, until, args.job_id, batch_size=args.batch_size):
+            results = await loop.run_in_executor(
+                None, lambda: list(pool.imap_unordered(_reparse, rows, chunksize=args.chunksize))
+            )
+
+            jobs: List[Dict[str, Any]] = []
+            updates: List[UpdateOne] = []
+            for row, parsed, error in results:
+                pages += 1
+                if error:
+                    errors += 1
+                    logger.warning(f"⚠️ Page {row['id']} ({row['url']}): {error}")
+                elif row["kind"] == PAGE_KIND_SEARCH:
+                    jobs.extend(parsed)
+                else:
+                    update = _detail_update(row, parsed)
+                    if update:
+                        updates.append(update)
+
+            jobs_found += len(jobs)
+            if db is not None:
+                if jobs:
+                    ingestion.merge(await bulk_upsert_jobs(db.jobs, jobs))
+                if updates:
+                    result = await db.jobs.bulk_write(updates, ordered=False)
+                    details_updated += result.modified_count
+            else:
+                details_updated += len(updates)
+
+            elapsed = time.perf_counter() - started
+            logger.info(f"⏳ {pages}/{total} pages ({pages / elapsed:.0f} pages/s)")
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"✅ {pages} pages en {elapsed:.1f}s : {jobs_found} offres ({ingestion.inserted} insérées, "
+        f"{ingestion.updated} mises à jour), {details_updated} détails, {errors} erreurs"
+    )
+    archive.close()
+    if client:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archive", default=settings.PAGE_ARCHIVE_DIR, help="Répertoire de l'archive")
+    parser.add_argument("--kind", choices=[PAGE_KIND_SEARCH, PAGE_KIND_DETAIL], help="Type de pages (défaut: toutes)")
+    parser.add_argument("--since", help="Date ISO minimale de récupération")
+    parser.add_argument("--until", help="Date ISO maximale (exclue) de récupération")
+    parser.add_argument("--job-id", help="Une seule offre")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--batch-size", type=int, default=5000, help="Pages par lot d'écriture")
+    parser.add_argument("--chunksize", type=int, default=32, help="Pages par tâche envoyée à un worker")
+    parser.add_argument("--dry-run", action="store_true", help="Parse sans écrire en base")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
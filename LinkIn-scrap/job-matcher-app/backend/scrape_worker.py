@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# scrape_worker.py
+"""
+Worker de scraping autonome (SCRAPING_EXECUTION_MODE=queue)
+
+Réclame les sessions en file dans `scraping_sessions` par bail atomique,
+maintient le bail par heartbeats et écrit le résultat. Autant de workers
+que nécessaire peuvent tourner (processus ou machines), sans toucher à
+l'API : une session dont le worker meurt est reprise à expiration du bail
+(SCRAPE_LEASE_SECONDS), au plus SCRAPE_MAX_ATTEMPTS fois.
+
+Usage (depuis backend/):
+    python scrape_worker.py [--concurrency 2] [--poll-interval 5]
+"""
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.db.database import close_mongo_connection, connect_to_mongo
+from app.services.browser_executor import shutdown_browser_executor
+from app.services.job_enrichment import job_enrichment_service
+from app.services.scrape_queue import ScrapeWorker
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("scrape_worker")
+
+
+async def run(args):
+    await connect_to_mongo()
+    worker = ScrapeWorker(concurrency=args.concurrency, poll_interval=args.poll_interval,
+                          worker_id=args.worker_id)
+
+    # Arrêt propre : les sessions en cours sont remises en file
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await job_enrichment_service.stop()
+        shutdown_browser_executor(wait=False)
+        await close_mongo_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=1, help="Sessions traitées en parallèle")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="Attente (s) quand la file est vide")
+    parser.add_argument("--worker-id", help="Identifiant du worker (défaut: hôte:pid:aléatoire)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Tests de l'extraction des cartes dans la page (script unique, parité avec le chemin HTML)
+import json
+
+from app.services.card_extraction import CARD_FIELDS, _EXTRACT_CARDS_JS, extract_cards
+from app.services.detail_cache import JOB_ID_PATTERNS
+from app.services.job_fingerprint import job_fingerprint
+from app.services.linkedin_scraper_enhanced import LinkedInJobScraper
+
+# Carte dont le titre est découpé en plusieurs noeuds texte entourés de blancs
+CARD_HTML = """
+<div data-job-id="3812345678">
+  <h3 class="base-search-card__title"><a href="https://fr.linkedin.com/jobs/view/data-engineer-3812345678?trk=x">
+    Data <span>Engineer</span>  (H/F)
+  </a></h3>
+  <h4 class="base-search-card__subtitle"><a>  Acme  </a></h4>
+  <span class="job-search-card__location">
+    Paris, Île-de-France, France
+  </span>
+  <time class="job-search-card__listdate" datetime="2024-03-01"> il y a 2 jours </time>
+</div>
+"""
+
+# Ligne renvoyée par le script pour cette carte : chaque noeud texte rogné,
+# les noeuds vides ignorés, le reste concaténé (comme get_text(strip=True))
+CARD_ROW = [
+    'DataEngineer(H/F)',
+    'Acme',
+    'Paris, Île-de-France, France',
+    '2024-03-01',
+    'https://fr.linkedin.com/jobs/view/data-engineer-3812345678?trk=x',
+    '3812345678'
+]
+
+COMPARED_FIELDS = ('title', 'company', 'location', 'job_id', 'linkedin_url', 'remote', 'urgent', 'skills')
+
+
+class FakeDriver:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        return json.dumps(self.rows)
+
+
+def test_rows_are_mapped_to_card_fields():
+    driver = FakeDriver([CARD_ROW])
+    selectors = {'job_cards': ['div[data-job-id]'], 'title': ['h3 a'], 'company': [], 'location': []}
+    cards = extract_cards(driver, selectors)
+
+    assert cards == [dict(zip(CARD_FIELDS, CARD_ROW))]
+    script, (card_selectors, fields, patterns) = driver.calls[0]
+    assert script == _EXTRACT_CARDS_JS
+    assert card_selectors == ['div[data-job-id]']
+    assert fields == {'title': ['h3 a'], 'company': [], 'location': [], 'time_posted': []}
+    assert patterns == [pattern.pattern for pattern in JOB_ID_PATTERNS]
+
+
+def test_empty_payload():
+    assert extract_cards(FakeDriver([]), {'job_cards': []}) == []
+
+
+def test_job_id_patterns_are_valid_javascript():
+    # Les motifs Python sont recompilés tels quels par `new RegExp` dans la page
+    for pattern in JOB_ID_PATTERNS:
+        assert '(?P' not in pattern.pattern and '(?i' not in pattern.pattern
+        assert pattern.groups == 1
+
+
+def test_script_mirrors_get_text_strip():
+    assert 'createTreeWalker' in _EXTRACT_CARDS_JS
+    assert "parts.join('')" in _EXTRACT_CARDS_JS
+
+
+def test_browser_and_html_modes_build_the_same_job():
+    scraper = LinkedInJobScraper(extraction_mode='html')
+    [from_html] = scraper.parse_jobs_from_html(CARD_HTML)
+    [from_browser] = scraper._jobs_from_cards([dict(zip(CARD_FIELDS, CARD_ROW))])
+
+    for key in COMPARED_FIELDS:
+        assert from_browser.get(key) == from_html.get(key), key
+    # Empreinte de repli (sans id LinkedIn) : titre, entreprise et ville normalisés
+    identity = ('title', 'company', 'location')
+    assert job_fingerprint({key: from_browser[key] for key in identity}) == \
+        job_fingerprint({key: from_html[key] for key in identity})
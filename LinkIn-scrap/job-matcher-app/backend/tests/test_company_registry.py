@@ -0,0 +1,147 @@
+# Tests du registre des entreprises (normalisation, alias, cache, fiches)
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.company_registry import CompanyRegistry, company_name_of, normalize_company_name
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length=None):
+        return self.documents
+
+
+class FakeCompanies:
+    """Collection `companies` minimale : lectures `$in`, upserts et mises à jour par _id"""
+
+    def __init__(self):
+        self.documents = {}
+        self.reads = 0
+        self.updates = []
+
+    def find(self, query):
+        self.reads += 1
+        keys = query['key']['$in']
+        return FakeCursor([dict(doc) for doc in self.documents.values() if doc['key'] in keys])
+
+    async def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            key, update = operation._filter['key'], operation._doc
+            document = self.documents.get(key)
+            if document is None:
+                document = {'_id': f"id-{key}", 'key': key, 'aliases': [], **update['$setOnInsert']}
+                self.documents[key] = document
+            document['aliases'] += [alias for alias in update['$addToSet']['aliases']['$each']
+                                    if alias not in document['aliases']]
+            document.update(update['$set'])
+
+    async def find_one_and_update(self, query, update, return_document=None):
+        self.updates.append(update)
+        document = next((doc for doc in self.documents.values() if doc['_id'] == query['_id']), None)
+        if document is None:
+            return None
+        document.update(update.get('$set', {}))
+        for field in update.get('$unset', {}):
+            document.pop(field, None)
+        return dict(document)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    aliases = tmp_path / 'company_aliases.json'
+    aliases.write_text(json.dumps({'companies': [
+        {'name': 'Capgemini', 'aliases': ['Capgemini Engineering', 'Capgemini France']}
+    ]}), encoding='utf-8')
+    return CompanyRegistry(aliases_path=aliases, info_ttl=timedelta(hours=1))
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('CAPGEMINI S.A.', 'capgemini'),
+    ('Acme SAS', 'acme'),
+    ('Société Générale', 'societe generale'),
+    ('Dassault Systèmes SE', 'dassault systemes'),
+    ('Co', 'co'),
+    ('  ', ''),
+    (None, ''),
+])
+def test_normalize_company_name(name, expected):
+    assert normalize_company_name(name) == expected
+
+
+def test_company_name_of():
+    assert company_name_of({'name': ' Acme '}) == 'Acme'
+    assert company_name_of('Acme') == 'Acme'
+    assert company_name_of(None) == ''
+
+
+def test_canonical_key_follows_aliases(registry):
+    assert registry.canonical_key('Capgemini Engineering') == 'capgemini'
+    assert registry.canonical_key({'name': 'CAPGEMINI FRANCE'}) == 'capgemini'
+    assert registry.canonical_key('Acme Inc.') == 'acme'
+
+
+def test_missing_alias_table(tmp_path):
+    registry = CompanyRegistry(aliases_path=tmp_path / 'absent.json', info_ttl=timedelta(hours=1))
+    assert registry.canonical_key('Capgemini Engineering') == 'capgemini engineering'
+
+
+def test_resolve_many_creates_once_and_caches(registry):
+    collection = FakeCompanies()
+    companies = asyncio.run(registry.resolve_many(collection, ['Capgemini Engineering', 'Capgemini', 'Acme']))
+
+    assert set(companies) == {'capgemini', 'acme'}
+    assert companies['capgemini']['name'] == 'Capgemini'
+    assert sorted(companies['capgemini']['aliases']) == ['Capgemini', 'Capgemini Engineering']
+
+    reads = collection.reads
+    again = asyncio.run(registry.resolve_many(collection, ['Capgemini', 'Acme']))
+    assert again['acme']['_id'] == companies['acme']['_id']
+    assert collection.reads == reads
+
+
+def test_assign_company_ids(registry):
+    jobs = [{'company': 'Capgemini France'}, {'company': {'name': 'Acme'}}, {'title': 'Sans entreprise'}]
+    asyncio.run(registry.assign_company_ids(FakeCompanies(), jobs))
+    assert jobs[0]['company_id'] == 'id-capgemini'
+    assert jobs[1]['company_id'] == 'id-acme'
+    assert 'company_id' not in jobs[2]
+
+
+def test_is_info_fresh(registry):
+    assert not registry.is_info_fresh(None)
+    assert not registry.is_info_fresh({'info_fetched_at': None})
+    assert registry.is_info_fresh({'info_fetched_at': datetime.utcnow()})
+    assert not registry.is_info_fresh({'info_fetched_at': datetime.utcnow() - timedelta(hours=2)})
+
+
+def test_store_info_keeps_known_fields(registry):
+    collection = FakeCompanies()
+    company = asyncio.run(registry.resolve(collection, 'Acme'))
+    asyncio.run(registry.store_info(collection, company['_id'], {'size': '50-200', 'industry': '', 'other': 'x'}))
+
+    update = collection.updates[-1]
+    assert update['$set']['info'] == {'size': '50-200'}
+    assert update['$unset'] == {'info_claimed_at': ''}
+    assert registry.is_info_fresh(collection.documents['acme'])
+
+
+def test_empty_info_is_not_marked_fresh(registry):
+    collection = FakeCompanies()
+    company = asyncio.run(registry.resolve(collection, 'Acme'))
+    asyncio.run(registry.store_info(collection, company['_id'], {}))
+
+    assert collection.updates[-1] == {'$unset': {'info_claimed_at': ''}}
+    assert not registry.is_info_fresh(collection.documents['acme'])
+
+
+def test_company_info(registry):
+    assert registry.company_info(None) == {}
+    company = {'name': 'Acme', 'info': {'size': '50-200'}}
+    info = registry.company_info(company)
+    info['size'] = 'changed'
+    assert registry.company_info(company) == {'name': 'Acme', 'size': '50-200'}
@@ -0,0 +1,52 @@
+# Tests du filtre par type de contrat (paramètre f_JT, critères des cartes)
+from app.services.contract_filter import ContractFilter
+
+
+def test_inactive_filter():
+    contract_filter = ContractFilter()
+    assert not contract_filter.active
+    assert contract_filter.query_param() is None
+    assert contract_filter.accepts_card('Data Engineer')
+    assert not contract_filter.needs_verification('Data Engineer')
+
+
+def test_aliases_map_to_codes():
+    contract_filter = ContractFilter(['CDI', 'Full-time', 'Stage', 'cdi'])
+    assert contract_filter.codes == ['F', 'I']
+    assert contract_filter.unmapped == []
+    assert contract_filter.query_param() == 'f_JT=F%2CI'
+
+
+def test_accents_and_case_are_folded():
+    assert ContractFilter(['Bénévolat']).codes == ['V']
+    assert ContractFilter(['INTÉRIM']).codes == ['T']
+
+
+def test_unmapped_type_is_searched_in_text():
+    contract_filter = ContractFilter(['Portage salarial', ''])
+    assert contract_filter.codes == []
+    assert contract_filter.unmapped == ['portage salarial']
+    assert contract_filter.query_param() is None
+    assert contract_filter.accepts_card('Consultant SAP en portage salarial')
+    assert not contract_filter.accepts_card('Consultant SAP')
+
+
+def test_cards_are_accepted_when_search_is_filtered():
+    contract_filter = ContractFilter(['alternance'])
+    assert contract_filter.accepts_card('Développeur Python')
+    assert contract_filter.needs_verification('Développeur Python')
+    assert not contract_filter.needs_verification('Développeur Python en alternance')
+
+
+def test_markers_match_whole_words():
+    contract_filter = ContractFilter(['stage'])
+    assert contract_filter.text_matches('Stage - Data analyst')
+    assert contract_filter.text_matches('Data analyst (stagiaire)')
+    assert not contract_filter.text_matches('Backstage engineer')
+    assert not contract_filter.text_matches('Internal auditor')
+
+
+def test_markers_match_any_text():
+    contract_filter = ContractFilter(['CDD'])
+    assert contract_filter.text_matches(None, 'Contrat à durée déterminée de 6 mois')
+    assert not contract_filter.text_matches('CDI', None)
@@ -0,0 +1,68 @@
+# Tests du cache des pages de détail (clé job id, TTL, LRU)
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.detail_cache import DetailCache, content_hash, extract_job_id
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('https://www.linkedin.com/jobs/view/3812345678/', '3812345678'),
+    ('https://fr.linkedin.com/jobs/view/data-engineer-at-acme-3812345678?refId=abc', '3812345678'),
+    ('https://www.linkedin.com/jobs/search/?currentJobId=3812345678&keywords=python', '3812345678'),
+    ('https://www.linkedin.com/jobs/collections/?jobId=3812345678', '3812345678'),
+    ('https://www.linkedin.com/jobs/search/', None),
+    ('', None),
+])
+def test_extract_job_id(url, expected):
+    assert extract_job_id(url) == expected
+
+
+def test_key_ignores_tracking_parameters():
+    assert DetailCache.key_for('https://fr.linkedin.com/jobs/view/dev-3812345678?trk=x') == '3812345678'
+    assert DetailCache.key_for('https://example.com/offre?utm=1') == 'https://example.com/offre'
+
+
+def test_content_hash():
+    assert content_hash(None) is None
+    assert content_hash('a') == content_hash('a') != content_hash('b')
+
+
+def test_get_returns_copy():
+    cache = DetailCache()
+    cache.put('1', {'description': 'Texte', 'skills': ['python']})
+    details = cache.get('1')
+    details['skills'].append('java')
+    assert cache.get('1') == {'description': 'Texte', 'skills': ['python']}
+    assert (cache.hits, cache.misses) == (2, 0)
+
+
+def test_put_records_description_hash():
+    entry = DetailCache().put('1', {'description': 'Texte'})
+    assert entry['description_hash'] == content_hash('Texte')
+
+
+def test_stale_entry_is_evicted():
+    cache = DetailCache(ttl=timedelta(hours=1))
+    cache.put('1', {'description': 'Texte'}, fetched_at=datetime.utcnow() - timedelta(hours=2))
+    assert cache.get('1') is None
+    assert cache.misses == 1
+    assert '1' not in cache._entries
+
+
+def test_least_recently_used_entry_is_dropped():
+    cache = DetailCache(max_entries=2)
+    cache.put('1', {})
+    cache.put('2', {})
+    cache.get('1')
+    cache.put('3', {})
+    assert cache.get('2') is None
+    assert cache.get('1') == {} and cache.get('3') == {}
+
+
+def test_invalidate():
+    cache = DetailCache()
+    cache.put('1', {})
+    cache.invalidate('1')
+    cache.invalidate('absent')
+    assert cache.get('1') is None
@@ -0,0 +1,104 @@
+# Tests de l'étape d'enrichissement (file à priorité, mises à jour partielles)
+import asyncio
+from datetime import datetime, timedelta
+
+from app.services.detail_cache import DetailCache, content_hash
+from app.services.job_enrichment import PRIORITY_BACKGROUND, PRIORITY_USER, JobEnrichmentService
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length=None):
+        return self.documents
+
+
+class FakeJobs:
+    def __init__(self, job):
+        self.job = job
+
+    async def find_one(self, query, projection=None):
+        return self.job if query['_id'] == self.job['_id'] else None
+
+    def find(self, query, projection=None):
+        return FakeCursor([])
+
+
+class FakeDb:
+    def __init__(self, job):
+        self.jobs = FakeJobs(job)
+
+
+class FakeScraper:
+    def __init__(self, details):
+        self.details = details
+        self.detail_cache = DetailCache()
+        self.driver = None
+        self.calls = []
+
+    async def get_job_details(self, url, persist=True, company_id=None):
+        self.calls.append((url, persist, company_id))
+        return self.details
+
+
+def _service(monkeypatch):
+    async def idle(*args):
+        await asyncio.sleep(3600)
+
+    service = JobEnrichmentService(workers=1, batch_size=10, flush_interval=60)
+    monkeypatch.setattr(service, '_worker', idle)
+    monkeypatch.setattr(service, '_periodic_flush', idle)
+    return service
+
+
+def test_user_priority_jumps_the_queue(monkeypatch):
+    async def scenario():
+        service = _service(monkeypatch)
+        service.enqueue(['a', 'b', 'c'])
+        service.prioritize('c')
+        # Déjà en file avec une meilleure priorité : ignorée
+        service.enqueue(['c'], priority=PRIORITY_BACKGROUND)
+        order = [await service._next_job_id(FakeScraper(None)) for _ in range(3)]
+        assert service._queue.qsize() == 1  # entrée obsolète de "c", jamais servie
+        await service.stop()
+        return order
+
+    assert asyncio.run(scenario()) == ['c', 'a', 'b']
+
+
+def test_in_progress_job_is_not_requeued(monkeypatch):
+    async def scenario():
+        service = _service(monkeypatch)
+        service._in_progress.add('a')
+        service.enqueue(['a'], priority=PRIORITY_USER)
+        size = service._queue.qsize()
+        await service.stop()
+        return size
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_fresh_job_is_skipped():
+    job = {'_id': 1, 'linkedin_url': 'https://www.linkedin.com/jobs/view/42/', 'description': 'Texte',
+           'details_fetched_at': datetime.utcnow() - timedelta(hours=1)}
+    scraper = FakeScraper({'description': 'Autre'})
+    update = asyncio.run(JobEnrichmentService()._enrich_job(FakeDb(job), scraper, 1))
+    assert update is None
+    assert scraper.calls == []
+
+
+def test_enrichment_builds_partial_update():
+    job = {'_id': 1, 'linkedin_url': 'https://www.linkedin.com/jobs/view/42/', 'job_id': '42', 'company_id': 'c1'}
+    details = {'description': 'Python et Docker, équipe data à Paris', 'skills': ['python', 'docker']}
+    scraper = FakeScraper(details)
+    update = asyncio.run(JobEnrichmentService()._enrich_job(FakeDb(job), scraper, 1))
+
+    assert scraper.calls == [(job['linkedin_url'], False, 'c1')]
+    assert update._filter == {'_id': 1}
+    fields = update._doc['$set']
+    assert fields['description'] == details['description']
+    assert fields['skills'] == ['python', 'docker']
+    assert fields['description_hash'] == content_hash(details['description'])
+    assert fields['duplicate_of'] is None
+    assert fields['details_fetched_at'] == fields['updatedAt']
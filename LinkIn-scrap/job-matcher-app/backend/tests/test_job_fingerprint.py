@@ -0,0 +1,120 @@
+# Tests des empreintes d'offres et de la détection des quasi-doublons (SimHash)
+import asyncio
+
+from app.services.job_fingerprint import (
+    NEAR_DUPLICATE_DISTANCE, SIMHASH_BANDS, _closest, annotate_batch, description_fields,
+    hamming, job_fingerprint, normalize_text, simhash, simhash_bands
+)
+
+DESCRIPTION = (
+    "Nous recherchons un data engineer pour construire nos pipelines de données en Python "
+    "et Spark, industrialiser les traitements sur AWS et accompagner les équipes produit "
+    "dans la mise en place de tableaux de bord fiables et documentés."
+)
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length=None):
+        return self.documents
+
+
+class FakeJobs:
+    def __init__(self, documents):
+        self.documents = documents
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        bands = set(query['simhash_bands']['$in'])
+        return FakeCursor([doc for doc in self.documents if bands & set(doc.get('simhash_bands', []))])
+
+
+def test_normalize_text():
+    assert normalize_text('Développeur Python (H/F) - Île-de-France') == 'developpeur python ile de france'
+    assert normalize_text({'name': 'ACME'}) == 'acme'
+    assert normalize_text({'city': 'Lyon', 'country': 'France'}) == 'lyon france'
+    assert normalize_text(None) == ''
+
+
+def test_fingerprint_prefers_linkedin_id():
+    assert job_fingerprint({'job_id': '42', 'title': 'Dev'}) == 'li:42'
+    assert job_fingerprint({'linkedin_url': 'https://www.linkedin.com/jobs/view/dev-3812345678/'}) == 'li:3812345678'
+
+
+def test_fingerprint_ignores_presentation_differences():
+    first = {'title': 'Data Engineer (H/F)', 'company': 'Acme', 'location': 'Paris, Île-de-France, France'}
+    second = {'title': 'DATA ENGINEER F/H', 'company': {'name': 'acme'}, 'location': {'city': 'Paris'}}
+    assert job_fingerprint(first) == job_fingerprint(second)
+    assert job_fingerprint(first).startswith('key:')
+    assert job_fingerprint({**first, 'location': 'Lyon'}) != job_fingerprint(first)
+
+
+def test_simhash_is_stable_and_64_bits():
+    value = simhash(DESCRIPTION)
+    assert value == simhash(DESCRIPTION)
+    assert 0 <= value < 1 << 64
+    assert simhash('') is None and simhash(None) is None
+
+
+def test_small_edit_stays_near():
+    edited = DESCRIPTION.replace('fiables', 'fiables et rapides')
+    distance = hamming(simhash(DESCRIPTION), simhash(edited))
+    assert distance < hamming(simhash(DESCRIPTION), simhash('Commercial terrain, secteur automobile, CDI à Lille.'))
+
+
+def test_bands():
+    value = 0x0123_4567_89ab_cdef
+    assert simhash_bands(value) == ['0:cdef', '1:89ab', '2:4567', '3:0123']
+    assert len(simhash_bands(simhash(DESCRIPTION))) == SIMHASH_BANDS
+
+
+def test_hamming():
+    assert hamming(0b1011, 0b0001) == 2
+    assert hamming(5, 5) == 0
+
+
+def test_description_fields():
+    assert description_fields(None) == {}
+    assert description_fields('N/A') == {}
+    fields = description_fields(DESCRIPTION)
+    assert fields['simhash'] == f"{simhash(DESCRIPTION):016x}"
+    assert fields['simhash_bands'] == simhash_bands(simhash(DESCRIPTION))
+
+
+def test_closest_follows_canonical_offer():
+    value = simhash(DESCRIPTION)
+    near = f"{value ^ 0b11:016x}"
+    far = f"{value ^ ((1 << (NEAR_DUPLICATE_DISTANCE + 1)) - 1):016x}"
+    candidates = [
+        {'fingerprint': 'li:1', 'simhash': f"{value:016x}"},               # l'offre elle-même
+        {'fingerprint': 'li:2', 'simhash': far},
+        {'fingerprint': 'li:3', 'simhash': near, 'duplicate_of': 'li:0'},
+    ]
+    assert _closest(value, candidates, 'li:1') == 'li:0'
+    assert _closest(value, candidates[:2], 'li:1') is None
+
+
+def test_annotate_batch_links_reposts_within_batch():
+    original = {'job_id': '1', 'description': DESCRIPTION}
+    repost = {'job_id': '2', 'description': DESCRIPTION}
+    other = {'job_id': '4', 'description': 'Commercial terrain, secteur automobile, CDI à Lille.'}
+    card = {'job_id': '3', 'description': ''}
+    collection = FakeJobs([])
+
+    asyncio.run(annotate_batch(collection, [original, repost, other, card]))
+
+    assert original['duplicate_of'] is None
+    assert repost['duplicate_of'] == 'li:1'
+    assert other['duplicate_of'] is None
+    assert card['fingerprint'] == 'li:3' and 'simhash' not in card
+    assert len(collection.queries) == 1
+
+
+def test_annotate_batch_matches_stored_offer():
+    stored = {'fingerprint': 'li:1', **description_fields(DESCRIPTION)}
+    repost = {'job_id': '2', 'description': DESCRIPTION}
+    asyncio.run(annotate_batch(FakeJobs([stored]), [repost]))
+    assert repost['duplicate_of'] == 'li:1'
@@ -0,0 +1,85 @@
+# Tests de l'étape d'ingestion (upserts en pipeline, bilans)
+from datetime import datetime
+
+from app.services.job_ingestion import (
+    DETAIL_FIELDS, INSERT_ONLY_FIELDS, IngestionResult, _build_upsert, job_identity
+)
+
+NOW = datetime(2024, 3, 1, 12, 0)
+
+
+def _stages(job):
+    operation = _build_upsert(job, NOW)
+    return operation._filter, operation._doc
+
+
+def _assignments(job):
+    _, pipeline = _stages(job)
+    return pipeline[1]['$set']
+
+
+def test_identity_uses_linkedin_id():
+    assert job_identity({'job_id': '3812345678', 'title': 'Data Engineer'}) == {'fingerprint': 'li:3812345678'}
+
+
+def test_identity_keeps_existing_fingerprint():
+    assert job_identity({'fingerprint': 'key:abc', 'job_id': '1'}) == {'fingerprint': 'key:abc'}
+
+
+def test_upsert_is_a_pipeline_upsert():
+    operation = _build_upsert({'job_id': '42', 'title': 'Dev'}, NOW)
+    assert operation._upsert is True
+    assert operation._filter == {'fingerprint': 'li:42'}
+    assert operation._doc[0]['$set']['updatedAt']['$cond'][1] == NOW
+
+
+def test_insert_only_fields_do_not_overwrite():
+    job = {'job_id': '42', 'title': 'Dev', 'description': 'Texte', 'views': 0, 'createdAt': NOW}
+    assignments = _assignments(job)
+    for key in ('views', 'createdAt'):
+        assert key in INSERT_ONLY_FIELDS
+        assert assignments[key] == {'$ifNull': [f'${key}', {'$literal': job[key]}]}
+    assert assignments['title'] == {'$literal': 'Dev'}
+
+
+def test_relative_posting_date_is_not_a_change():
+    job = {'job_id': '42', 'title': 'Dev', 'posted_at': NOW}
+    _, pipeline = _stages(job)
+    compared = [condition['$ne'][0] for condition in pipeline[0]['$set']['updatedAt']['$cond'][0]['$or']]
+    assert '$posted_at' not in compared
+    assert pipeline[1]['$set']['posted_at'] == {'$ifNull': ['$posted_at', {'$literal': NOW}]}
+
+
+def test_card_does_not_overwrite_detail_fields():
+    card = {'job_id': '42', 'title': 'Dev', 'description': '', 'skills': ['python'],
+            'requirements': [], 'benefits': [], 'salary': None}
+    assignments = _assignments(card)
+    for key in DETAIL_FIELDS:
+        if key in card:
+            assert assignments[key] == {'$ifNull': [f'${key}', {'$literal': card[key]}]}
+    assert assignments['title'] == {'$literal': 'Dev'}
+
+
+def test_detailed_job_overwrites_detail_fields():
+    job = {'job_id': '42', 'title': 'Dev', 'description': 'Python et Docker', 'skills': ['python', 'docker']}
+    assignments = _assignments(job)
+    assert assignments['description'] == {'$literal': 'Python et Docker'}
+    assert assignments['skills'] == {'$literal': ['python', 'docker']}
+
+
+def test_updated_at_only_changes_with_content():
+    _, pipeline = _stages({'job_id': '42', 'title': 'Dev', 'updatedAt': NOW})
+    changed = pipeline[0]['$set']['updatedAt']['$cond'][0]
+    assert changed == {'$or': [
+        {'$ne': ['$job_id', {'$literal': '42'}]},
+        {'$ne': ['$title', {'$literal': 'Dev'}]}
+    ]}
+
+
+def test_merge_offsets_inserted_indices():
+    total = IngestionResult(inserted=1, inserted_indices=[0], inserted_ids=['a'])
+    total.merge(IngestionResult(inserted=2, updated=1, duplicates=3, inserted_indices=[0, 4],
+                                inserted_ids=['b', 'c']), offset=500)
+    assert (total.inserted, total.updated, total.duplicates, total.saved) == (3, 1, 3, 4)
+    assert total.inserted_indices == [0, 500, 504]
+    assert total.inserted_ids == ['a', 'b', 'c']
@@ -0,0 +1,51 @@
+# Tests du matcher mots-clés en une passe (chevauchements, parité avec `in`)
+from app.services.keyword_matcher import KeywordMatch, KeywordMatcher, build_dictionary, build_matcher
+
+SAMPLE = (
+    "Remote work from home possible, démarrage immédiat. "
+    "Required: 5 years of experience. We offer training and development, "
+    "assurance santé et formation continue."
+)
+
+
+def _occurrences(text, keyword):
+    """Positions de toutes les occurrences, chevauchements compris"""
+    positions, start = [], text.find(keyword)
+    while start != -1:
+        positions.append(start)
+        start = text.find(keyword, start + 1)
+    return positions
+
+
+def test_overlapping_keywords_are_all_reported():
+    matcher = KeywordMatcher({'benefit': ['remote work'], 'remote': ['work from home']}).build()
+    assert matcher.scan('Remote work from home') == [
+        KeywordMatch('benefit', 'remote work', 0, 11),
+        KeywordMatch('remote', 'work from home', 7, 21),
+    ]
+
+
+def test_prefix_keywords_are_reported_once():
+    matcher = KeywordMatcher({'benefit': ['remote work'], 'remote': ['remote']}).build()
+    assert matcher.scan('remote work') == [
+        KeywordMatch('benefit', 'remote work', 0, 11),
+        KeywordMatch('remote', 'remote', 0, 6),
+    ]
+
+
+def test_classify_matches_per_keyword_in():
+    matcher = build_matcher()
+    lowered = SAMPLE.lower()
+    expected = {
+        label: sorted((start, keyword) for keyword in keywords for start in _occurrences(lowered, keyword))
+        for label, keywords in build_dictionary().items()
+    }
+    labels = matcher.classify(SAMPLE)
+    for label, occurrences in expected.items():
+        assert sorted((match.start, match.keyword) for match in labels.get(label, [])) == occurrences
+    assert set(labels) == {label for label, occurrences in expected.items() if occurrences}
+
+
+def test_empty_text():
+    assert build_matcher().scan('') == []
+    assert KeywordMatcher().scan('remote') == []
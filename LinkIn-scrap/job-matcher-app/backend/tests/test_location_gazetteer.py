@@ -0,0 +1,116 @@
+# Tests du gazetteer de lieux (alias, trie de jetons, filtres indexés)
+import pytest
+
+from app.services.location_gazetteer import (
+    Gazetteer, get_gazetteer, location_query, location_text, normalize_job_location, tokenize
+)
+
+DATA = {
+    'version': 1,
+    'countries': [
+        {'id': 'fr', 'name': 'France', 'aliases': ['republique francaise']},
+        {'id': 'ca', 'name': 'Canada', 'aliases': []}
+    ],
+    'regions': [
+        {'id': 'fr-idf', 'name': 'Île-de-France', 'country': 'fr', 'aliases': ['idf']},
+        {'id': 'ca-qc', 'name': 'Québec', 'country': 'ca', 'aliases': ['quebec province']}
+    ],
+    'cities': [
+        {'id': 'fr-paris', 'name': 'Paris', 'region': 'fr-idf', 'country': 'fr', 'postal_code': '75000',
+         'aliases': ['grand paris']},
+        {'id': 'ca-montreal', 'name': 'Montréal', 'region': 'ca-qc', 'country': 'ca', 'aliases': ['montreal']},
+        {'id': 'ca-quebec', 'name': 'Québec', 'region': 'ca-qc', 'country': 'ca', 'aliases': ['quebec city']},
+        {'id': 'fr-saint-denis', 'name': 'Saint-Denis', 'region': 'fr-idf', 'country': 'fr', 'aliases': []}
+    ]
+}
+
+
+@pytest.fixture
+def gazetteer():
+    return Gazetteer(DATA)
+
+
+def test_tokenize_folds_accents_and_noise():
+    assert tokenize('Saint-Denis, Île-de-France (Hybride)') == tokenize('saint denis ile de france hybride')
+    assert tokenize(None) == []
+
+
+def test_location_text():
+    assert location_text('Paris, France') == 'Paris, France'
+    assert location_text({'city': 'Paris', 'country': 'France'}) == 'Paris, France'
+    assert location_text({'full_address': 'Lyon', 'city': 'X'}) == 'Lyon'
+    assert location_text(None) == ''
+
+
+def test_exact_alias_prefers_city(gazetteer):
+    # "Québec" est à la fois une ville et une région
+    assert gazetteer.match('Québec')['id'] == 'ca-quebec'
+    assert gazetteer.match('idf')['id'] == 'fr-idf'
+
+
+def test_longest_match_in_free_text(gazetteer):
+    assert gazetteer.match('Greater Paris Area')['id'] == 'fr-paris'
+    assert gazetteer.match('Grand Paris, France')['id'] == 'fr-paris'
+    assert gazetteer.match('Saint-Denis, Île-de-France, France')['id'] == 'fr-saint-denis'
+
+
+def test_city_coherent_with_context(gazetteer):
+    assert gazetteer.match('Montréal, Québec, Canada')['id'] == 'ca-montreal'
+
+
+def test_unknown_location(gazetteer):
+    assert gazetteer.match('Atlantis') is None
+    assert gazetteer.match('') is None
+
+
+def test_resolve_city(gazetteer):
+    info = gazetteer.resolve('Paris, Île-de-France, France')
+    assert info == {
+        'city': 'Paris',
+        'region': 'Île-de-France',
+        'country': 'France',
+        'postal_code': '75000',
+        'full_address': 'Paris, Île-de-France, France',
+        'remote': False,
+        'city_id': 'fr-paris',
+        'region_id': 'fr-idf',
+        'country_id': 'fr'
+    }
+
+
+def test_resolve_region_and_remote(gazetteer):
+    info = gazetteer.resolve('Île-de-France (Télétravail)')
+    assert (info['city_id'], info['region_id'], info['country_id']) == (None, 'fr-idf', 'fr')
+    assert info['remote'] is True
+
+
+def test_resolve_legacy_subdocument(gazetteer):
+    assert gazetteer.resolve({'city': 'Montreal', 'country': 'Canada'})['city_id'] == 'ca-montreal'
+
+
+def test_resolve_unknown_keeps_text(gazetteer):
+    info = gazetteer.resolve('Atlantis')
+    assert info['full_address'] == 'Atlantis'
+    assert info['city_id'] is None and info['country_id'] is None
+
+
+def test_location_filter(gazetteer):
+    assert gazetteer.location_filter('paris') == {'location_info.city_id': 'fr-paris'}
+    assert gazetteer.location_filter('France') == {'location_info.country_id': 'fr'}
+    assert gazetteer.location_filter('Remote') == {'location_info.remote': True}
+    assert gazetteer.location_filter('Atlantis') is None
+
+
+def test_shipped_gazetteer():
+    gazetteer = get_gazetteer()
+    assert gazetteer is get_gazetteer()
+    assert gazetteer.match('Paris, Île-de-France, France')['id'] == 'fr-paris'
+    job = {'location': 'Paris, France'}
+    assert normalize_job_location(job) is job['location_info']
+    assert job['location_info']['country_id'] == 'fr'
+
+
+def test_location_query_falls_back_to_text():
+    assert location_query('Paris') == {'location_info.city_id': 'fr-paris'}
+    query = location_query('Atlantis (Zone 1)')
+    assert query['$or'][0] == {'location_info.full_address': {'$regex': r'Atlantis\ \(Zone\ 1\)', '$options': 'i'}}
@@ -0,0 +1,38 @@
+# Tests de la cadence adaptative par hôte (AIMD, signaux de limitation)
+import pytest
+
+from app.services.request_pacer import AdaptivePacer, is_throttled_page
+
+URL = 'https://www.linkedin.com/jobs/search/?keywords=python'
+
+
+@pytest.mark.parametrize('current_url, title, expected', [
+    ('https://www.linkedin.com/authwall?trk=x', 'LinkedIn', True),
+    ('https://www.linkedin.com/checkpoint/challenge', '', True),
+    (URL, 'Error 999', True),
+    (URL, 'Too Many Requests', True),
+    (URL, '0 offres d\'emploi Python', False),
+    (None, None, False),
+])
+def test_is_throttled_page(current_url, title, expected):
+    assert is_throttled_page(current_url, title) is expected
+
+
+def test_success_decreases_and_failure_backs_off():
+    pacer = AdaptivePacer(floor=1.0, ceiling=30.0, initial=4.0, step=0.5, backoff=2.0)
+    assert pacer.record(URL, ok=True, latency=1.0) == 3.5
+    assert pacer.record(URL, ok=False) == 7.0
+    assert pacer.snapshot()['www.linkedin.com']['backoffs'] == 1
+
+
+def test_delay_stays_within_bounds():
+    pacer = AdaptivePacer(floor=1.0, ceiling=5.0, initial=4.0, step=10.0, backoff=4.0)
+    assert pacer.record(URL, ok=True) == 1.0
+    assert pacer.record(URL, ok=False) == 4.0
+    assert pacer.record(URL, ok=False) == 5.0
+
+
+def test_hosts_are_paced_separately():
+    pacer = AdaptivePacer(floor=1.0, ceiling=30.0, initial=4.0, step=0.5, backoff=2.0)
+    pacer.record(URL, ok=False)
+    assert pacer.record('https://fr.linkedin.com/jobs/view/42', ok=True) == 3.5
@@ -0,0 +1,65 @@
+# Tests de l'extracteur de compétences (trie de jetons, synonymes, filtres)
+import pytest
+
+from app.services.skill_extractor import SkillExtractor, get_skill_extractor, skills_query, tokenize
+
+DATA = {
+    'version': 1,
+    'skills': [
+        {'id': 'java', 'name': 'Java', 'synonyms': ['j2ee']},
+        {'id': 'javascript', 'name': 'JavaScript', 'synonyms': ['js']},
+        {'id': 'spring', 'name': 'Spring', 'ambiguous_name': True, 'synonyms': ['spring boot', 'spring framework']},
+        {'id': 'cpp', 'name': 'C++', 'synonyms': ['cpp']},
+        {'id': 'csharp', 'name': 'C#', 'synonyms': ['c sharp']},
+        {'id': 'dotnet', 'name': '.NET', 'synonyms': ['asp dotnet']},
+        {'id': 'machine_learning', 'name': 'Machine Learning', 'synonyms': ['apprentissage automatique']}
+    ]
+}
+
+
+@pytest.fixture
+def extractor():
+    return SkillExtractor(DATA)
+
+
+def test_tokenize_keeps_language_suffixes():
+    assert tokenize('C++, C# et .NET') == ['c++', 'c#', 'et', 'dotnet']
+    assert tokenize('Développeur ASP.NET') == ['developpeur', 'asp', 'dotnet']
+    assert tokenize(None) == []
+
+
+def test_whole_tokens_only(extractor):
+    assert extractor.extract('Java') == ['java']
+    assert extractor.extract('JavaScript (JS)') == ['javascript']
+    assert extractor.extract('Javanais') == []
+
+
+def test_longest_phrase_wins(extractor):
+    assert extractor.extract('Expérience Spring Boot et Java') == ['spring', 'java']
+
+
+def test_ambiguous_name_needs_a_synonym(extractor):
+    assert extractor.extract('Stage spring 2024') == []
+    assert extractor.extract('Spring Framework') == ['spring']
+
+
+def test_symbols_and_accents(extractor):
+    assert extractor.extract('C++ / C# / ASP.NET') == ['cpp', 'csharp', 'dotnet']
+    assert extractor.extract("Notions d'apprentissage automatique") == ['machine_learning']
+
+
+def test_order_of_first_appearance_across_texts(extractor):
+    assert extractor.extract('Développeur C#', 'Java, C#, .NET', None) == ['csharp', 'java', 'dotnet']
+
+
+def test_query_ids(extractor):
+    assert extractor.query_ids('java, J2EE, C#') == ['java', 'csharp']
+    # Terme inconnu gardé (normalisé) : aucune offre ne le porte
+    assert extractor.query_ids('Java, Cobol!, ') == ['java', 'cobol']
+
+
+def test_shipped_dictionary():
+    extractor = get_skill_extractor()
+    assert extractor is get_skill_extractor()
+    assert {'python', 'docker'} <= set(extractor.extract('Python 3 et Docker'))
+    assert skills_query('Python, Docker') == {'skills': {'$all': ['python', 'docker']}}
@@ -0,0 +1,84 @@
+# Tests du pipeline de scraping (fermeture, erreurs et filigrane)
+import asyncio
+import contextlib
+
+import pytest
+
+from app.services import linkedin_scraper_enhanced
+from app.services.linkedin_scraper_enhanced import LinkedInJobScraper
+from app.services.scrape_pipeline import PageResult, RawPage
+
+
+class FakeWatermark:
+    def __init__(self):
+        self.advanced = []
+
+    def page_is_known(self, jobs):
+        return False
+
+    def is_known(self, job):
+        return False
+
+    def advance(self, jobs):
+        self.advanced.extend(jobs)
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Scraper sans navigateur ni base : trois pages d'une offre chacune"""
+    watermark, saved = FakeWatermark(), []
+
+    async def load_watermark(db, search_key):
+        return watermark
+
+    async def save_watermark(db, value):
+        saved.append(value)
+
+    monkeypatch.setattr(linkedin_scraper_enhanced, 'load_watermark', load_watermark)
+    monkeypatch.setattr(linkedin_scraper_enhanced, 'save_watermark', save_watermark)
+
+    scraper = LinkedInJobScraper(extraction_mode='browser', db=object())
+    scraper.fail_writes = False
+    monkeypatch.setattr(scraper, 'setup_driver', lambda headless=True: None)
+
+    async def fetch_stage(urls, delay_range, stop, stats=None):
+        for page, url in enumerate(urls):
+            yield RawPage(page=page, url=url, cards=[{'title': f'Offre {page}', 'job_id': str(page)}])
+
+    async def persist_page(page, page_jobs, stats):
+        if scraper.fail_writes:
+            raise RuntimeError('écriture impossible')
+        return PageResult(page=page, jobs=page_jobs)
+
+    monkeypatch.setattr(scraper, '_fetch_stage', fetch_stage)
+    monkeypatch.setattr(scraper, '_persist_page', persist_page)
+    return scraper, watermark, saved
+
+
+def test_clean_finish_saves_watermark(pipeline):
+    scraper, watermark, saved = pipeline
+    jobs = asyncio.run(scraper.scrape_jobs(keywords=['python'], max_pages=3))
+    assert [job['job_id'] for job in jobs] == ['0', '1', '2']
+    assert saved == [watermark]
+    assert [job['job_id'] for job in watermark.advanced] == ['0', '1', '2']
+
+
+def test_early_close_saves_persisted_pages(pipeline):
+    scraper, watermark, saved = pipeline
+
+    async def first_page():
+        async with contextlib.aclosing(scraper.stream_jobs(keywords=['python'], max_pages=3)) as pages:
+            async for result in pages:
+                return result
+
+    assert asyncio.run(first_page()).page == 0
+    assert saved == [watermark]
+    assert [job['job_id'] for job in watermark.advanced] == ['0']
+
+
+def test_pipeline_error_is_raised_without_watermark(pipeline):
+    scraper, watermark, saved = pipeline
+    scraper.fail_writes = True
+    with pytest.raises(RuntimeError):
+        asyncio.run(scraper.scrape_jobs(keywords=['python'], max_pages=3))
+    assert saved == []
@@ -0,0 +1,136 @@
+# Tests de la lecture des données structurées JobPosting (JSON-LD)
+import json
+from datetime import datetime
+
+import pytest
+
+from app.services.structured_data import (
+    employment_type, find_job_posting, format_salary, hiring_organization, html_to_text,
+    job_location, job_posting_details, parse_date
+)
+
+POSTING = {
+    '@context': 'https://schema.org',
+    '@type': 'JobPosting',
+    'title': 'Data Engineer',
+    'description': '&lt;p&gt;Rejoignez l&amp;#39;équipe&lt;/p&gt;&lt;ul&gt;&lt;li&gt;Python&lt;/li&gt;&lt;li&gt;Spark&lt;/li&gt;&lt;/ul&gt;',
+    'datePosted': '2024-03-01T10:00:00.000Z',
+    'validThrough': '2024-04-01',
+    'employmentType': 'FULL_TIME',
+    'hiringOrganization': {
+        '@type': 'Organization',
+        'name': 'Acme',
+        'sameAs': 'https://www.linkedin.com/company/acme',
+        'logo': 'https://media.licdn.com/acme.png'
+    },
+    'jobLocation': {
+        '@type': 'Place',
+        'address': {'@type': 'PostalAddress', 'addressLocality': 'Paris', 'addressRegion': 'Île-de-France',
+                    'addressCountry': 'FR', 'postalCode': '75002'}
+    },
+    'baseSalary': {
+        '@type': 'MonetaryAmount', 'currency': 'EUR',
+        'value': {'@type': 'QuantitativeValue', 'minValue': 45000, 'maxValue': 55000, 'unitText': 'YEAR'}
+    }
+}
+
+
+def _page(*blocks):
+    scripts = ''.join(f'<script type="application/ld+json">{block}</script>' for block in blocks)
+    return f'<html><head>{scripts}</head><body><h1>Offre</h1></body></html>'
+
+
+def test_find_job_posting():
+    assert find_job_posting(_page(json.dumps(POSTING))) == POSTING
+
+
+def test_find_job_posting_in_graph_after_other_blocks():
+    graph = {'@context': 'https://schema.org', '@graph': [{'@type': 'WebPage'}, POSTING]}
+    page = _page('{invalide', json.dumps({'@type': 'Organization'}), json.dumps(graph))
+    assert find_job_posting(page) == POSTING
+
+
+def test_find_job_posting_in_html_comment():
+    assert find_job_posting(_page(f'<!-- {json.dumps([POSTING])} -->')) == POSTING
+
+
+def test_find_job_posting_absent():
+    assert find_job_posting(None) is None
+    assert find_job_posting('<html><body>Rien</body></html>') is None
+    assert find_job_posting(_page(json.dumps({'@type': 'Organization'}))) is None
+
+
+def test_html_to_text():
+    assert html_to_text(POSTING['description']) == "Rejoignez l'équipe\n- Python\n- Spark"
+    assert html_to_text('<p>Ligne&nbsp;1</p><br><br><p>  Ligne   2 </p>') == 'Ligne 1\nLigne 2'
+    assert html_to_text(None) == ''
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2024-03-01', datetime(2024, 3, 1)),
+    ('2024-03-01T10:00:00.000Z', datetime(2024, 3, 1, 10, 0)),
+    ('2024-03-01T12:00:00+02:00', datetime(2024, 3, 1, 10, 0)),
+    ('2024-03-01 pour 30 jours', datetime(2024, 3, 1)),
+    ('bientôt', None),
+    ('', None),
+    (None, None),
+])
+def test_parse_date(value, expected):
+    assert parse_date(value) == expected
+
+
+def test_employment_type():
+    assert employment_type('FULL_TIME') == 'full_time'
+    assert employment_type(['unknown', 'part-time']) == 'part_time'
+    assert employment_type('Intern') == 'internship'
+    assert employment_type(None) is None
+
+
+def test_format_salary():
+    assert format_salary(POSTING['baseSalary']) == '45 000 - 55 000 EUR / an'
+    assert format_salary({'currency': 'EUR', 'value': {'value': 15.5, 'unitText': 'HOUR'}}) == '15.5 EUR / heure'
+    assert format_salary({'currency': 'USD', 'value': 120000}) == '120 000 USD'
+    assert format_salary({'currency': 'EUR', 'value': {'unitText': 'YEAR'}}) is None
+    assert format_salary('45k') is None
+
+
+def test_hiring_organization_skips_linkedin_links():
+    assert hiring_organization(POSTING['hiringOrganization']) == {
+        'name': 'Acme', 'logo_url': 'https://media.licdn.com/acme.png'
+    }
+    organization = {'name': ' Acme ', 'url': 'https://acme.example', 'logo': {'url': 'https://acme.example/l.png'}}
+    assert hiring_organization(organization) == {
+        'name': 'Acme', 'website': 'https://acme.example', 'logo_url': 'https://acme.example/l.png'
+    }
+    assert hiring_organization('Acme') == {'name': 'Acme'}
+    assert hiring_organization(None) == {}
+
+
+def test_job_location_resolves_country_code():
+    info = job_location(POSTING)
+    assert (info['city_id'], info['country_id']) == ('fr-paris', 'fr')
+    assert info['postal_code'] == '75002'
+    assert info['remote'] is False
+
+
+def test_job_location_remote_only():
+    info = job_location({'jobLocationType': 'TELECOMMUTE'})
+    assert info['remote'] is True
+    assert job_location({}) is None
+
+
+def test_job_posting_details():
+    details = job_posting_details(POSTING)
+    assert details['description'] == "Rejoignez l'équipe\n- Python\n- Spark"
+    assert details['type'] == 'full_time'
+    assert details['postedAt'] == datetime(2024, 3, 1, 10, 0)
+    assert details['applicationDeadline'] == datetime(2024, 4, 1)
+    assert details['salary'] == '45 000 - 55 000 EUR / an'
+    assert details['company_info']['name'] == 'Acme'
+    assert details['location_info']['city_id'] == 'fr-paris'
+    assert 'remote' not in details
+
+
+def test_job_posting_details_leaves_missing_fields_unset():
+    details = job_posting_details({'@type': 'JobPosting', 'description': '<p>Texte</p>'})
+    assert details == {'description': 'Texte', 'company_info': {}}
@@ -1,15 +1,33 @@
+import os
+import sys
+import gzip
 import time
+import argparse
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import re
 import json
+import unicodedata
 from datetime import datetime
 
+# Ressources inutiles au scraping (images, polices, médias, traceurs)
+URLS_BLOQUEES = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.mp4", "*.webm",
+    "*media.licdn.com*", "*doubleclick.net*", "*google-analytics.com*",
+    "*googletagmanager.com*", "*px.ads.linkedin.com*", "*bat.bing.com*"
+]
+
 # Configuration initiale
 BASE_URL = "https://www.linkedin.com/jobs/search/?keywords=developpeur%20python&location=Paris%2C%20France"
 
@@ -20,105 +38,354 @@ def get_driver():
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
+    # Profil allégé : seul le texte du DOM nous intéresse
+    options.page_load_strategy = "eager"
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--disable-remote-fonts")
+    if os.path.isdir("/dev/shm"):
+        options.add_argument("--disk-cache-dir=/dev/shm/linkedin-scrapping-cache")
     service = Service(ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service, options=options)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": URLS_BLOQUEES})
     return driver
 
+def attendre_element(driver, selecteur, timeout=10):
+    # Rend la main dès que l'élément est présent plutôt qu'après une pause fixe
+    try:
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, selecteur)))
+        return True
+    except TimeoutException:
+        return False
+
+class Cadence:
+    # Délai adaptatif entre requêtes (AIMD) : -pas tant que les pages répondent,
+    # x facteur sur page vide ou timeout, borné par un plancher et un plafond.
+    # Partagée par les workers : chaque requête réserve son créneau sous verrou.
+    def __init__(self, plancher=1.0, plafond=30.0, initial=3.0, pas=0.25, facteur=2.0):
+        self.plancher, self.plafond, self.pas, self.facteur = plancher, plafond, pas, facteur
+        self.delai = initial
+        self.prochain = 0.0
+        self.verrou = threading.Lock()
+
+    def attendre(self):
+        with self.verrou:
+            maintenant = time.monotonic()
+            creneau = max(maintenant, self.prochain)
+            self.prochain = creneau + self.delai
+        if creneau > maintenant:
+            time.sleep(creneau - maintenant)
+
+    def resultat(self, ok):
+        with self.verrou:
+            if ok:
+                self.delai = max(self.plancher, self.delai - self.pas)
+            else:
+                self.delai = min(self.plafond, self.delai * self.facteur)
+
+cadence = Cadence()
+
 def fetch_job_page_selenium(driver, url):
+    cadence.attendre()
     driver.get(url)
-    time.sleep(2)  # Réduit pour accélérer
+    cadence.resultat(attendre_element(driver, "div.base-card"))
     return driver.page_source
 
-def main():
-    driver = get_driver()
+class PoolNavigateurs:
+    # Un navigateur par worker (créé à la première tâche du thread), tous fermés à la fin
+    def __init__(self, workers):
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="scrapping")
+        self.local = threading.local()
+        self.drivers = []
+        self.verrou = threading.Lock()
+
+    def driver(self):
+        if getattr(self.local, "driver", None) is None:
+            self.local.driver = get_driver()
+            with self.verrou:
+                self.drivers.append(self.local.driver)
+        return self.local.driver
+
+    def imap(self, fonction, elements):
+        # Résultats dans l'ordre des éléments, rendus dès qu'ils sont prêts
+        return self.executor.map(lambda element: fonction(self.driver(), element), elements)
+
+    def map(self, fonction, elements):
+        return list(self.imap(fonction, elements))
+
+    def fermer(self):
+        self.executor.shutdown(wait=True)
+        for driver in self.drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+class ExportJsonl:
+    # Une offre JSON par ligne, vidée sur disque à chaque écriture : un fichier
+    # interrompu en cours de route reste exploitable jusqu'à la dernière ligne.
+    # Compression gzip si le chemin se termine par .gz (ou si demandée).
+    def __init__(self, chemin, compresser=False):
+        if compresser and not chemin.endswith(".gz"):
+            chemin += ".gz"
+        self.chemin = chemin
+        self.nombre = 0
+        if chemin.endswith(".gz"):
+            self.fichier = gzip.open(chemin, "wt", encoding="utf-8")
+        else:
+            self.fichier = open(chemin, "w", encoding="utf-8")
+
+    def ecrire(self, offre):
+        self.fichier.write(json.dumps(offre, ensure_ascii=False) + "\n")
+        self.fichier.flush()
+        self.nombre += 1
+
+    def fermer(self):
+        self.fichier.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+# Types de contrat : code f_JT de LinkedIn, libellés acceptés en saisie et
+# marqueurs reconnus dans un titre ou une description (texte replié, mots entiers)
+TYPES_CONTRAT = {
+    "F": (("cdi", "full time", "temps plein"),
+          ("cdi", "contrat a duree indeterminee", "full time", "temps plein")),
+    "P": (("alternance", "part time", "temps partiel"),
+          ("alternance", "alternant", "apprentissage", "apprenti", "part time", "temps partiel")),
+    "C": (("cdd", "contract"),
+          ("cdd", "contrat a duree determinee", "fixed term", "contract")),
+    "T": (("freelance", "temporary", "interim"),
+          ("freelance", "independant", "interim", "temporary")),
+    "I": (("stage", "internship"),
+          ("stage", "stagiaire", "internship", "intern")),
+    "V": (("volunteer", "benevolat"),
+          ("volunteer", "benevolat", "benevole")),
+}
+
+def mots(texte):
+    # Minuscules, sans accents ni ponctuation, bordé d'espaces (recherche de mots entiers)
+    decompose = unicodedata.normalize("NFKD", texte or "")
+    replie = "".join(c for c in decompose if not unicodedata.combining(c)).lower()
+    return " " + " ".join(re.findall(r"[a-z0-9]+", replie)) + " "
+
+def filtre_contrats(contrats):
+    # Codes f_JT poussés dans la recherche ; les types sans code sont cherchés tels quels
+    codes, marqueurs = [], []
+    for contrat in contrats or []:
+        terme = mots(contrat).strip()
+        code = next((c for c, (libelles, _) in TYPES_CONTRAT.items() if terme in libelles), None)
+        if code:
+            if code not in codes:
+                codes.append(code)
+                marqueurs.extend(f" {m} " for m in TYPES_CONTRAT[code][1])
+        elif terme:
+            marqueurs.append(f" {terme} ")
+    return {"codes": codes, "marqueurs": marqueurs}
+
+def contrat_cite(filtre, texte):
+    texte = mots(texte)
+    return any(marqueur in texte for marqueur in filtre["marqueurs"])
+
+def carte_acceptee(filtre, offre):
+    # Résultats déjà filtrés par LinkedIn si la recherche porte un f_JT,
+    # sinon le titre de la carte doit citer le type (aucune page de détail)
+    return not filtre["marqueurs"] or bool(filtre["codes"]) or contrat_cite(filtre, offre["titre"])
+
+def contrat_verifie(filtre, offre, description):
+    # Vérification optionnelle sur la page de détail, déjà lue pour l'export
+    return not filtre["marqueurs"] or contrat_cite(filtre, offre["titre"]) or contrat_cite(filtre, description)
+
+def nouvelle_recherche(mots_cles=None, lieux=None, contrats=None, pages=3):
+    return {
+        "mots_cles": [m.strip() for m in (mots_cles or []) if m and m.strip()] or None,
+        "lieux": [l.strip() for l in (lieux or []) if l and l.strip()] or None,
+        "contrats": [c.strip().lower() for c in (contrats or []) if c and c.strip()] or None,
+        "pages": int(pages)
+    }
+
+def liste_saisie(texte):
+    return [element.strip() for element in (texte or "").split(",") if element.strip()]
+
+def scraper_recherche(driver, recherche):
+    # Pages de résultats d'une recherche, arrêt à la première page vide
+    offres = []
+    for page in range(recherche["pages"]):
+        url = build_linkedin_url(
+            keywords=recherche["mots_cles"],
+            location=recherche["lieux"],
+            contract_types=recherche["contrats"]
+        ) + f"&start={page * 25}"
+        print(f"Scraping page {page+1} : {url}")
+        try:
+            offres_page = parse_job_offers(fetch_job_page_selenium(driver, url))
+        except Exception as e:
+            print(f"Erreur lors du scraping de la page {page+1} : {e}")
+            break
+        if not offres_page:
+            break
+        offres.extend(offres_page)
+    return offres
+
+def construire_offre_json(offre, description):
+    return {
+        "title": offre['titre'],
+        "company": offre['entreprise'],
+        "companyLogo": None,
+        "companyWebsite": None,
+        "companyDescription": None,
+        "location": offre['lieu'],
+        "linkedin_url": offre['lien'],
+        "type": None,  # Peut être déduit du titre ou description si besoin
+        "salary": None,
+        "description": description,
+        "responsibilities": None,
+        "requirements": None,
+        "niceToHave": None,
+        "benefits": None,
+        "experienceLevel": None,
+        "education": None,
+        "languages": None,
+        "remote": None,
+        "urgent": None,
+        "postedAt": None,
+        "startDate": None,
+        "applicationDeadline": None,
+        "views": None,
+        "applications": None,
+        "createdAt": datetime.now().isoformat(),
+        "updatedAt": datetime.now().isoformat(),
+        "status": "active"
+    }
+
+def executer_recherches(recherches, export, workers=3, limite=None, afficher=False, verifier_contrat=False):
+    """
+    Recherches en parallèle (un navigateur par worker), puis pages de détail
+    des offres retenues : une seule navigation par offre. Les types de
+    contrat sont filtrés par la recherche (f_JT) et les cartes ;
+    `verifier_contrat` les confirme en plus sur la page de détail. Chaque
+    offre retenue est écrite dans `export` dès que sa page de détail est
+    lue ; renvoie leur nombre.
+    """
+    pool = PoolNavigateurs(workers)
+    try:
+        resultats = pool.map(scraper_recherche, recherches)
+
+        # Offre trouvée par plusieurs recherches : une seule page de détail,
+        # retenue si l'un des filtres de contrat de ces recherches l'accepte
+        candidates = {}
+        for recherche, offres_brutes in zip(recherches, resultats):
+            filtre = filtre_contrats(recherche["contrats"])
+            print(f"{len(offres_brutes)} offres trouvées avant filtrage.")
+            offres = filter_offers(
+                offres_brutes,
+                mots_cles_titre=recherche["mots_cles"],
+                lieux_souhaites=recherche["lieux"]
+            )
+            for offre in offres:
+                if offre["lien"] == "N/A" or not carte_acceptee(filtre, offre):
+                    continue
+                candidate = candidates.setdefault(cle_offre(offre["lien"]), (offre, []))
+                candidate[1].append(filtre)
+
+        candidates = list(candidates.values())
+        if limite:
+            candidates = candidates[:limite]
+        details = pool.imap(lambda driver, candidate: fetch_offer_details_selenium(driver, candidate[0]["lien"]), candidates)
+
+        nombre = 0
+        for (offre, filtres), (description, _, _) in zip(candidates, details):
+            if verifier_contrat and not any(contrat_verifie(filtre, offre, description) for filtre in filtres):
+                continue
+            export.ecrire(construire_offre_json(offre, description))
+            nombre += 1
+            if afficher:
+                print(f"Offre {nombre} : {offre['titre']} - {offre['entreprise']} ({offre['lieu']})")
+
+        print(f"{nombre} offres après filtrage.")
+        return nombre
+    finally:
+        pool.fermer()
+
+def charger_configuration(chemin):
+    # {"workers": 4, "pages": 3, "sortie": "...", "gzip": false, "verifier_contrat": false, "recherches": [{"mots_cles": [...], "lieux": [...], "contrats": [...]}]}
+    with open(chemin, encoding="utf-8") as f:
+        config = json.load(f)
+    pages = config.get("pages", 3)
+    recherches = [
+        nouvelle_recherche(r.get("mots_cles"), r.get("lieux"), r.get("contrats"), r.get("pages", pages))
+        for r in config.get("recherches", [])
+    ]
+    return config, recherches
+
+def saisie_interactive():
     print("Vous pouvez laisser un champ vide si vous ne souhaitez pas filtrer dessus.")
     mots_cles_input = input("Entrez les mots-clés à filtrer (séparés par des virgules) : ")
     lieux_input = input("Entrez les lieux souhaités (séparés par des virgules) : ")
     type_contrat_input = input("Entrez les types de contrat à filtrer (CDI, CDD, Stage, etc. séparés par des virgules) : ")
+    return nouvelle_recherche(liste_saisie(mots_cles_input), liste_saisie(lieux_input), liste_saisie(type_contrat_input))
 
-    mots_cles_filtre = [mot.strip() for mot in mots_cles_input.split(",") if mot.strip()] if mots_cles_input.strip() else None
-    lieux_filtre = [lieu.strip() for lieu in lieux_input.split(",") if lieu.strip()] if lieux_input.strip() else None
-    types_contrat = [tc.strip().lower() for tc in type_contrat_input.split(",") if tc.strip()] if type_contrat_input.strip() else None
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Scraping des offres LinkedIn. Sans argument : saisie interactive des filtres."
+    )
+    parser.add_argument("--config", help="Fichier JSON de recherches (mode batch)")
+    parser.add_argument("--mots-cles", help="Mots-clés séparés par des virgules")
+    parser.add_argument("--lieux", help="Lieux séparés par des virgules")
+    parser.add_argument("--contrats", help="Types de contrat (CDI, CDD, Stage...) séparés par des virgules")
+    parser.add_argument("--pages", type=int, default=None, help="Pages de résultats par recherche (défaut : 3)")
+    parser.add_argument("--workers", type=int, default=None, help="Navigateurs en parallèle (défaut : 3)")
+    parser.add_argument("--limite", type=int, default=None, help="Nombre maximal d'offres détaillées (défaut : toutes)")
+    parser.add_argument("--sortie", default=None, help="Fichier JSON Lines de sortie (défaut : resultat_offres.jsonl)")
+    parser.add_argument("--gzip", action="store_true", help="Compresse la sortie (suffixe .gz)")
+    parser.add_argument("--verifier-contrat", action="store_true",
+                        help="Confirme le type de contrat sur la page de détail (défaut : recherche et cartes seules)")
+    return parser.parse_args(argv)
 
-    all_offres_brutes = []
-    for page in range(0, 3):
-        start = page * 25
-        url = build_linkedin_url(
-            keywords=mots_cles_filtre,
-            location=lieux_filtre,
-            contract_types=types_contrat
-        ) + f"&start={start}"
-        print(f"Scraping page {page+1} : {url}")
-        html_content = fetch_job_page_selenium(driver, url)
-        offres_brutes = parse_job_offers(html_content)
-        all_offres_brutes.extend(offres_brutes)
-        time.sleep(1)
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = parse_arguments(argv)
+    config = {}
+    interactif = not argv
 
-    print(f"{len(all_offres_brutes)} offres trouvées avant filtrage.")
+    if interactif:
+        recherches = [saisie_interactive()]
+    elif args.config:
+        config, recherches = charger_configuration(args.config)
+        if args.pages:
+            recherches = [dict(r, pages=args.pages) for r in recherches]
+    else:
+        recherches = [nouvelle_recherche(
+            liste_saisie(args.mots_cles), liste_saisie(args.lieux), liste_saisie(args.contrats), args.pages or 3
+        )]
 
-    if not all_offres_brutes:
-        print("Aucune offre n'a pu être extraite. Vérifiez les sélecteurs CSS et la structure de la page LinkedIn.")
-        driver.quit()
+    if not recherches:
+        print("Aucune recherche à exécuter.")
         return
 
-    offres_filtrees = filter_offers(
-        all_offres_brutes,
-        mots_cles_titre=mots_cles_filtre,
-        lieux_souhaites=lieux_filtre
-    )
+    workers = args.workers or config.get("workers", 3)
+    sortie = args.sortie or config.get("sortie", "resultat_offres.jsonl")
+
+    # Export JSON Lines au fil de l'eau
+    with ExportJsonl(sortie, compresser=args.gzip or config.get("gzip", False)) as export:
+        try:
+            executer_recherches(
+                recherches,
+                export,
+                workers=workers,
+                limite=args.limite or config.get("limite"),
+                afficher=interactif,
+                verifier_contrat=args.verifier_contrat or config.get("verifier_contrat", False)
+            )
+        finally:
+            print(f"{export.nombre} offres exportées dans {export.chemin}")
 
-    if types_contrat:
-        nouvelles_offres = []
-        for offre in offres_filtrees:
-            description, _, _ = fetch_offer_details_selenium(driver, offre['lien'])
-            if any(tc in offre["titre"].lower() or tc in description.lower() for tc in types_contrat):
-                nouvelles_offres.append(offre)
-        offres_filtrees = nouvelles_offres
-
-    print(f"{len(offres_filtrees)} offres après filtrage.")
-
-    # Construction du format MongoDB et export JSON
-    offres_json = []
-    for i, offre in enumerate(offres_filtrees[:10]):
-        description, recruiter, email = fetch_offer_details_selenium(driver, offre['lien'])
-        offre_json = {
-            "title": offre['titre'],
-            "company": offre['entreprise'],
-            "companyLogo": None,
-            "companyWebsite": None,
-            "companyDescription": None,
-            "location": offre['lieu'],
-            "type": None,  # Peut être déduit du titre ou description si besoin
-            "salary": None,
-            "description": description,
-            "responsibilities": None,
-            "requirements": None,
-            "niceToHave": None,
-            "benefits": None,
-            "experienceLevel": None,
-            "education": None,
-            "languages": None,
-            "remote": None,
-            "urgent": None,
-            "postedAt": None,
-            "startDate": None,
-            "applicationDeadline": None,
-            "views": None,
-            "applications": None,
-            "createdAt": datetime.now().isoformat(),
-            "updatedAt": datetime.now().isoformat(),
-            "status": "active"
-        }
-        offres_json.append(offre_json)
-        print(f"\n--- Offre {i+1} ---")
-        print(json.dumps(offre_json, ensure_ascii=False, indent=2))
-        time.sleep(1)
-
-    # Export JSON
-    with open("resultat_offres.json", "w", encoding="utf-8") as f:
-        json.dump(offres_json, f, ensure_ascii=False, indent=2)
-
-    driver.quit()
+    if not export.nombre:
+        print("Aucune offre n'a pu être extraite. Vérifiez les sélecteurs CSS et la structure de la page LinkedIn.")
 
 def parse_job_offers(html_content):
     soup = BeautifulSoup(html_content, "html.parser")
@@ -157,13 +424,25 @@ def filter_offers(offres, mots_cles_titre=None, lieux_souhaites=None):
             offre for offre in offres_filtrees
             if any(lieu.lower() in offre["lieu"].lower() for lieu in lieux_souhaites)
         ]
-        print(type(offres_filtrees))
     return offres_filtrees
 
+# Cache des détails par job id : une seule navigation par offre et par exécution
+_details_cache = {}
+_details_verrou = threading.Lock()
+
+def cle_offre(url):
+    match = re.search(r"/jobs/view/(?:[^/?]*-)?(\d+)", url) or re.search(r"-(\d+)(?:\?|$)", url)
+    return match.group(1) if match else url.split("?")[0]
+
 def fetch_offer_details_selenium(driver, url):
+    cle = cle_offre(url)
+    with _details_verrou:
+        if cle in _details_cache:
+            return _details_cache[cle]
     try:
+        cadence.attendre()
         driver.get(url)
-        time.sleep(1)  # Réduit pour accélérer
+        cadence.resultat(attendre_element(driver, "div.show-more-less-html__markup", timeout=5))
         soup = BeautifulSoup(driver.page_source, "html.parser")
         desc_tag = soup.find("div", class_="show-more-less-html__markup")
         description = desc_tag.get_text(strip=True) if desc_tag else "N/A"
@@ -174,6 +453,9 @@ def fetch_offer_details_selenium(driver, url):
             match = re.search(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", description)
             if match:
                 email = match.group(0)
+        if description != "N/A":
+            with _details_verrou:
+                _details_cache[cle] = (description, recruiter, email)
         return description, recruiter, email
     except Exception as e:
         print(f"Erreur lors de la récupération des détails de l'offre : {e}")
@@ -187,18 +469,9 @@ def build_linkedin_url(keywords=None, location=None, contract_types=None):
         params.append(f"keywords={'%20'.join(keywords)}")
     if location:
         params.append(f"location={'%2C%20'.join(location)}")
-    if contract_types:
-        # Mapping des types de contrat LinkedIn
-        contract_map = {
-            "cdi": "F",
-            "cdd": "C",
-            "stage": "I",
-            "freelance": "T",
-            "alternance": "P"
-        }
-        codes = [contract_map.get(tc.lower()) for tc in contract_types if contract_map.get(tc.lower())]
-        if codes:
-            params.append("f_JT=" + "%2C".join(codes))
+    codes = filtre_contrats(contract_types)["codes"]
+    if codes:
+        params.append("f_JT=" + "%2C".join(codes))
     return base + "&".join(params)
 
 if __name__ == "__main__":